@@ -6,6 +6,9 @@ import json
 import os
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
+from model_artifact import export_forest
+from atomic_io import atomic_path, write_json
+from schema import align_categories, compact, memory_mb
 import sys
 
 if sys.stdout.encoding.lower() != "utf-8":
@@ -13,9 +16,9 @@ if sys.stdout.encoding.lower() != "utf-8":
 
 # === Load all data ===
 print("[INFO] Loading data...")
-player_df = pd.read_csv("new_data/stathead_player_pitching_game_data.csv")
-batting_df = pd.read_csv("new_data/stathead_batting_game_data.csv")
-team_pitch_df = pd.read_csv("new_data/stathead_team_pitching_game_data.csv")
+player_df = compact(pd.read_csv("new_data/stathead_player_pitching_game_data.csv"), "pitcher logs")
+batting_df = compact(pd.read_csv("new_data/stathead_batting_game_data.csv"), "batting logs")
+team_pitch_df = compact(pd.read_csv("new_data/stathead_team_pitching_game_data.csv"), "team pitching logs")
 
 # === Clean pitcher data ===
 print("[CLEAN] Cleaning pitcher data...")
@@ -35,6 +38,7 @@ player_df["KBB"] = player_df["SO"] / player_df["BB"].replace(0, np.nan)
 player_df["KBB"] = player_df["KBB"].fillna(0)
 player_df["ERA_est"] = (player_df["ER"] * 9) / player_df["IP"]
 player_df["is_home"] = player_df["Unnamed: 7"].apply(lambda x: 0 if str(x).strip() == "@" else 1)
+player_df = compact(player_df)
 
 # === Rolling averages (3-game) ===
 print("[ROLL] Computing rolling stats...")
@@ -42,9 +46,10 @@ player_df = player_df.sort_values(by=["Player", "Date"])
 rolling_feats = ["IP", "SO", "BB", "K_per_IP", "K_per_BF", "WHIP", "KBB", "ERA_est"]
 for feat in rolling_feats:
     player_df[f"r3_{feat}"] = (
-        player_df.groupby("Player", group_keys=False)[feat]
+        player_df.groupby("Player", group_keys=False, observed=True)[feat]
         .transform(lambda x: x.shift(1).rolling(3, min_periods=1).mean())
     )
+player_df = compact(player_df)
 
 # === Clean batting data ===
 print("[CLEAN] Cleaning opponent batting...")
@@ -54,6 +59,7 @@ batting_df["Date"] = pd.to_datetime(batting_df["Date"].astype(str).str.extract(r
 for col in ["SO", "PA", "OBP", "SLG", "OPS", "BA"]:
     batting_df[col] = pd.to_numeric(batting_df[col], errors="coerce")
 batting_df["opp_K_rate"] = batting_df["SO"] / batting_df["PA"]
+batting_df = compact(batting_df)
 
 # === Clean team pitching data ===
 print("[CLEAN] Cleaning team pitching...")
@@ -62,10 +68,13 @@ team_pitch_df["Date"] = pd.to_datetime(team_pitch_df["Date"].astype(str).str.ext
 for col in ["SO.1", "BF"]:
     team_pitch_df[col] = pd.to_numeric(team_pitch_df[col], errors="coerce")
 team_pitch_df["team_K_rate"] = team_pitch_df["SO.1"] / team_pitch_df["BF"]
-team_pitch_df = team_pitch_df.rename(columns={"Team": "Team_pitch"})
+team_pitch_df = compact(team_pitch_df.rename(columns={"Team": "Team_pitch"}))
 
 # === Merge all sources ===
 print("[MERGE] Merging opponent and team stats...")
+# Shared categories keep the team keys categorical through the merges
+player_df, batting_df = align_categories(player_df, batting_df, "Opp")
+player_df, team_pitch_df = align_categories(player_df, team_pitch_df, "Team", "Team_pitch")
 df = player_df.merge(
     batting_df[["Date", "Opp", "opp_K_rate", "OBP", "SLG", "OPS", "BA"]],
     on=["Date", "Opp"], how="left"
@@ -76,6 +85,7 @@ df = df.merge(
     right_on=["Date", "Team_pitch"],
     how="left"
 )
+print(f"[MEM] Training frame: {memory_mb(df):.2f} MB")
 
 # === Final feature list ===
 print("[PREP] Preparing features...")
@@ -104,9 +114,11 @@ print(f"[METRIC] Model MAE: {mae:.2f} | R²: {r2:.3f}")
 # === Save model and feature order ===
 print("[SAVE] Saving model and features...")
 os.makedirs("models", exist_ok=True)
-joblib.dump(model, "models/strikeout_model.pkl")
-with open("models/feature_order.json", "w") as f:
-    json.dump(base_features, f)
+with atomic_path("models/strikeout_model.pkl") as tmp:
+    joblib.dump(model, tmp)
+write_json(base_features, "models/feature_order.json")
+forest = export_forest(model, base_features, "models/strikeout_model.forest", X_check=X)
+print(f"[SAVE] Flat forest artifact written (model_id={forest.model_id})")
 
 # === Predict and export ===
 print("[SQL] Saving predictions to SQLite...")
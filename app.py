@@ -1,42 +1,115 @@
 ﻿import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from io import BytesIO
+import hashlib
 import os
 import matplotlib.pyplot as plt
+from atomic_io import read_appended_csv, write_csv
+from dashboard_store import backfill, load_day, partition_versions, read_feed
+from pricing import MAX_STRIKEOUTS, price_props, strikeout_pmf
+from results_summary import RESULTS_PATH, SUMMARY_PATH, summarize_by_date
+from strikeout_features import bet_recommendation, file_version
+
+PREDICTION_COLUMNS = ["game_date", "player", "line", "odds", "odds_side", "predicted_so", "edge"]
+RESULT_COLUMNS = ["game_date", "pitcher", "line", "odds", "predicted_k", "edge", "bet_recommendation",
+                  "confidence", "strikeouts", "result", "outcome", "units"]
+FEED_POLL_SECONDS = 5
 
 st.set_page_config(page_title="Pitcher SO Prop Model", layout="wide")
 st.title("🎯 MLB Strikeout Prop Dashboard")
 
+# Polls the store's change feed; when predict or the grader publishes, the app
+# reruns and only the partitions whose version moved are read again
+@st.fragment(run_every=FEED_POLL_SECONDS)
+def watch_feed():
+    feed = read_feed()
+    seen = st.session_state.setdefault("feed_version", feed["version"])
+    if feed["version"] != seen:
+        st.session_state["feed_version"] = feed["version"]
+        st.rerun()
+    if feed.get("updated"):
+        st.caption(f"🔄 Last update {feed['updated']} — {feed['dataset']} for {', '.join(feed['dates'])}")
+
+watch_feed()
+
 # === TAB NAVIGATION ===
 tab1, tab2 = st.tabs(["📈 Strikeout Prop Model", "📅 Results Viewer"])
 
-with tab1:
-    @st.cache_data
-    def load_predictions():
-        df = pd.read_csv("data/predicted_pitcher_props_with_edges.csv")
-        df.columns = df.columns.str.lower()
+# Each date is its own partition in the dashboard store; cached views are keyed
+# on (date, partition version), so picking a date reads only that date's rows
+FIREBALL_EDGES = [2.5, 2.0, 1.5, 1.0, 0.75]
+FIREBALLS = ["🔥🔥🔥🔥🔥", "🔥🔥🔥🔥", "🔥🔥🔥", "🔥🔥", "🔥"]
+
+def fireball_confidence(edge):
+    abs_edge = np.abs(np.asarray(edge, dtype=float))
+    return np.select([abs_edge >= e for e in FIREBALL_EDGES], FIREBALLS, default="❌")
 
-        # Normalize and sanitize game_date
-        df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
-        df = df.dropna(subset=["game_date"])
-        df["game_date"] = df["game_date"].dt.date
+def stored_dates(dataset):
+    versions = partition_versions(dataset)
+    if not versions:
+        # First run against an empty store: load the CSV artifacts once
+        backfill(dataset)
+        versions = partition_versions(dataset)
+    return versions
 
-        # Defensive check
-        if df["game_date"].empty:
-            st.error("❌ No valid game_date values found in predicted_pitcher_props_with_edges.csv.")
-            st.stop()
+with tab1:
+    @st.cache_data(max_entries=8)
+    def load_predictions(game_date, version):
+        df = load_day("predictions", game_date, PREDICTION_COLUMNS)
 
+        # Derived columns are computed once per partition version
+        df["bet_recommendation"] = bet_recommendation(df["edge"])
+        df["confidence"] = fireball_confidence(df["edge"])
         return df
 
-    df = load_predictions()
+    @st.cache_data(max_entries=8)
+    def load_distributions(game_date, version):
+        # Row i is the strikeout distribution of load_predictions(...) row i
+        dist = load_day("predictions", game_date, ["predicted_so", "pmf"])
+        pmf = strikeout_pmf(dist["predicted_so"].to_numpy(dtype=float), method="negbin")
+        for i, blob in enumerate(dist["pmf"]):
+            if isinstance(blob, bytes) and len(blob) == 4 * (MAX_STRIKEOUTS + 1):
+                pmf[i] = np.frombuffer(blob, dtype=np.float32)
+        return pmf
+
+    @st.cache_data(max_entries=8)
+    def edge_histogram(game_date, version):
+        df = load_predictions(game_date, version)
+        fig, ax = plt.subplots()
+        df["edge"].hist(bins=40, ax=ax)
+        buf = BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+        plt.close(fig)
+        return buf.getvalue()
+
+    prediction_versions = stored_dates("predictions")
+    if not prediction_versions:
+        st.error("❌ No predictions found. Run the pipeline to publish predicted_pitcher_props_with_edges.csv.")
+        st.stop()
 
     st.sidebar.header("🔍 Filters")
 
+    # Pick default date — today's date if present, else latest available
+    prediction_dates = list(prediction_versions)
+    min_date, max_date = prediction_dates[0], prediction_dates[-1]
+    today = datetime.today().date()
+    default_date = today if today in prediction_versions else max_date
+
+    selected_date = st.sidebar.date_input(
+        "Game Date",
+        value=default_date,
+        min_value=min_date,
+        max_value=max_date
+    )
+    _, predictions_version = prediction_versions.get(selected_date, (0, None))
+    df = load_predictions(selected_date, predictions_version)
+
     # Edge Distribution
     st.sidebar.subheader("📊 Edge Distribution")
-    fig, ax = plt.subplots()
-    df["edge"].hist(bins=40, ax=ax)
-    st.sidebar.pyplot(fig)
+    if not df.empty:
+        st.sidebar.image(edge_histogram(selected_date, predictions_version))
 
     st.sidebar.markdown(f"**Avg Line:** {df['line'].mean():.2f}")
     st.sidebar.markdown(f"**Avg Predicted SO:** {df['predicted_so'].mean():.2f}")
@@ -50,50 +123,11 @@ with tab1:
         default=["✅ Over", "✅ Under"]
     )
 
-    # Pick default date — today's date if present, else latest available
-    min_date = df["game_date"].min()
-    max_date = df["game_date"].max()
-    today = datetime.today().date()
-    default_date = today if today in df["game_date"].values else max_date
-
-    selected_date = st.sidebar.date_input(
-        "Game Date",
-        value=default_date,
-        min_value=min_date,
-        max_value=max_date
-    )
-
-    # Recalculate bet_recommendation
-    df["bet_recommendation"] = df["edge"].apply(lambda e:
-        "✅ Over" if e > 0.75 else
-        "✅ Under" if e < -0.75 else
-        "❌ No Bet"
-    )
-
-    # Add confidence column
-    def fireball_confidence(edge):
-        abs_edge = abs(edge)
-        if abs_edge >= 2.5:
-            return "🔥🔥🔥🔥🔥"
-        elif abs_edge >= 2.0:
-            return "🔥🔥🔥🔥"
-        elif abs_edge >= 1.5:
-            return "🔥🔥🔥"
-        elif abs_edge >= 1.0:
-            return "🔥🔥"
-        elif abs_edge >= 0.75:
-            return "🔥"
-        else:
-            return "❌"
-
-    df["confidence"] = df["edge"].apply(fireball_confidence)
-
     # Final filter
     filtered = df[
         (df["edge"].abs() >= min_edge) &
         (df["odds"].between(odds_range[0], odds_range[1])) &
-        (df["bet_recommendation"].isin(recommendation)) &
-        (df["game_date"] == selected_date)
+        (df["bet_recommendation"].isin(recommendation))
     ]
 
     st.subheader(f"📋 Filtered Results ({len(filtered)} bets shown)")
@@ -107,79 +141,139 @@ with tab1:
         filtered[display_cols].style.format({
             "predicted_so": "{:.2f}",
             "edge": "{:.2f}",
-            "odds": "{:+}"
+            "odds": "{:+.0f}"
         }),
         use_container_width=True
     )
 
-    # Save filtered bets to file
+    # Bets are only written to filtered_bets/ when asked, and never twice
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
     filename = f"filtered_bets_{timestamp}.csv"
-    output_dir = "filtered_bets"
-    os.makedirs(output_dir, exist_ok=True)
-    local_path = os.path.join(output_dir, filename)
+    csv_text = filtered[display_cols].to_csv(index=False)
+    csv_hash = hashlib.sha1(csv_text.encode()).hexdigest()
 
-    filtered[display_cols].to_csv(local_path, index=False)
+    save_col, download_col = st.columns(2)
+    if save_col.button("💾 Save Filtered Bets", disabled=filtered.empty):
+        if st.session_state.get("last_saved_hash") == csv_hash:
+            save_col.info("These bets are already saved.")
+        else:
+            local_path = os.path.join("filtered_bets", filename)
+            write_csv(filtered[display_cols], local_path)
+            st.session_state["last_saved_hash"] = csv_hash
+            save_col.success(f"Saved {len(filtered)} bets to {local_path}")
 
-    st.download_button(
+    download_col.download_button(
         label="📥 Download Filtered Bets",
-        data=filtered[display_cols].to_csv(index=False),
+        data=csv_text,
         file_name=filename,
         mime="text/csv"
     )
 
+    # === What-if: re-price edited lines/odds from the stored distributions, no model needed
+    st.subheader("🧪 What-If Pricing")
+    st.caption("Edit a line, price or side; edge, probabilities and confidence update from the cached model output.")
+    pmf = load_distributions(selected_date, predictions_version)
+    whatif_src = filtered if not filtered.empty else df
+    edited = st.data_editor(
+        whatif_src[["player", "line", "odds", "odds_side"]],
+        disabled=["player"],
+        column_config={"odds_side": st.column_config.SelectboxColumn("side", options=["Over", "Under"])},
+        use_container_width=True,
+        key=f"whatif_{selected_date}_{predictions_version}",
+    )
+
+    if len(edited) and len(pmf) == len(df):
+        rows = edited.index.to_numpy()
+        lines = edited["line"].to_numpy(dtype=float)
+        odds = edited["odds"].to_numpy(dtype=float)
+        priced = price_props(pmf, lines, odds, edited["odds_side"].fillna("Over"), rows=rows)
+        whatif = edited.assign(
+            predicted_so=df["predicted_so"].to_numpy()[rows],
+            edge=df["predicted_so"].to_numpy()[rows] - lines,
+            **priced,
+        )
+        whatif["bet_recommendation"] = bet_recommendation(whatif["edge"])
+        whatif["confidence"] = fireball_confidence(whatif["edge"])
+        st.dataframe(
+            whatif.style.format({
+                "line": "{:.1f}", "odds": "{:+.0f}", "predicted_so": "{:.2f}", "edge": "{:.2f}",
+                "prob_over": "{:.1%}", "prob_under": "{:.1%}",
+                "fair_over_odds": "{:+.0f}", "fair_under_odds": "{:+.0f}", "ev": "{:+.3f}",
+            }),
+            use_container_width=True
+        )
+
 
 
 # ========== TAB 2: Results Viewer ==========
 with tab2:
     st.subheader("📅 Bet Results Viewer")
 
-    @st.cache_data
-    def load_results():
-        df_results = pd.read_csv("data/bets_vs_actuals_strikeouts.csv")
-        df_results.columns = df_results.columns.str.lower()
-        df_results["game_date"] = pd.to_datetime(df_results["game_date"]).dt.date
+    @st.cache_data(max_entries=8)
+    def load_results(game_date, version):
+        df_results = load_day("results", game_date, RESULT_COLUMNS)
         df_results.rename(columns={"result": "actual_result"}, inplace=True)
         return df_results
 
-    results_df = load_results()
+    @st.cache_data(max_entries=2)
+    def load_summary(path, version, results_version):
+        # Written by the grader; rebuilt here only if it is missing or older than the results
+        if version is not None and results_version is not None and version >= results_version:
+            summary = pd.read_csv(path)
+        else:
+            summary = summarize_by_date(read_appended_csv(RESULTS_PATH))
+        summary["Game_Date"] = pd.to_datetime(summary["Game_Date"]).dt.date
+        return summary.set_index("Game_Date")
+
+    result_versions = stored_dates("results")
+    if not result_versions:
+        st.info("No graded bets yet.")
+        st.stop()
+    summary_df = load_summary(SUMMARY_PATH, file_version(SUMMARY_PATH), file_version(RESULTS_PATH))
 
-    date_options = results_df["game_date"].dropna().unique()
+    date_options = list(result_versions)
     selected_result_date = st.date_input(
         "Select Result Date",
         value=max(date_options),
         min_value=min(date_options),
         max_value=max(date_options)
     )
+    _, results_version = result_versions.get(selected_result_date, (0, None))
+    daily_df = load_results(selected_result_date, results_version)
 
-    daily_df = results_df[results_df["game_date"] == selected_result_date]
-    daily_df_complete = daily_df[daily_df["actual_result"] != "No Data"]
+    # Running totals come from the last summarized date on or before the selection
+    pos = summary_df.index.searchsorted(selected_result_date, side="right") - 1
+    rolling = summary_df.iloc[pos] if pos >= 0 else None
+    day = summary_df.loc[selected_result_date] if selected_result_date in summary_df.index else None
 
-    rolling_df = results_df[results_df["game_date"] <= selected_result_date]
-    rolling_df_complete = rolling_df[rolling_df["actual_result"] != "No Data"]
-
-    total = len(daily_df_complete)
-    wins = (daily_df_complete["actual_result"] == daily_df_complete["bet_recommendation"].str.replace("✅ ", "")).sum()
+    total = int(day["graded"]) if day is not None else 0
+    wins = int(day["wins"]) if day is not None else 0
     win_rate = (wins / total * 100) if total > 0 else 0
 
     st.markdown(f"### 🎯 Results for {selected_result_date} ({len(daily_df)} picks)")
     st.markdown(f"**✅ Correct Picks:** {wins} / {total}  &nbsp; &nbsp; **Win Rate:** {win_rate:.1f}%")
+    if day is not None and day["staked"] > 0:
+        st.markdown(f"**💰 Units:** {day['units']:+.2f}  &nbsp; &nbsp; **ROI:** {day['roi']:+.1%}")
 
-    r_total = len(rolling_df_complete)
-    r_wins = (rolling_df_complete["actual_result"] == rolling_df_complete["bet_recommendation"].str.replace("✅ ", "")).sum()
+    r_total = int(rolling["cum_graded"]) if rolling is not None else 0
+    r_wins = int(rolling["cum_wins"]) if rolling is not None else 0
     r_win_rate = (r_wins / r_total * 100) if r_total > 0 else 0
 
     st.markdown(f"**📈 Rolling Total (up to {selected_result_date}):** {r_wins} / {r_total} correct — {r_win_rate:.1f}%")
+    if rolling is not None and rolling["cum_staked"] > 0:
+        st.markdown(f"**💰 Rolling Units:** {rolling['cum_units']:+.2f}  &nbsp; &nbsp; **ROI:** {rolling['cum_roi']:+.1%}")
+
+    OUTCOME_COLORS = {"Win": "background-color: green;", "Loss": "background-color: red;"}
 
-    def highlight_result(row):
-        color = "background-color: green;" if row["actual_result"] == row["bet_recommendation"].replace("✅ ", "") else \
-                "background-color: red;" if row["actual_result"] in ["Over", "Under"] else ""
-        return [color] * len(row)
+    def highlight_outcome(frame):
+        colors = frame["outcome"].map(OUTCOME_COLORS).fillna("").to_numpy()
+        return pd.DataFrame(np.repeat(colors[:, None], frame.shape[1], axis=1),
+                            index=frame.index, columns=frame.columns)
 
-    format_cols = {col: "{:.2f}" for col in ["predicted_k", "edge", "odds"] if col in daily_df.columns}
+    format_cols = {col: "{:.2f}" for col in ["predicted_k", "edge", "odds", "units"] if col in daily_df.columns}
     if "strikeouts" in daily_df.columns:
         format_cols["strikeouts"] = "{:.1f}"
 
-    styled = daily_df.style.apply(highlight_result, axis=1).format(format_cols)
+    styled = daily_df.style.apply(highlight_outcome, axis=None).format(format_cols)
 
     st.dataframe(styled, use_container_width=True)
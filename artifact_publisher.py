@@ -0,0 +1,190 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+
+from atomic_io import atomic_path, write_json
+
+ARTIFACT_TARGET = os.getenv("ARTIFACT_TARGET", "artifact_store")
+STATE_PATH = "data/artifact_publish_state.json"
+CHUNK_SIZE = 1024 * 1024
+
+# What a run produces that consumers need; local-only state (outbox, run reports) stays out
+PUBLISH_PATTERNS = [
+    "data/*.csv", "data/*.json", "data/*.npz", "data/*.db",
+    "models/*", "new_data/*.csv", "filtered_bets/*.csv",
+]
+EXCLUDE = {"data/notify_outbox.db", STATE_PATH}
+
+
+class LocalTarget:
+    """Content-addressed object store in a directory; stands in for a bucket.
+
+    objects/<aa>/<sha256> holds chunks, manifest.json the latest manifest and
+    manifests/<run_id>.json every published one.
+    """
+
+    def __init__(self, root=ARTIFACT_TARGET):
+        self.root = root
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.exists(self._object_path(digest))
+
+    def put(self, digest, data):
+        with atomic_path(self._object_path(digest)) as tmp:
+            with open(tmp, "wb") as f:
+                f.write(data)
+
+    def get(self, digest):
+        with open(self._object_path(digest), "rb") as f:
+            return f.read()
+
+    def put_manifest(self, manifest):
+        write_json(manifest, os.path.join(self.root, "manifests", f"{manifest['run_id']}.json"), indent=1)
+        write_json(manifest, os.path.join(self.root, "manifest.json"), indent=1)
+
+    def get_manifest(self):
+        path = os.path.join(self.root, "manifest.json")
+        if not os.path.exists(path):
+            return {"files": {}}
+        with open(path) as f:
+            return json.load(f)
+
+
+def artifact_paths(patterns=PUBLISH_PATTERNS):
+    paths = set()
+    for pattern in patterns:
+        paths.update(p.replace(os.sep, "/") for p in glob.glob(pattern) if os.path.isfile(p))
+    return sorted(paths - EXCLUDE)
+
+
+def _stat_key(path):
+    # A SQLite write may land only in the -wal file
+    keys = []
+    for p in (path, path + "-wal"):
+        if os.path.exists(p):
+            st = os.stat(p)
+            keys.append([st.st_mtime_ns, st.st_size])
+    return keys
+
+
+def _snapshot(path):
+    """Path to read for a consistent copy: SQLite DBs go through the backup API."""
+    if not path.endswith(".db"):
+        return path, None
+    fd, tmp = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    src, dst = sqlite3.connect(path), sqlite3.connect(tmp)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+    return tmp, tmp
+
+
+def chunk_file(path, chunk_size=CHUNK_SIZE):
+    """Yield (sha256, bytes) per fixed-size chunk; appends only add chunks at the end."""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                return
+            yield hashlib.sha256(data).hexdigest(), data
+
+
+def _load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def publish_artifacts(target=None, paths=None, state_path=STATE_PATH, dry_run=False):
+    """Upload chunks the target doesn't have and write a new manifest.
+
+    Unchanged files (same mtime/size as last publish) aren't even re-read, so
+    the cost tracks what the run actually changed.
+    """
+    target = target or LocalTarget()
+    paths = artifact_paths() if paths is None else paths
+    state = _load_state(state_path)
+    previous = target.get_manifest()["files"]
+
+    files, new_state = {}, {}
+    stats = {"files": len(paths), "changed": 0, "chunks_uploaded": 0, "bytes_uploaded": 0}
+    for path in paths:
+        key = _stat_key(path)
+        cached = state.get(path)
+        if cached and cached["stat"] == key and path in previous:
+            files[path] = previous[path]
+            new_state[path] = cached
+            continue
+
+        read_path, tmp = _snapshot(path)
+        try:
+            whole, chunks, size = hashlib.sha256(), [], 0
+            for digest, data in chunk_file(read_path):
+                whole.update(data)
+                chunks.append(digest)
+                size += len(data)
+                if not dry_run and not target.has(digest):
+                    target.put(digest, data)
+                    stats["chunks_uploaded"] += 1
+                    stats["bytes_uploaded"] += len(data)
+        finally:
+            if tmp:
+                os.remove(tmp)
+
+        entry = {"sha256": whole.hexdigest(), "size": size, "chunks": chunks}
+        if previous.get(path, {}).get("sha256") != entry["sha256"]:
+            stats["changed"] += 1
+        files[path] = entry
+        new_state[path] = {"stat": key, "sha256": entry["sha256"]}
+
+    if not dry_run:
+        target.put_manifest({
+            "run_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "chunk_size": CHUNK_SIZE,
+            "files": files,
+        })
+        write_json(new_state, state_path)
+    return stats
+
+
+def restore_artifacts(dest, target=None, paths=None):
+    """Rebuild files from the latest manifest under `dest`."""
+    target = target or LocalTarget()
+    files = target.get_manifest()["files"]
+    for path in paths or files:
+        out = os.path.join(dest, path)
+        with atomic_path(out) as tmp:
+            with open(tmp, "wb") as f:
+                for digest in files[path]["chunks"]:
+                    f.write(target.get(digest))
+    return len(paths or files)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish pipeline outputs as content-addressed chunks")
+    parser.add_argument("--target", default=ARTIFACT_TARGET, help="directory acting as the object store")
+    parser.add_argument("--dry-run", action="store_true", help="hash and report without uploading")
+    parser.add_argument("--restore", metavar="DEST", help="rebuild the latest published files under DEST")
+    args = parser.parse_args()
+
+    target = LocalTarget(args.target)
+    if args.restore:
+        print(f"✅ Restored {restore_artifacts(args.restore, target)} file(s) to {args.restore}")
+    else:
+        stats = publish_artifacts(target, dry_run=args.dry_run)
+        print(f"✅ {stats['changed']} of {stats['files']} file(s) changed; uploaded {stats['chunks_uploaded']} "
+              f"chunk(s), {stats['bytes_uploaded'] / 1e6:.1f} MB to {args.target}")
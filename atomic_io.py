@@ -0,0 +1,95 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temp path beside `path`; it replaces `path` only if the block completes.
+
+    A crash mid-write leaves the previous file intact, so a rerun never reads
+    a half-written artifact.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_csv(df, path, **kwargs):
+    kwargs.setdefault("index", False)
+    with atomic_path(path) as tmp:
+        df.to_csv(tmp, **kwargs)
+
+
+def _complete_length(path, block=1 << 16):
+    """Bytes up to the end of the last complete line, or None when the file ends cleanly."""
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return None
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return None
+        pos = end
+        while pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                return pos + newline + 1
+        return 0
+
+
+def append_csv(df, path, **kwargs):
+    """Append rows to `path` in place; the header is written only when the file is new.
+
+    A run costs what it appends rather than the whole file. A crash mid-append
+    can tear the last row: the next append trims it first, and
+    read_appended_csv leaves it out until then.
+    """
+    kwargs.setdefault("index", False)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    has_rows = os.path.exists(path) and os.path.getsize(path) > 0
+    if has_rows:
+        complete = _complete_length(path)
+        if complete is not None:
+            os.truncate(path, complete)
+            has_rows = complete > 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        df.to_csv(f, header=not has_rows, **kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_appended_csv(path, **kwargs):
+    """pd.read_csv for a file written by append_csv, without a row torn mid-append."""
+    complete = _complete_length(path)
+    if complete is None:
+        return pd.read_csv(path, **kwargs)
+    with open(path, "rb") as f:
+        return pd.read_csv(io.BytesIO(f.read(complete)), **kwargs)
+
+
+def write_npz(path, **arrays):
+    with atomic_path(path) as tmp:
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+
+def write_json(obj, path, **kwargs):
+    with atomic_path(path) as tmp:
+        with open(tmp, "w") as f:
+            json.dump(obj, f, **kwargs)
@@ -0,0 +1,170 @@
+import argparse
+import time
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from bet_store import DB_PATH, load_bets
+from odds_snapshots import load_snapshots
+from pricing import american_to_decimal
+from strikeout_features import STATS_PATH, PREDICTION_BOOST, normalize_name
+
+OUTPUT_PATH = "data/backtest_grid.csv"
+
+DEFAULT_BOOSTS = [1.0, 1.05, 1.10, 1.15]
+DEFAULT_THRESHOLDS = [0.25, 0.5, 0.75, 1.0, 1.5, 2.0]
+DEFAULT_ODDS_RANGES = [(-200, 200), (-150, 150), (-130, 130), (100, 200)]
+ALL_BOOKS = "ALL"
+
+
+# === Inputs ===
+def name_key(name):
+    # Props say "carlos rodon", Stathead says "Carlos Rodón"
+    folded = unicodedata.normalize("NFKD", normalize_name(name))
+    return "".join(c for c in folded if not unicodedata.combining(c))
+
+
+def load_base_predictions(db_path=DB_PATH):
+    # Logged predictions already include the boost; undo it so the grid can re-apply any boost
+    bets = load_bets(db_path)
+    bets = bets.sort_values("timestamp").drop_duplicates(["game_date", "player"], keep="last")
+    bets["base_SO"] = bets["predicted_SO"] / PREDICTION_BOOST
+    return bets[["game_date", "player", "base_SO"]]
+
+
+def load_actuals(stats_path=STATS_PATH):
+    stats = pd.read_csv(stats_path, usecols=["Date", "Player", "SO"])
+    stats["local_date"] = pd.to_datetime(stats["Date"], errors="coerce").dt.date.astype(str)
+    stats["name_key"] = stats["Player"].map(name_key)
+    stats["actual_SO"] = pd.to_numeric(stats["SO"], errors="coerce")
+    stats = stats.dropna(subset=["actual_SO"])
+    return stats.groupby(["local_date", "name_key"], as_index=False)["actual_SO"].last()
+
+
+def build_bet_table(snapshots, predictions, actuals):
+    """Last pre-game price for every (prop, book, side), joined to prediction and result."""
+    snaps = snapshots[snapshots["snapshot_time"] <= snapshots["commence_time"]]
+    snaps = snaps.sort_values("snapshot_time").drop_duplicates(
+        ["game_date", "event_id", "player", "bookmaker", "side", "line"], keep="last"
+    )
+    snaps = snaps.assign(
+        game_date=snaps["game_date"].astype(str),
+        local_date=snaps["local_date"].astype(str),
+        name_key=snaps["player"].map(name_key),
+    )
+    table = snaps.merge(predictions.assign(game_date=predictions["game_date"].astype(str)),
+                        on=["game_date", "player"], how="inner")
+    table = table.merge(actuals, on=["local_date", "name_key"], how="inner")
+    return table.sort_values("game_date").reset_index(drop=True)
+
+
+# === Grid evaluation ===
+def run_grid(bets, boosts=DEFAULT_BOOSTS, thresholds=DEFAULT_THRESHOLDS,
+             odds_ranges=DEFAULT_ODDS_RANGES, bookmakers=None):
+    if bets.empty:
+        raise ValueError("No replayable bets: archived snapshots and logged predictions share no dates.")
+
+    boosts = np.asarray(boosts, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    if bookmakers is None:
+        bookmakers = [ALL_BOOKS] + sorted(bets["bookmaker"].unique())
+
+    pred = bets["base_SO"].to_numpy(np.float64)
+    line = bets["line"].to_numpy(np.float64)
+    odds = bets["odds"].to_numpy(np.float64)
+    actual = bets["actual_SO"].to_numpy(np.float64)
+    sign = np.where(bets["side"].str.lower().to_numpy() == "over", 1.0, -1.0)
+
+    win = np.where(sign > 0, actual > line, actual < line)
+    push = actual == line
+    profit = np.where(win, american_to_decimal(odds) - 1.0, np.where(push, 0.0, -1.0))
+
+    # Row-level filters that don't depend on the bet decision: (n, ranges * books)
+    in_range = np.stack([(odds >= lo) & (odds <= hi) for lo, hi in odds_ranges], axis=1)
+    book_names = bets["bookmaker"].to_numpy()
+    in_book = np.stack([np.ones(len(bets), bool) if b == ALL_BOOKS else book_names == b
+                        for b in bookmakers], axis=1)
+    filters = (in_range[:, :, None] & in_book[:, None, :]).reshape(len(bets), -1).astype(np.float64)
+
+    # Bet decision for every (boost, threshold): (n, boosts * thresholds)
+    signed_edge = sign[:, None] * (pred[:, None] * boosts[None, :] - line[:, None])
+    placed = (signed_edge[:, :, None] > thresholds[None, None, :]).reshape(len(bets), -1)
+    placed = placed.astype(np.float64)
+
+    # One matmul per day gives (decision cells x filter cells) totals for that day
+    days, day_starts = np.unique(bets["game_date"].to_numpy(), return_index=True)
+    bounds = list(day_starts) + [len(bets)]
+    shape = (len(days), placed.shape[1], filters.shape[1])
+    daily = {k: np.zeros(shape) for k in ["bets", "wins", "pushes", "profit"]}
+    for d in range(len(days)):
+        rows = slice(bounds[d], bounds[d + 1])
+        P, F = placed[rows].T, filters[rows]
+        daily["bets"][d] = P @ F
+        daily["wins"][d] = P @ (F * win[rows, None])
+        daily["pushes"][d] = P @ (F * push[rows, None])
+        daily["profit"][d] = P @ (F * profit[rows, None])
+
+    totals = {k: v.sum(axis=0) for k, v in daily.items()}
+    cumulative = np.cumsum(daily["profit"], axis=0)
+    peak = np.maximum(np.maximum.accumulate(cumulative, axis=0), 0.0)
+    drawdown = (peak - cumulative).max(axis=0) if len(days) else np.zeros(shape[1:])
+
+    b_idx, t_idx, r_idx, k_idx = np.meshgrid(
+        np.arange(len(boosts)), np.arange(len(thresholds)),
+        np.arange(len(odds_ranges)), np.arange(len(bookmakers)), indexing="ij"
+    )
+    decided = totals["bets"] - totals["pushes"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grid = pd.DataFrame({
+            "boost": boosts[b_idx.ravel()],
+            "edge_threshold": thresholds[t_idx.ravel()],
+            "odds_min": np.array([r[0] for r in odds_ranges])[r_idx.ravel()],
+            "odds_max": np.array([r[1] for r in odds_ranges])[r_idx.ravel()],
+            "bookmaker": np.array(bookmakers, dtype=object)[k_idx.ravel()],
+            "bets": totals["bets"].ravel().astype(int),
+            "wins": totals["wins"].ravel().astype(int),
+            "pushes": totals["pushes"].ravel().astype(int),
+            "win_rate": (totals["wins"] / decided).ravel(),
+            "profit": totals["profit"].ravel(),
+            "roi": (totals["profit"] / totals["bets"]).ravel(),
+            "max_drawdown": drawdown.ravel(),
+        })
+    return grid
+
+
+def parse_floats(text):
+    return [float(x) for x in text.split(",") if x.strip()]
+
+
+def parse_ranges(text):
+    ranges = []
+    for part in text.split(","):
+        lo, hi = part.split(":")
+        ranges.append((float(lo), float(hi)))
+    return ranges
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay archived odds against logged predictions")
+    parser.add_argument("--boosts", default=",".join(map(str, DEFAULT_BOOSTS)))
+    parser.add_argument("--thresholds", default=",".join(map(str, DEFAULT_THRESHOLDS)))
+    parser.add_argument("--odds-ranges", default=",".join(f"{lo}:{hi}" for lo, hi in DEFAULT_ODDS_RANGES),
+                        help="comma-separated lo:hi pairs, e.g. -150:150,100:200")
+    parser.add_argument("--min-bets", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    print("[LOAD] Loading archived snapshots, predictions and actuals...")
+    snapshots = load_snapshots()
+    bets = build_bet_table(snapshots, load_base_predictions(), load_actuals())
+    print(f"[INFO] {len(snapshots)} archived prices -> {len(bets)} replayable bets "
+          f"over {bets['game_date'].nunique()} dates")
+
+    grid = run_grid(bets, parse_floats(args.boosts), parse_floats(args.thresholds),
+                    parse_ranges(args.odds_ranges))
+    grid.to_csv(OUTPUT_PATH, index=False)
+    print(f"[SAVED] {OUTPUT_PATH} ({len(grid)} grid cells) in {time.perf_counter() - start:.2f}s")
+
+    best = grid[grid["bets"] >= args.min_bets].sort_values("roi", ascending=False).head(10)
+    print(best.to_string(index=False) if not best.empty else "[WARN] No cell reached --min-bets.")
@@ -0,0 +1,255 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import date, datetime
+
+from instrumentation import span
+from synthetic_data import SCALES, frozen_today, generate
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(REPO_DIR, "bench_fixtures")
+BENCH_DIR = os.path.join(REPO_DIR, "data", "benchmarks")
+HISTORY_PATH = os.path.join(BENCH_DIR, "history.jsonl")
+
+DEFAULT_THRESHOLD = 0.15
+MIN_DELTA_SECONDS = 0.1  # ignore scheduler jitter on sub-second stages
+BASELINE_RUNS = 5
+# Every fixture is built as of this day and stages run with the clock pinned to it,
+# so a fixture means the same data whenever it was generated. The day after a full
+# season, so every scale gets complete seasons of history.
+FIXTURE_TODAY = date(2025, 10, 1)
+
+
+# === Stages that aren't scripts ===
+def build_features():
+    from strikeout_features import (load_strikeout_props, load_latest_stats, pitcher_lines_from_props,
+                                    merge_lines_with_stats, build_model_input)
+    from model_artifact import load_model
+    _, features = load_model()
+    merged = merge_lines_with_stats(pitcher_lines_from_props(load_strikeout_props()), load_latest_stats())
+    build_model_input(merged, features, verbose=False)
+    return len(merged)
+
+
+def load_dashboard():
+    # What the dashboard reads on first paint and when paging through every date
+    from atomic_io import read_appended_csv
+    from dashboard_store import backfill, load_day, partition_versions
+    from results_summary import RESULTS_PATH, summarize_by_date
+    rows = 0
+    for dataset in ("predictions", "results"):
+        backfill(dataset)
+        for game_date in partition_versions(dataset):
+            rows += len(load_day(dataset, game_date))
+    summarize_by_date(read_appended_csv(RESULTS_PATH))
+    return rows
+
+
+def _reset_predict():
+    # Score the whole board, not whatever an earlier stage left cached
+    for path in ["data/predicted_pitcher_props_with_edges.csv", "data/unmatched_prop_fingerprints.json"]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# (name, script or callable, setup); order follows the daily pipeline
+STAGES = [
+    ("odds_fetch", "bet_logic/Step_1_get_BETONLINE_odds.py", None),
+    ("odds_merge", "bet_logic/Step_3_check_event_id_and_merge.py", None),
+    ("odds_flatten", "bet_logic/Step_2_flatten_odds_api_events.py", None),
+    ("odds_readable", "bet_logic/Step_4_final_merged_readable_odds_api.py", None),
+    ("train", "Full_Training_Script.py", None),
+    ("features", build_features, None),
+    ("predict", "predict_props_with_model.py", _reset_predict),
+    ("grade", "compare_strikeout_picks_to_actual.py", None),
+    ("dashboard", load_dashboard, None),
+]
+
+
+def fixture_path(scale, seed, today=FIXTURE_TODAY):
+    """Generate a scale's fixture once and reuse it; the seed and `today` pin the data."""
+    path = os.path.join(FIXTURE_DIR, f"{scale}_seed{seed}_{today:%Y%m%d}")
+    manifest_path = os.path.join(path, "synthetic_manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f).get("today") == f"{today:%Y-%m-%d}":
+                return path
+    print(f"[FIXTURE] Generating {scale} fixture for {today} in {path}...")
+    shutil.rmtree(path, ignore_errors=True)
+    generate(path, seed=seed, today=today, **SCALES[scale])
+    return path
+
+
+def _run_script(script):
+    argv = sys.argv
+    sys.argv = [script]
+    try:
+        runpy.run_path(os.path.join(REPO_DIR, script), run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise RuntimeError(f"{script} exited with code {e.code}")
+    finally:
+        sys.argv = argv
+
+
+def run_suite(scale="small", seed=0, stages=None, verbose=False):
+    """Run the stages in order on a fresh copy of the fixture, with the clock on the
+    fixture's day; returns one history record."""
+    fixture = fixture_path(scale, seed)
+    selected = [s for s in STAGES if stages is None or s[0] in stages]
+    workdir = tempfile.mkdtemp(prefix=f"bench_{scale}_")
+    cwd, env_replay = os.getcwd(), os.environ.get("ODDS_REPLAY_DIR")
+    results = {}
+    try:
+        shutil.copytree(fixture, workdir, dirs_exist_ok=True)
+        os.chdir(workdir)
+        os.environ["ODDS_REPLAY_DIR"] = workdir
+        with frozen_today(FIXTURE_TODAY):
+            for name, target, setup in selected:
+                if setup:
+                    setup()
+                with span(name) as s, open(os.devnull, "w", encoding="utf-8") as devnull:
+                    try:
+                        # Scripts check stdout's encoding, so quiet them with a real file
+                        with contextlib.redirect_stdout(sys.stdout if verbose else devnull):
+                            rows = target() if callable(target) else _run_script(target)
+                        if rows:
+                            s.add_rows(rows_out=rows)
+                    except Exception as e:
+                        s.error = f"{type(e).__name__}: {e}"
+                results[name] = {k: v for k, v in s.to_dict().items()
+                                 if k in ("wall_s", "cpu_s", "rss_growth_mb", "child_rss_growth_mb",
+                                          "rows_out", "error")}
+                status = "FAILED " + s.error if s.error else f"{s.wall_s:.2f}s"
+                print(f"  {name:<14}{status}")
+    finally:
+        os.chdir(cwd)
+        if env_replay is None:
+            os.environ.pop("ODDS_REPLAY_DIR", None)
+        else:
+            os.environ["ODDS_REPLAY_DIR"] = env_replay
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(os.path.join(fixture, "synthetic_manifest.json")) as f:
+        manifest = json.load(f)
+    return {
+        "run_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "scale": scale,
+        "seed": seed,
+        "fixture": {k: manifest.get(k) for k in ("today", "days", "games", "pitcher_logs", "snapshot_rows", "bet_rows", "board_events")},
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "stages": results,
+    }
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def append_history(record, path=HISTORY_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_history(path=HISTORY_PATH, scale=None):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records if scale is None or r["scale"] == scale]
+
+
+def compare(current, baseline_runs, threshold=DEFAULT_THRESHOLD, min_delta=MIN_DELTA_SECONDS):
+    """Per-stage wall time against the median of the baseline runs.
+
+    A stage regresses when it is both `threshold` slower relative to the
+    baseline and at least `min_delta` seconds slower in absolute terms.
+    """
+    rows, regressions = [], []
+    for name, stats in current["stages"].items():
+        base = [r["stages"][name]["wall_s"] for r in baseline_runs
+                if name in r["stages"] and not r["stages"][name].get("error")]
+        if not base or stats.get("error"):
+            rows.append((name, None, stats["wall_s"], None, "error" if stats.get("error") else "new"))
+            if stats.get("error"):
+                regressions.append(name)
+            continue
+        median = statistics.median(base)
+        change = (stats["wall_s"] - median) / median if median else 0.0
+        flag = "REGRESSION" if change > threshold and stats["wall_s"] - median > min_delta else ""
+        if change < -threshold and median - stats["wall_s"] > min_delta:
+            flag = "faster"
+        if flag == "REGRESSION":
+            regressions.append(name)
+        rows.append((name, median, stats["wall_s"], change, flag))
+    return rows, regressions
+
+
+def print_comparison(rows):
+    print(f"{'stage':<14}{'baseline_s':>11}{'current_s':>11}{'change':>9}  flag")
+    for name, base, cur, change, flag in rows:
+        base_text = f"{base:.3f}" if base is not None else "-"
+        change_text = f"{change:+.0%}" if change is not None else "-"
+        print(f"{name:<14}{base_text:>11}{cur:>11.3f}{change_text:>9}  {flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage benchmarks on synthetic fixtures")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="time every stage and append to the history")
+    run_p.add_argument("--scale", choices=sorted(SCALES), default="small")
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--stages", nargs="+", choices=[s[0] for s in STAGES])
+    run_p.add_argument("--repeat", type=int, default=1)
+    run_p.add_argument("--verbose", action="store_true", help="show stage output")
+
+    cmp_p = sub.add_parser("compare", help="check the latest run against earlier ones; exit 1 on regression")
+    cmp_p.add_argument("--scale", choices=sorted(SCALES), default="small")
+    cmp_p.add_argument("--baseline", help="run_id to compare against (default: median of the previous runs)")
+    cmp_p.add_argument("--runs", type=int, default=BASELINE_RUNS, help="previous runs in the default baseline")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        for i in range(args.repeat):
+            print(f"[BENCH] {args.scale} run {i + 1}/{args.repeat}")
+            record = run_suite(args.scale, args.seed, args.stages, args.verbose)
+            append_history(record)
+        print(f"[BENCH] Appended to {HISTORY_PATH}")
+    else:
+        history = load_history(scale=args.scale)
+        if len(history) < 2:
+            print(f"[BENCH] Need at least two {args.scale} runs in {HISTORY_PATH} to compare.")
+            sys.exit(0)
+        current = history[-1]
+        if args.baseline:
+            baseline = [r for r in history if r["run_id"] == args.baseline]
+            if not baseline:
+                print(f"[BENCH] No {args.scale} run with id {args.baseline}.")
+                sys.exit(2)
+        else:
+            baseline = history[-1 - args.runs:-1]
+        print(f"[BENCH] {current['run_id']} ({current['git_rev']}) vs "
+              f"{', '.join(r['run_id'] for r in baseline)} (threshold {args.threshold:.0%})")
+        rows, regressions = compare(current, baseline, args.threshold)
+        print_comparison(rows)
+        if regressions:
+            print(f"❌ Regression in: {', '.join(regressions)}")
+            sys.exit(1)
+        print("✅ No regressions.")
@@ -3,6 +3,8 @@ import ast
 from datetime import date
 import os
 
+from atomic_io import write_csv
+
 # === Load and parse the merged props file ===
 df = pd.read_csv("data/merged_game_props.csv")
 
@@ -30,7 +32,9 @@ def clean_props(props_list):
                 "player": name,
                 "market": prop.get("market"),
                 "line": prop.get("line"),
-                "odds": prop.get("odds")
+                "odds": prop.get("odds"),
+                "bookmaker": prop.get("bookmaker"),
+                "side": prop.get("side")
             })
     return cleaned
 
@@ -72,6 +76,6 @@ for _, row in df.iterrows():
 # === Save the final flat output ===
 final_df = pd.DataFrame(flat_rows)
 output_file = "data/flat_combined_teams_pitchers_batters.csv"
-final_df.to_csv(output_file, index=False)
+write_csv(final_df, output_file)
 
 print(f"✅ Saved 3x per game format to:\n📄 {os.path.abspath(output_file)}")
@@ -3,10 +3,13 @@ import os
 import shutil
 from datetime import datetime, date
 
+from atomic_io import write_csv
+from schema import compact
+
 # === Load all data ===
-pitcher_df = pd.read_csv("data/betonline_pitcher_props.csv")
-batter_df = pd.read_csv("data/betonline_batter_props.csv")
-team_df = pd.read_csv("data/betonline_team_lines.csv")  # Use unfiltered, fresh file
+pitcher_df = compact(pd.read_csv("data/betonline_pitcher_props.csv"), "pitcher props")
+batter_df = compact(pd.read_csv("data/betonline_batter_props.csv"), "batter props")
+team_df = compact(pd.read_csv("data/betonline_team_lines.csv"), "team lines")  # Use unfiltered, fresh file
 
 # Ensure event_id is str
 for df in [pitcher_df, batter_df, team_df]:
@@ -70,7 +73,9 @@ def group_props(df, role):
                     "player": name,
                     "market": row["market"],
                     "line": row["line"],
-                    "odds": row["odds"]
+                    "odds": row["odds"],
+                    "bookmaker": row.get("bookmaker"),
+                    "side": row.get("raw_name")
                 })
         return records
 
@@ -103,7 +108,7 @@ if os.path.exists("data/merged_game_props.csv"):
 
 # === Save new output
 merged.to_json("data/merged_game_props.json", orient="records", indent=2)
-merged.to_csv("data/merged_game_props.csv", index=False)
+write_csv(merged, "data/merged_game_props.csv")
 
 print(f"\n✅ Merged game-level file saved with {len(merged)} rows")
 print(f"📄 JSON: {os.path.abspath('data/merged_game_props.json')}")
@@ -1,6 +1,8 @@
 ﻿import pandas as pd
 import ast
 
+from atomic_io import write_csv
+
 # === Load the merged file ===
 df = pd.read_csv("data/merged_game_props.csv")
 
@@ -47,7 +49,9 @@ for _, row in df.iterrows():
             "player": prop.get("player"),
             "market": prop.get("market"),
             "line": prop.get("line"),
-            "odds": prop.get("odds")
+            "odds": prop.get("odds"),
+            "bookmaker": prop.get("bookmaker"),
+            "side": prop.get("side")
         })
 
     # 3. Batter props
@@ -58,11 +62,13 @@ for _, row in df.iterrows():
             "player": prop.get("player"),
             "market": prop.get("market"),
             "line": prop.get("line"),
-            "odds": prop.get("odds")
+            "odds": prop.get("odds"),
+            "bookmaker": prop.get("bookmaker"),
+            "side": prop.get("side")
         })
 
 # === Save the flat, clean output ===
 flat_df = pd.DataFrame(rows)
-flat_df.to_csv("data/clean_all_props_flat.csv", index=False)
+write_csv(flat_df, "data/clean_all_props_flat.csv")
 
 print(f"✅ All team, pitcher, and batter props saved to: data/clean_all_props_flat.csv")
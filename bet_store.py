@@ -0,0 +1,144 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+DB_PATH = "data/strikeout_model_bets.db"
+
+BET_COLUMNS = [
+    "game_date", "player", "line", "odds",
+    "predicted_SO", "edge", "bet_recommendation",
+    "confidence", "actual_SO", "result_hit", "timestamp", "model_version",
+]
+KEY_COLUMNS = ["game_date", "player", "line", "odds", "model_version"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bets (
+    game_date TEXT NOT NULL,
+    player TEXT NOT NULL,
+    line REAL NOT NULL,
+    odds TEXT NOT NULL,
+    predicted_SO REAL,
+    edge REAL,
+    bet_recommendation TEXT,
+    confidence TEXT,
+    actual_SO REAL,
+    result_hit TEXT,
+    timestamp TEXT,
+    model_version TEXT NOT NULL DEFAULT '',
+    UNIQUE (game_date, player, line, odds, model_version)
+);
+CREATE INDEX IF NOT EXISTS idx_bets_game_date ON bets (game_date);
+CREATE INDEX IF NOT EXISTS idx_bets_player ON bets (player);
+"""
+
+# Re-logging the same prop refreshes the model output but never wipes a grade
+UPSERT = f"""
+INSERT INTO bets ({", ".join(BET_COLUMNS)})
+VALUES ({", ".join("?" for _ in BET_COLUMNS)})
+ON CONFLICT ({", ".join(KEY_COLUMNS)}) DO UPDATE SET
+    predicted_SO = excluded.predicted_SO,
+    edge = excluded.edge,
+    bet_recommendation = excluded.bet_recommendation,
+    confidence = excluded.confidence,
+    actual_SO = COALESCE(excluded.actual_SO, bets.actual_SO),
+    result_hit = COALESCE(excluded.result_hit, bets.result_hit),
+    timestamp = excluded.timestamp
+"""
+
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    ensure_schema(conn)
+    return conn
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def ensure_schema(conn):
+    existing = _columns(conn, "bets")
+    if existing and "model_version" not in existing:
+        _migrate_legacy(conn)
+    conn.executescript(SCHEMA)
+
+
+def _migrate_legacy(conn):
+    # The original table had no key, so every rerun duplicated the slate.
+    # Keep the newest copy of each prop and tag it as a legacy model.
+    print("[MIGRATE] Rebuilding bets table with unique key and indexes...")
+    with conn:
+        conn.execute("ALTER TABLE bets RENAME TO bets_legacy")
+        conn.executescript(SCHEMA)
+        rows = conn.execute(f"""
+            SELECT {", ".join(BET_COLUMNS[:-1])}, 'legacy'
+            FROM bets_legacy
+            ORDER BY timestamp
+        """).fetchall()
+        rows = [r[:3] + (normalize_odds(r[3]),) + r[4:] for r in rows]
+        conn.executemany(UPSERT, rows)
+        conn.execute("DROP TABLE bets_legacy")
+    conn.execute("VACUUM")
+    print(f"[MIGRATE] Kept {conn.execute('SELECT COUNT(*) FROM bets').fetchone()[0]} unique rows")
+
+
+def normalize_odds(odds):
+    # -110, -110.0 and "-110" must all hit the same unique key
+    try:
+        value = float(odds)
+    except (TypeError, ValueError):
+        return str(odds)
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def _nullable(values):
+    return [None if pd.isna(v) else v for v in values]
+
+
+def log_predictions(df, model_version, timestamp, db_path=DB_PATH):
+    """Upsert one row per prop; returns the number of rows written."""
+    if df.empty:
+        return 0
+
+    frame = pd.DataFrame({
+        "game_date": df["game_date"].astype(str),
+        "player": df["player"],
+        "line": df["line"].astype(float),
+        "odds": [normalize_odds(o) for o in df["odds"]],
+        "predicted_SO": df["predicted_SO"].astype(float),
+        "edge": df["edge"].astype(float),
+        "bet_recommendation": df["bet_recommendation"],
+        "confidence": df.get("confidence", pd.Series("", index=df.index)),
+        "actual_SO": _nullable(df.get("actual_SO", pd.Series(np.nan, index=df.index))),
+        "result_hit": _nullable(df.get("result_hit", pd.Series(None, index=df.index, dtype=object))),
+        "timestamp": timestamp,
+        "model_version": model_version,
+    })[BET_COLUMNS]
+
+    rows = list(frame.astype(object).itertuples(index=False, name=None))
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(UPSERT, rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def load_bets(db_path=DB_PATH, game_date=None, player=None):
+    conn = connect(db_path)
+    try:
+        clauses, params = [], []
+        if game_date is not None:
+            clauses.append("game_date = ?")
+            params.append(str(game_date))
+        if player is not None:
+            clauses.append("player = ?")
+            params.append(player)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return pd.read_sql_query(f"SELECT * FROM bets{where}", conn, params=params)
+    finally:
+        conn.close()
@@ -0,0 +1,204 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import read_appended_csv
+from bet_store import DB_PATH, load_bets
+from odds_snapshots import SNAPSHOT_TZ, load_snapshots
+from pricing import american_to_decimal, implied_probability
+from strikeout_features import normalize_name
+
+RESULTS_PATH = "data/bets_vs_actuals_strikeouts.csv"
+BETS_OUT = "data/clv_bets.csv"
+DAY_OUT = "data/clv_by_day.csv"
+BOOK_OUT = "data/clv_by_book.csv"
+
+MARKET = "pitcher_strikeouts"
+PROP_KEYS = ["game_date", "player", "market", "bookmaker", "side", "line"]
+
+
+# === Inputs ===
+def _side(recommendation):
+    rec = recommendation.astype(str)
+    return np.select([rec.str.contains("Over"), rec.str.contains("Under")], ["Over", "Under"], default="")
+
+
+def load_logged_bets(db_path=DB_PATH, results_path=RESULTS_PATH):
+    """Every Over/Under call from the bets table and the graded results file.
+
+    The bets table knows when each prediction was made. Graded rows don't, so
+    they borrow the timestamp of the matching logged prediction when one exists.
+    """
+    logged = load_bets(db_path)
+    logged = pd.DataFrame({
+        "game_date": logged["game_date"].astype(str),
+        "player": logged["player"].map(normalize_name),
+        "line": logged["line"].astype(float),
+        "odds": pd.to_numeric(logged["odds"], errors="coerce"),
+        "side": _side(logged["bet_recommendation"]),
+        "bet_time": pd.to_datetime(logged["timestamp"], errors="coerce").dt.tz_localize(SNAPSHOT_TZ),
+        "source": "bets_table",
+    })
+
+    frames = [logged]
+    if os.path.exists(results_path):
+        graded = read_appended_csv(results_path)
+        graded = pd.DataFrame({
+            "game_date": pd.to_datetime(graded["Game_Date"], errors="coerce").dt.date.astype(str),
+            "player": graded["Pitcher"].map(normalize_name),
+            "line": pd.to_numeric(graded["line"], errors="coerce"),
+            "odds": pd.to_numeric(graded["odds"], errors="coerce"),
+            "side": _side(graded["bet_recommendation"]),
+            "source": "graded",
+        })
+        first_seen = logged.groupby(["game_date", "player", "line", "odds"], as_index=False)["bet_time"].min()
+        frames.append(graded.merge(first_seen, on=["game_date", "player", "line", "odds"], how="left"))
+
+    bets = pd.concat(frames, ignore_index=True)
+    bets = bets[(bets["side"] != "") & bets["line"].notna() & bets["odds"].notna()]
+    bets = bets.drop_duplicates(["game_date", "player", "line", "odds", "side", "bet_time"])
+    bets["market"] = MARKET
+    return bets.reset_index(drop=True)
+
+
+# === As-of joins ===
+def _asof(left, right, left_on, price_col):
+    # merge_asof needs both sides sorted on the time key; "by" keeps each
+    # (player, market, book, side, line) on its own price history.
+    right = right[PROP_KEYS + ["snapshot_time", "odds"]].rename(columns={"odds": price_col})
+    # merge_asof also insists the "by" and time columns share dtypes exactly
+    text_keys = [k for k in PROP_KEYS if k != "line"]
+    left = left.astype({k: str for k in text_keys} | {left_on: "datetime64[ns, UTC]"})
+    right = right.astype({k: str for k in text_keys} | {"snapshot_time": "datetime64[ns, UTC]"})
+    return pd.merge_asof(
+        left.sort_values(left_on), right.sort_values("snapshot_time"),
+        left_on=left_on, right_on="snapshot_time", by=PROP_KEYS, direction="backward",
+    ).drop(columns="snapshot_time")
+
+
+def compute_clv(bets, snapshots):
+    """One row per (bet, bookmaker) with the price at bet time and at the close."""
+    snaps = snapshots[snapshots["snapshot_time"] <= snapshots["commence_time"]].copy()
+    snaps["game_date"] = snaps["game_date"].astype(str)
+    snaps["line"] = snaps["line"].astype(float)
+
+    # Fan each bet out to every book that priced the same prop
+    books = snaps.groupby(PROP_KEYS, as_index=False)["commence_time"].max()
+    table = bets.merge(books, on=["game_date", "player", "market", "side", "line"], how="inner")
+    table = _asof(table, snaps, "commence_time", "closing_odds")
+
+    timed = table["bet_time"].notna()
+    entry = _asof(table[timed], snaps, "bet_time", "entry_odds")
+    table = pd.concat([entry, table[~timed].assign(entry_odds=np.nan)], ignore_index=True)
+
+    # Without an archived price at bet time, the logged odds are the entry price
+    table["entry_odds"] = table["entry_odds"].fillna(table["odds"])
+    table = table.dropna(subset=["closing_odds"])
+
+    close_prob = implied_probability(table["closing_odds"].to_numpy(np.float64))
+    table["entry_prob"] = implied_probability(table["entry_odds"].to_numpy(np.float64))
+    table["closing_prob"] = close_prob
+    table["clv_prob"] = table["closing_prob"] - table["entry_prob"]
+    # Expected return of the entry price if the close is the true probability
+    table["clv"] = american_to_decimal(table["entry_odds"].to_numpy(np.float64)) * close_prob - 1.0
+    return table.sort_values(["game_date", "player", "bookmaker"]).reset_index(drop=True)
+
+
+# === Reports ===
+def clv_distribution(table, by):
+    grouped = table.groupby(by)["clv"]
+    report = grouped.agg(
+        bets="count", mean_clv="mean", median_clv="median",
+        p10=lambda s: s.quantile(0.10), p90=lambda s: s.quantile(0.90),
+    )
+    report["beat_close_pct"] = grouped.apply(lambda s: (s > 0).mean())
+    return report.reset_index()
+
+
+# === Benchmark ===
+def synthetic_season(days=180, pitchers=30, books=6, snapshots_per_day=12, seed=0):
+    """Random but well-formed snapshots and bets at a season's scale."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2025-03-27", periods=days, freq="D", tz="UTC")
+    players = [f"pitcher {i}" for i in range(pitchers)]
+    bookmakers = [f"book{i}" for i in range(books)]
+
+    day, player, book, side, snap = np.meshgrid(
+        np.arange(days), np.arange(pitchers), np.arange(books), np.arange(2),
+        np.arange(snapshots_per_day), indexing="ij",
+    )
+    day, player, book, side, snap = (a.ravel() for a in (day, player, book, side, snap))
+    commence = dates[day] + pd.Timedelta(hours=23)
+    line = 4.5 + (player % 4)
+    snaps = pd.DataFrame({
+        "event_id": day * pitchers + player,
+        "commence_time": commence,
+        "snapshot_time": dates[day] + pd.to_timedelta(snap * 110, unit="min"),
+        "player": np.asarray(players)[player],
+        "market": MARKET,
+        "line": line.astype(float),
+        "odds": np.where(rng.random(len(day)) < 0.5, -1, 1) * rng.integers(100, 160, len(day)),
+        "bookmaker": np.asarray(bookmakers)[book],
+        "side": np.where(side == 0, "Over", "Under"),
+    })
+    snaps["game_date"] = snaps["commence_time"].dt.date
+
+    bet_day, bet_player = np.meshgrid(np.arange(days), np.arange(pitchers), indexing="ij")
+    bet_day, bet_player = bet_day.ravel(), bet_player.ravel()
+    bets = pd.DataFrame({
+        "game_date": dates[bet_day].date.astype(str),
+        "player": np.asarray(players)[bet_player],
+        "line": (4.5 + bet_player % 4).astype(float),
+        "odds": -110.0,
+        "side": np.where(rng.random(len(bet_day)) < 0.5, "Over", "Under"),
+        "bet_time": dates[bet_day] + pd.Timedelta(hours=6),
+        "source": "synthetic",
+        "market": MARKET,
+    })
+    return bets, snaps
+
+
+def run_benchmark(**kwargs):
+    bets, snaps = synthetic_season(**kwargs)
+    start = time.perf_counter()
+    table = compute_clv(bets, snaps)
+    by_day = clv_distribution(table, "game_date")
+    by_book = clv_distribution(table, "bookmaker")
+    elapsed = time.perf_counter() - start
+    print(f"[BENCH] {len(snaps):,} snapshot prices x {len(bets):,} bets -> {len(table):,} CLV rows, "
+          f"{len(by_day)} days, {len(by_book)} books in {elapsed:.2f}s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Closing line value of logged strikeout bets")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="time the joins on a synthetic season of snapshots instead")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        raise SystemExit(0)
+
+    start = time.perf_counter()
+    print("[LOAD] Loading logged bets and archived snapshots...")
+    bets = load_logged_bets()
+    table = compute_clv(bets, load_snapshots(market=MARKET))
+    if table.empty:
+        print("[WARN] No logged bet has an archived closing price.")
+        raise SystemExit(0)
+
+    table.to_csv(BETS_OUT, index=False)
+    by_day = clv_distribution(table, "game_date")
+    by_book = clv_distribution(table, "bookmaker")
+    by_day.to_csv(DAY_OUT, index=False)
+    by_book.to_csv(BOOK_OUT, index=False)
+    print(f"[SAVED] {BETS_OUT} ({len(table)} bet/book rows from {len(bets)} bets) "
+          f"in {time.perf_counter() - start:.2f}s")
+    print("\n=== CLV by day ===")
+    print(by_day.to_string(index=False))
+    print("\n=== CLV by bookmaker ===")
+    print(by_book.to_string(index=False))
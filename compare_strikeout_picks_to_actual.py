@@ -1,14 +1,26 @@
 ﻿import pandas as pd
+import numpy as np
 import os
 import re
+import json
 from datetime import datetime
 from difflib import get_close_matches
+from instrumentation import add_rows
+from atomic_io import append_csv, read_appended_csv, write_json
+from results_summary import SUMMARY_PATH, add_outcomes, refresh as refresh_summary, update as update_summary
 
 # === CONFIG ===
 bets_dir = "filtered_bets"
 stats_file = "new_data/stathead_player_pitching_game_data.csv"
+output_file = "data/bets_vs_actuals_strikeouts.csv"
+watermark_file = "data/graded_watermark.json"
 today = datetime.today().date()
 
+RESULT_COLUMNS = [
+    "Game_Date", "Pitcher", "line", "odds", "Predicted_K", "edge", "bet_recommendation",
+    "confidence", "predicted_so", "Pitcher_clean", "Pitcher_fuzzy", "Strikeouts", "Result", "Outcome", "Units"
+]
+
 # === EXTRACT DATE FROM FILENAME ===
 def extract_date_from_filename(filename):
     match = re.search(r"(\d{4}-\d{2}-\d{2})", filename)
@@ -16,62 +28,113 @@ def extract_date_from_filename(filename):
         return datetime.strptime(match.group(1), "%Y-%m-%d").date()
     return None
 
+def clean_pitcher(series):
+    return series.astype(str).str.lower().str.strip().str.replace(r"[^\w\s]", "", regex=True)
+
+# A bet is the same bet no matter which saved file it came from
+def bet_keys(df):
+    def text(values):
+        return values.astype(str).fillna("nan")
+    def num(col):
+        return text(pd.to_numeric(df[col], errors="coerce").round(6)) if col in df else "nan"
+    return (
+        text(df["Game_Date"]) + "|" + text(df["Pitcher"]) + "|"
+        + num("line") + "|" + num("odds") + "|" + num("Predicted_K")
+    )
+
+# === WATERMARK ===
+def load_watermark():
+    if os.path.exists(watermark_file):
+        with open(watermark_file, "r") as f:
+            wm = json.load(f)
+        return {k: set(v) for k, v in wm["files"].items()}, set(wm["keys"])
+
+    # First incremental run: everything already in the results store counts as graded
+    keys = set()
+    if os.path.exists(output_file):
+        existing = read_appended_csv(output_file, usecols=lambda c: c in RESULT_COLUMNS)
+        existing["Game_Date"] = pd.to_datetime(existing["Game_Date"]).dt.date
+        keys = set(bet_keys(existing))
+        print(f"[WATERMARK] Seeded {len(keys)} graded bets from {output_file}")
+    return {}, keys
+
+def save_watermark(files, keys):
+    write_json({
+        "files": {k: sorted(v) for k, v in sorted(files.items())},
+        "keys": sorted(keys),
+    }, watermark_file)
+
+graded_rows, graded_keys = load_watermark()
+
 # === COLLECT VALID FILES ===
 bet_files = [
-    os.path.join(bets_dir, f)
-    for f in os.listdir(bets_dir)
+    f for f in sorted(os.listdir(bets_dir))
     if f.endswith(".csv") and "filtered_bets_" in f
 ]
-
 valid_files = [f for f in bet_files if extract_date_from_filename(f) and extract_date_from_filename(f) < today]
 if not valid_files:
     print("⚠️ No valid filtered_bets CSVs found before today.")
     exit()
 
-# === DEBUG: INSPECT FILES ===
-print("=== DEBUG: Valid bet files loaded ===")
+# === READ ONLY UNGRADED ROWS ===
+print("=== Scanning bet files for ungraded rows ===")
 dfs = []
 for f in valid_files:
-    print(f"\n→ Reading: {f}")
+    done = graded_rows.get(f, set())
     try:
-        df = pd.read_csv(f)
-        print("   Columns:", df.columns.tolist())
-        if not df.empty:
-            print("   Sample row:", df.iloc[0].to_dict())
-            dfs.append(df)
-        else:
-            print("   ⚠️ Skipped: File is empty.")
+        df = pd.read_csv(os.path.join(bets_dir, f))
     except Exception as e:
-        print("   ❌ Error reading file:", e)
+        print(f"   ❌ Error reading {f}:", e)
+        continue
+    df["_source_file"] = f
+    df["_source_row"] = np.arange(len(df))
+    df = df[~df["_source_row"].isin(done)]
+    if not df.empty:
+        print(f"→ {f}: {len(df)} new row(s)")
+        dfs.append(df)
 
 if not dfs:
-    print("❌ All valid files are empty or failed to load.")
+    print("✅ Nothing new to grade.")
+    if os.path.exists(output_file) and not os.path.exists(SUMMARY_PATH):
+        refresh_summary(output_file)
     exit()
 
-# === MERGE & DEDUPLICATE ===
-all_bets = pd.concat(dfs, ignore_index=True).drop_duplicates()
+pending = pd.concat(dfs, ignore_index=True)
 
 # === RENAME TO EXPECTED NAMES ===
 rename_map = {'game_date': 'Game_Date', 'player': 'Pitcher', 'predicted_SO': 'Predicted_K'}
-all_bets.rename(columns=rename_map, inplace=True)
+pending.rename(columns=rename_map, inplace=True)
+
+# Dashboard exports lowercase predicted_so; grade those too
+if "predicted_so" in pending.columns:
+    if "Predicted_K" not in pending.columns:
+        pending["Predicted_K"] = np.nan
+    pending["Predicted_K"] = pending["Predicted_K"].fillna(pending["predicted_so"])
 
 # === COLUMN CHECK ===
 required_cols = ['Game_Date', 'Pitcher', 'Predicted_K']
-missing = [col for col in required_cols if col not in all_bets.columns]
+missing = [col for col in required_cols if col not in pending.columns]
 if missing:
     print(f"❌ ERROR: Missing required column(s): {missing}")
     exit()
 
 # === CLEANING ===
-all_bets['Game_Date'] = pd.to_datetime(all_bets['Game_Date']).dt.date
-all_bets['Pitcher'] = all_bets['Pitcher'].astype(str).str.lower().str.strip().str.replace(r"[^\w\s]", "", regex=True)
-all_bets['Pitcher_clean'] = all_bets['Pitcher']
+pending['Game_Date'] = pd.to_datetime(pending['Game_Date']).dt.date
+pending['Pitcher'] = clean_pitcher(pending['Pitcher'])
+pending['Pitcher_clean'] = pending['Pitcher']
+pending["_key"] = bet_keys(pending)
+
+# Rows already graded from another file only need their watermark entry
+already = pending["_key"].isin(graded_keys)
+for f, rows in pending.loc[already].groupby("_source_file")["_source_row"]:
+    graded_rows.setdefault(f, set()).update(rows.tolist())
+all_bets = pending[~already].drop_duplicates(subset="_key").copy()
+print(f"\n[INFO] {len(all_bets)} new bet(s) to grade, {int(already.sum())} already graded elsewhere")
 
 # === LOAD STATS FILE ===
 try:
-    actuals = pd.read_csv(stats_file)
+    actuals = pd.read_csv(stats_file, usecols=['Date', 'Player', 'SO'])
     print("\n✅ Loaded actual stats:", stats_file)
-    print("   Columns:", actuals.columns.tolist())
 except FileNotFoundError:
     print(f"❌ ERROR: File not found -> {stats_file}")
     exit()
@@ -79,7 +142,7 @@ except FileNotFoundError:
 # === ACTUALS CLEANING ===
 actuals.rename(columns={'Date': 'Game_Date', 'Player': 'Pitcher', 'SO': 'Strikeouts'}, inplace=True)
 actuals['Game_Date'] = pd.to_datetime(actuals['Game_Date'], errors='coerce').dt.date
-actuals['Pitcher'] = actuals['Pitcher'].astype(str).str.lower().str.strip().str.replace(r"[^\w\s]", "", regex=True)
+actuals['Pitcher'] = clean_pitcher(actuals['Pitcher'])
 actuals['Pitcher_clean'] = actuals['Pitcher']
 actuals = actuals.dropna(subset=['Game_Date', 'Pitcher', 'Strikeouts'])
 
@@ -87,7 +150,6 @@ actuals = actuals.dropna(subset=['Game_Date', 'Pitcher', 'Strikeouts'])
 actuals = actuals.sort_values("Game_Date")
 actuals = actuals.groupby(['Game_Date', 'Pitcher_clean'], as_index=False).agg({"Strikeouts": "last"})
 
-
 # === FUZZY MATCHING ===
 print("\n🔁 Performing fuzzy name matching...")
 actual_names = actuals['Pitcher_clean'].dropna().unique().tolist()
@@ -112,51 +174,59 @@ merged = pd.merge(
     how='left'
 )
 
-# === Handle unmatched rows with fallback name-only match ===
-unmatched = merged[merged['Strikeouts'].isna()].copy()
+# === Fallback: match by name only (last known game), one lookup table for all rows ===
+unmatched = merged['Strikeouts'].isna()
 print("\n=== ⚠️ UNMATCHED PREDICTIONS (exact date match failed) ===")
-print(unmatched[['Game_Date', 'Pitcher']].drop_duplicates().to_string(index=False))
-
-# === Fallback: Try to match by name only (last known game) ===
-fallback_matches = []
-for _, row in unmatched.iterrows():
-    fuzzy_name = row['Pitcher_fuzzy']
-    possible = actuals[actuals['Pitcher_fuzzy'] == fuzzy_name]
-    if not possible.empty:
-        latest = possible.sort_values("Game_Date").iloc[-1]
-        row['Strikeouts'] = latest['Strikeouts']
-        fallback_matches.append(row)
-
-# Combine successful matches and fallback
-if fallback_matches:
-    fallback_df = pd.DataFrame(fallback_matches)
-    matched_df = merged[~merged.index.isin(unmatched.index)]
-    merged = pd.concat([matched_df, fallback_df], ignore_index=True)
-
-# === Sample from actuals ===
-print("\n=== 🔍 Sample ACTUALS (cleaned) ===")
-print(actuals[['Game_Date', 'Pitcher_clean', 'Strikeouts']].dropna().sample(10).to_string(index=False))
-
+print(merged.loc[unmatched, ['Game_Date', 'Pitcher']].drop_duplicates().to_string(index=False))
 
+# Only for bets on or before the pitcher's latest logged game; a later game's actual
+# just isn't in the logs yet, and its row must wait rather than take an old game's total
+last_game = actuals.groupby('Pitcher_fuzzy').agg(Game_Date=('Game_Date', 'last'), Strikeouts=('Strikeouts', 'last'))
+last_logged = pd.to_datetime(merged['Pitcher_fuzzy'].map(last_game['Game_Date']))
+fallback = unmatched & (pd.to_datetime(merged['Game_Date']) <= last_logged)
+merged.loc[fallback, 'Strikeouts'] = merged.loc[fallback, 'Pitcher_fuzzy'].map(last_game['Strikeouts'])
 
 # === DETERMINE RESULTS ===
-def compare(row):
-    if pd.isna(row['Strikeouts']) or pd.isna(row['Predicted_K']):
-        return 'No Data'
-    elif row['Strikeouts'] > row['Predicted_K']:
-        return 'Over'
-    elif row['Strikeouts'] < row['Predicted_K']:
-        return 'Under'
-    else:
-        return 'Push'
+merged['Result'] = np.select(
+    [
+        merged['Strikeouts'].isna() | merged['Predicted_K'].isna(),
+        merged['Strikeouts'] > merged['Predicted_K'],
+        merged['Strikeouts'] < merged['Predicted_K'],
+    ],
+    ['No Data', 'Over', 'Under'],
+    default='Push'
+)
 
-merged['Result'] = merged.apply(compare, axis=1)
+# Bets with no actual yet stay ungraded and are retried next run
+graded = merged[merged['Strikeouts'].notna()]
+waiting = merged[merged['Strikeouts'].isna()]
+if not waiting.empty:
+    print(f"\n⏳ {len(waiting)} bet(s) have no actuals yet; will retry next run.")
 
 # === OUTPUT ===
-print("\n=== ✅ Summary of Predictions vs Actuals ===")
-print(merged[['Game_Date', 'Pitcher', 'Predicted_K', 'Strikeouts', 'Result']])
-
-# === EXPORT ===
-output_file = "data/bets_vs_actuals_strikeouts.csv"
-merged.to_csv(output_file, index=False)
-print(f"\n📁 Output saved to {output_file}")
+print("\n=== ✅ Newly graded predictions vs actuals ===")
+print(graded[['Game_Date', 'Pitcher', 'Predicted_K', 'Strikeouts', 'Result']])
+
+# === APPEND TO RESULTS STORE ===
+if not graded.empty:
+    graded = add_outcomes(graded.copy())
+    if os.path.exists(output_file):
+        columns = pd.read_csv(output_file, nrows=0).columns.tolist()
+        append_csv(graded.reindex(columns=columns), output_file)
+    else:
+        append_csv(graded.reindex(columns=RESULT_COLUMNS), output_file)
+    print(f"\n📁 Appended {len(graded)} row(s) to {output_file}")
+
+    # Per-date totals for the dashboard, touching only the dates just graded
+    summary = update_summary(graded, output_file)
+    print(f"📁 {len(summary)} date(s) summarized to {SUMMARY_PATH}")
+
+add_rows(len(pending), len(graded))
+
+# === ADVANCE WATERMARK ===
+graded_keys.update(graded["_key"])
+settled = pending["_key"].isin(graded_keys)
+for f, rows in pending.loc[settled].groupby("_source_file")["_source_row"]:
+    graded_rows.setdefault(f, set()).update(rows.tolist())
+save_watermark(graded_rows, graded_keys)
+print(f"[WATERMARK] {sum(len(v) for v in graded_rows.values())} graded rows across {len(graded_rows)} file(s)")
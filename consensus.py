@@ -0,0 +1,103 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from pricing import american_to_decimal, implied_probability
+
+PROP_KEYS = ["game_date", "player", "line"]
+OUTPUT_PATH = "data/consensus_pitcher_strikeouts.csv"
+
+
+def book_pairs(props, player_col="description", side_col="raw_name"):
+    """One row per (prop, book) with each side's price and the book's no-vig split.
+
+    props is the long Odds API table (one row per outcome). When a book was
+    captured more than once, its latest quote wins. A book quoting only one
+    side keeps that price, with no vig or fair split since there's no pair to devig.
+    """
+    df = props.rename(columns={player_col: "player", side_col: "side"})
+    if "last_update" in df.columns:
+        df = df.sort_values("last_update", kind="stable")
+    df = df.drop_duplicates(PROP_KEYS + ["bookmaker", "side"], keep="last")
+
+    pairs = df.pivot_table(
+        index=PROP_KEYS + ["bookmaker"], columns="side", values="odds", aggfunc="last", observed=True
+    ).reindex(columns=["Over", "Under"])
+    pairs.columns = ["over_odds", "under_odds"]
+    pairs = pairs.reset_index()
+
+    p_over = implied_probability(pairs["over_odds"].to_numpy(np.float64))
+    p_under = implied_probability(pairs["under_odds"].to_numpy(np.float64))
+    total = p_over + p_under
+    pairs["vig"] = total - 1.0
+    # Multiplicative devig: scale both sides so the book's market sums to 1
+    pairs["fair_over"] = p_over / total
+    pairs["fair_under"] = p_under / total
+    return pairs
+
+
+def _best_price(pairs, side):
+    odds_col = f"{side}_odds"
+    quoted = pairs[pairs[odds_col].notna()]
+    ranked = quoted.assign(_payout=american_to_decimal(quoted[odds_col].to_numpy(np.float64)))
+    ranked = ranked.sort_values(PROP_KEYS + ["_payout"], kind="stable")
+    best = ranked.drop_duplicates(PROP_KEYS, keep="last")
+    return best[PROP_KEYS + [odds_col, "bookmaker"]].rename(
+        columns={odds_col: f"best_{side}_odds", "bookmaker": f"best_{side}_book"}
+    )
+
+
+def consensus_lines(pairs):
+    """Cross-book fair probability and best available price for every line.
+
+    The consensus averages books quoting both sides (n_books of them), so a line
+    no book quotes both ways is left out; the best price on each side looks at
+    every book that quotes it.
+    """
+    consensus = pairs.groupby(PROP_KEYS, as_index=False, observed=True).agg(
+        consensus_over=("fair_over", "mean"),
+        consensus_under=("fair_under", "mean"),
+        mean_vig=("vig", "mean"),
+        n_books=("vig", "count"),
+    )
+    consensus = consensus[consensus["n_books"] > 0]
+    for side in ["over", "under"]:
+        consensus = consensus.merge(_best_price(pairs, side), on=PROP_KEYS, how="left")
+    return consensus
+
+
+def main_lines(consensus):
+    """Each pitcher's main line: the one most books hang, closest to a coin flip on ties."""
+    ranked = consensus.assign(_balance=-(consensus["consensus_over"] - 0.5).abs())
+    ranked = ranked.sort_values(["game_date", "player", "n_books", "_balance"], kind="stable")
+    return ranked.drop_duplicates(["game_date", "player"], keep="last").drop(columns="_balance")
+
+
+def best_side_price(lines, over):
+    """Best price, book and no-vig market probability on the side being bet."""
+    over = np.asarray(over, dtype=bool)
+    return {
+        "odds": np.where(over, lines["best_over_odds"], lines["best_under_odds"]),
+        "bookmaker": np.where(over, lines["best_over_book"], lines["best_under_book"]),
+        "odds_side": np.where(over, "Over", "Under"),
+        "market_prob": np.where(over, lines["consensus_over"], lines["consensus_under"]),
+    }
+
+
+if __name__ == "__main__":
+    from strikeout_features import PROPS_PATH, load_strikeout_props
+
+    parser = argparse.ArgumentParser(description="No-vig consensus and best price for every strikeout line")
+    parser.add_argument("--props", default=PROPS_PATH)
+    args = parser.parse_args()
+
+    props = load_strikeout_props(args.props)
+    start = time.perf_counter()
+    consensus = consensus_lines(book_pairs(props))
+    elapsed = time.perf_counter() - start
+
+    consensus.to_csv(OUTPUT_PATH, index=False)
+    print(f"[SAVED] {OUTPUT_PATH}: {len(props)} quotes -> {len(consensus)} lines "
+          f"across {props['bookmaker'].nunique()} books in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,291 @@
+import io
+import json
+import os
+import runpy
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from atomic_io import write_json
+from instrumentation import span
+
+STATE_PATH = "data/pipeline_state.json"
+MANIFEST_PATH = "data/run_manifest.json"
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Stage:
+    """One pipeline step: a script plus the artifacts it reads and writes.
+
+    A stage with no declared inputs pulls from outside the repo (a scrape, an
+    API), so it always runs. Anything else is skipped when its inputs, its
+    script and its outputs all match the last successful run.
+    """
+
+    def __init__(self, name, script, inputs=(), outputs=(), deps=(), isolated=False):
+        self.name = name
+        self.script = script
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        # Run in a child interpreter instead of a worker thread
+        self.isolated = isolated
+
+
+class StageResult:
+    def __init__(self, name, status, seconds=0.0, output="", error="", span=None):
+        self.name = name
+        self.status = status  # "ok", "skipped", "failed" or "blocked"
+        self.seconds = seconds
+        self.output = output
+        self.error = error
+        # instrumentation.Span with timings, memory and I/O for stages that ran
+        self.span = span
+
+
+# === Fingerprints ===
+def _path_version(path):
+    if os.path.isdir(path):
+        entries = sorted(os.listdir(path))
+        return {name: _path_version(os.path.join(path, name)) for name in entries}
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def fingerprint(paths):
+    return {path: _path_version(path) for path in paths}
+
+
+def load_state(path=STATE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    write_json(state, path, indent=2, sort_keys=True)
+
+
+# === Run manifest ===
+def committed_stages(manifest, stages):
+    """Stages the manifest's run finished whose outputs are still exactly as committed."""
+    done = set()
+    for stage in stages:
+        entry = manifest.get("stages", {}).get(stage.name)
+        if entry and entry["status"] in ("ok", "skipped") and entry["outputs"] == fingerprint(stage.outputs):
+            done.add(stage.name)
+    return done
+
+
+def is_current(stage, state):
+    last = state.get(stage.name)
+    if not stage.inputs or not last:
+        return False
+    return (last["inputs"] == fingerprint(stage.inputs + [stage.script])
+            and last["outputs"] == fingerprint(stage.outputs))
+
+
+# === Per-thread stdout ===
+class _ThreadOutput(io.TextIOBase):
+    # sys.stdout is process-wide; route each worker thread's prints to its own buffer
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.buffers = {}
+
+    def write(self, text):
+        buf = self.buffers.get(threading.get_ident())
+        return (buf or self.fallback).write(text)
+
+    def flush(self):
+        self.fallback.flush()
+
+    @property
+    def encoding(self):
+        return getattr(self.fallback, "encoding", "utf-8")
+
+
+def _run_in_process(stage, router):
+    buf = io.StringIO()
+    router.buffers[threading.get_ident()] = buf
+    try:
+        runpy.run_path(stage.script, run_name="__main__")
+        return buf.getvalue(), ""
+    except SystemExit as e:
+        # Scripts bail out with exit()/sys.exit(); only a non-zero code is a failure
+        if e.code in (None, 0):
+            return buf.getvalue(), ""
+        return buf.getvalue(), f"exit code {e.code}"
+    except BaseException:
+        return buf.getvalue(), traceback.format_exc()
+    finally:
+        router.buffers.pop(threading.get_ident(), None)
+
+
+def _run_isolated(stage):
+    result = subprocess.run(
+        [sys.executable, stage.script],
+        capture_output=True, text=True, encoding="utf-8", errors="replace",
+        env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+    )
+    error = "" if result.returncode == 0 else (result.stderr or f"exit code {result.returncode}")
+    return result.stdout, error
+
+
+def _execute(stage, router, profile_dir=None):
+    # Isolated stages run in a child process, so only wall time and I/O are meaningful
+    with span(stage.name, None if stage.isolated else profile_dir) as s:
+        for path in stage.inputs:
+            if not os.path.isdir(path):
+                s.read_file(path)
+        output, error = _run_isolated(stage) if stage.isolated else _run_in_process(stage, router)
+    for path in stage.outputs:
+        s.wrote_file(path)
+    if error:
+        s.error = error.strip().splitlines()[-1]
+    return StageResult(stage.name, "failed" if error else "ok", s.wall_s, output, error, s)
+
+
+def _repo_pythonpath(current):
+    # Scripts under bet_logic/ and stathead_scrape_logic/ import the shared modules at the
+    # repo root, including from the child interpreters a stage launches
+    parts = [p for p in (current or "").split(os.pathsep) if p and p != REPO_DIR]
+    return os.pathsep.join([REPO_DIR] + parts)
+
+
+# === Scheduling ===
+def downstream(stages, root):
+    by_dep = {}
+    for stage in stages:
+        for dep in stage.deps:
+            by_dep.setdefault(dep, []).append(stage.name)
+    found, todo = {root}, [root]
+    while todo:
+        for child in by_dep.get(todo.pop(), []):
+            if child not in found:
+                found.add(child)
+                todo.append(child)
+    return found
+
+
+def run_stages(stages, from_stage=None, force=False, max_workers=4, state_path=STATE_PATH,
+               on_result=None, profile_dir=None, resume=False, run_id=None,
+               manifest_path=MANIFEST_PATH):
+    """Run stages as soon as their deps finish; returns {name: StageResult}.
+
+    from_stage reruns that stage and everything downstream of it, treating
+    upstream stages as already done. force ignores the skip-if-unchanged state.
+    resume picks up the last run from its manifest: stages it committed (and
+    whose outputs haven't changed since) are kept unless something upstream of
+    them reruns; everything else reruns.
+    profile_dir turns on a cProfile dump per in-process stage.
+    """
+    by_name = {s.name: s for s in stages}
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {missing}")
+    if from_stage is not None and from_stage not in by_name:
+        raise ValueError(f"Unknown stage '{from_stage}'. Choose from: {', '.join(by_name)}")
+
+    manifest = {
+        "run_id": run_id or time.strftime("%Y%m%d_%H%M%S"),
+        "started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "stages": {},
+    }
+    selected = downstream(stages, from_stage) if from_stage else set(by_name)
+    last = load_state(manifest_path)
+    committed = committed_stages(last, stages)
+    if resume:
+        kept = committed & selected
+        # A committed stage is stale once anything upstream of it has to run again
+        for name in selected - kept:
+            kept -= downstream(stages, name)
+        selected -= kept
+        manifest["resumed_from"] = last.get("run_id")
+        force = True  # anything the last run didn't commit has to run again
+    # Stages this run doesn't touch keep their committed entries, so a later
+    # --resume doesn't redo them (and re-spend scrape and API calls)
+    manifest["stages"] = {name: last["stages"][name] for name in committed - selected}
+
+    state = load_state(state_path)
+    results = {}
+    for name in by_name:
+        if name not in selected:
+            results[name] = StageResult(name, "skipped")
+
+    def record(stage, result):
+        manifest["stages"][stage.name] = {
+            "status": result.status,
+            "outputs": fingerprint(stage.outputs),
+            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        write_json(manifest, manifest_path, indent=2)
+
+    router = _ThreadOutput(sys.stdout)
+    # Stage scripts must not see the runner's own command-line flags
+    saved_argv, sys.argv = sys.argv, sys.argv[:1]
+    saved_pythonpath = os.environ.get("PYTHONPATH")
+    os.environ["PYTHONPATH"] = _repo_pythonpath(saved_pythonpath)
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    sys.stdout = router
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            running, started_inputs = {}, {}
+            while len(results) < len(stages):
+                progressed = False
+                for name, stage in by_name.items():
+                    if name in results or name in running.values():
+                        continue
+                    dep_status = [results[d].status for d in stage.deps if d in results]
+                    if len(dep_status) < len(stage.deps):
+                        continue
+                    if any(s in ("failed", "blocked") for s in dep_status):
+                        results[name] = StageResult(name, "blocked")
+                    elif not force and from_stage is None and is_current(stage, state):
+                        results[name] = StageResult(name, "skipped")
+                    else:
+                        started_inputs[name] = fingerprint(stage.inputs + [stage.script])
+                        running[pool.submit(_execute, stage, router, profile_dir)] = name
+                    progressed = True
+                    if name in results:
+                        record(stage, results[name])
+                        if on_result:
+                            on_result(results[name])
+
+                if not running:
+                    if not progressed:
+                        stuck = sorted(set(by_name) - set(results))
+                        raise ValueError(f"Dependency cycle between stages: {stuck}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = future.result()
+                    results[name] = result
+                    stage = by_name[name]
+                    if result.status == "ok":
+                        state[name] = {
+                            "inputs": started_inputs[name],
+                            "outputs": fingerprint(stage.outputs),
+                            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        }
+                        save_state(state, state_path)
+                    record(stage, result)
+                    if on_result:
+                        on_result(result)
+    finally:
+        sys.stdout = router.fallback
+        sys.argv = saved_argv
+        if saved_pythonpath is None:
+            os.environ.pop("PYTHONPATH", None)
+        else:
+            os.environ["PYTHONPATH"] = saved_pythonpath
+    return results
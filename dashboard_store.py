@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from atomic_io import read_appended_csv, write_json
+
+STORE_PATH = "data/dashboard.db"
+
+# Only what the dashboard shows is stored; everything else stays in the CSV artifacts
+DATASETS = {
+    "predictions": {
+        "game_date": "TEXT", "player": "TEXT", "line": "REAL", "odds": "REAL",
+        "predicted_so": "REAL", "edge": "REAL", "odds_side": "TEXT", "bookmaker": "TEXT",
+        "n_books": "REAL", "market_prob": "REAL", "prob_over": "REAL", "prob_under": "REAL", "ev": "REAL",
+        "pmf": "BLOB",  # float32 strikeout distribution for what-if pricing
+    },
+    "results": {
+        "game_date": "TEXT", "pitcher": "TEXT", "line": "REAL", "odds": "REAL",
+        "predicted_k": "REAL", "edge": "REAL", "bet_recommendation": "TEXT", "confidence": "TEXT",
+        "strikeouts": "REAL", "result": "TEXT", "outcome": "TEXT", "units": "REAL",
+    },
+}
+SOURCES = {
+    "predictions": "data/predicted_pitcher_props_with_edges.csv",
+    "results": "data/bets_vs_actuals_strikeouts.csv",
+}
+
+PARTITIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS partitions (
+    dataset TEXT NOT NULL,
+    game_date TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (dataset, game_date)
+);
+"""
+
+
+def feed_path(db_path=STORE_PATH):
+    # Change feed beside the store: the newest version and what it touched
+    return os.path.splitext(db_path)[0] + "_feed.json"
+
+
+def read_feed(db_path=STORE_PATH):
+    """Latest change-feed entry; cheap enough to poll every few seconds."""
+    try:
+        with open(feed_path(db_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 0}
+
+
+def connect(db_path=STORE_PATH):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(PARTITIONS_SCHEMA)
+    for dataset, columns in DATASETS.items():
+        cols = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {dataset} ({cols})")
+        # Stores created by an older schema gain new columns in place
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({dataset})")}
+        for name, kind in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {dataset} ADD COLUMN {name} {kind}")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{dataset}_game_date ON {dataset} (game_date)")
+    return conn
+
+
+def _frame(dataset, df):
+    columns = DATASETS[dataset]
+    frame = df.rename(columns=str.lower).reindex(columns=list(columns))
+    frame["game_date"] = pd.to_datetime(frame["game_date"], errors="coerce").dt.strftime("%Y-%m-%d")
+    frame = frame.dropna(subset=["game_date"])
+    for name, kind in columns.items():
+        if kind == "REAL":
+            frame[name] = pd.to_numeric(frame[name], errors="coerce")
+    return frame
+
+
+def publish(dataset, df, db_path=STORE_PATH):
+    """Replace the partitions for the dates in `df`; returns the dates whose rows changed.
+
+    A date whose rows are byte-for-byte the same keeps its version, so readers
+    keyed on partition versions only reload what actually moved. Dates not in
+    `df` are left alone, which is how the history accumulates.
+    """
+    frame = _frame(dataset, df)
+    if frame.empty:
+        return []
+    columns = list(DATASETS[dataset])
+    insert = f"INSERT INTO {dataset} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    conn = connect(db_path)
+    try:
+        known = dict(conn.execute("SELECT game_date, digest FROM partitions WHERE dataset = ?", (dataset,)))
+        changed = []
+        with conn:
+            version = conn.execute("SELECT COALESCE(MAX(version), 0) FROM partitions").fetchone()[0]
+            for game_date, part in frame.groupby("game_date", sort=True):
+                # Rounded so a CSV round trip's last-digit noise doesn't count as a change
+                digest = hashlib.sha1(part.to_csv(index=False, float_format="%.10g").encode()).hexdigest()
+                if known.get(game_date) == digest:
+                    continue
+                version += 1
+                rows = part.astype(object).where(part.notna(), None).itertuples(index=False, name=None)
+                conn.execute(f"DELETE FROM {dataset} WHERE game_date = ?", (game_date,))
+                conn.executemany(insert, rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO partitions (dataset, game_date, rows, digest, version, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (dataset, game_date, len(part), digest, version, now),
+                )
+                changed.append(game_date)
+        if changed:
+            write_json({"version": version, "updated": now, "dataset": dataset, "dates": changed},
+                       feed_path(db_path))
+        return changed
+    finally:
+        conn.close()
+
+
+def partition_versions(dataset, db_path=STORE_PATH):
+    """game_date -> (rows, version) for every stored date; a single small indexed read."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT game_date, rows, version FROM partitions WHERE dataset = ? ORDER BY game_date", (dataset,))
+        return {pd.Timestamp(d).date(): (n, v) for d, n, v in rows}
+    finally:
+        conn.close()
+
+
+def load_day(dataset, game_date, columns=None, db_path=STORE_PATH):
+    """One date's rows, reading only the requested columns."""
+    schema = DATASETS[dataset]
+    columns = [c for c in (columns or schema) if c in schema]
+    conn = connect(db_path)
+    try:
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM {dataset} WHERE game_date = ? ORDER BY rowid",
+            conn, params=(str(game_date),),
+        )
+    finally:
+        conn.close()
+    if "game_date" in df.columns:
+        df["game_date"] = pd.to_datetime(df["game_date"]).dt.date
+    return df
+
+
+def backfill(dataset, path=None, db_path=STORE_PATH):
+    path = path or SOURCES[dataset]
+    if not os.path.exists(path):
+        return []
+    df = read_appended_csv(path)
+    if dataset == "results" and "Outcome" not in df.columns:
+        from results_summary import add_outcomes
+        df = add_outcomes(df)
+    return publish(dataset, df, db_path)
+
+
+if __name__ == "__main__":
+    for name in DATASETS:
+        dates = backfill(name)
+        print(f"✅ {name}: {len(dates)} date partition(s) updated in {STORE_PATH}")
@@ -0,0 +1,213 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+REPORT_DIR = "data/run_reports"
+HISTORY_PATH = os.path.join(REPORT_DIR, "history.jsonl")
+PROFILE_ENV = "PIPELINE_PROFILE"
+
+
+def peak_rss_mb(children=False):
+    """High-water mark in MB of this process, or with children=True of the largest
+    finished child process; None when the platform can't say.
+    """
+    if resource is not None:
+        who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+        peak = resource.getrusage(who).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    if psutil is not None and not children:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    return None
+
+
+def file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class Span:
+    """Timing and volume counters for one stage or sub-step."""
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        # How far the block raised the memory high-water marks of this process and of its
+        # finished child processes; 0 when it stayed under an earlier peak
+        self.rss_growth_mb = None
+        self.child_rss_growth_mb = None
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.error = None
+        self.profile_path = None
+        self.children = []
+
+    def add_rows(self, rows_in=0, rows_out=0):
+        self.rows_in += int(rows_in)
+        self.rows_out += int(rows_out)
+
+    def read_file(self, path):
+        self.bytes_read += file_size(path)
+
+    def wrote_file(self, path):
+        self.bytes_written += file_size(path)
+
+    def to_dict(self):
+        out = {k: v for k, v in vars(self).items() if k != "children"}
+        out["wall_s"] = round(self.wall_s, 4)
+        out["cpu_s"] = round(self.cpu_s, 4)
+        if self.children:
+            out["steps"] = [c.to_dict() for c in self.children]
+        return out
+
+
+_local = threading.local()
+
+
+def current():
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+def profiling_enabled():
+    return os.getenv(PROFILE_ENV, "") not in ("", "0")
+
+
+@contextmanager
+def span(name, profile_dir=None):
+    """Time a block; nests under whatever span is open on this thread.
+
+    CPU time is per thread, so stages running side by side in the DAG don't
+    count each other's work. Memory is growth in the process-wide high-water
+    marks, so stages running side by side can share it. With profile_dir set,
+    a cProfile dump of the block lands there as <name>.prof; Python 3.12+
+    allows one active profiler, so a block that can't get it runs unprofiled.
+    """
+    s = Span(name)
+    parent = current()
+    if parent is not None:
+        parent.children.append(s)
+    stack = _local.__dict__.setdefault("stack", [])
+    stack.append(s)
+
+    profiler = cProfile.Profile() if profile_dir else None
+    rss, child_rss = peak_rss_mb(), peak_rss_mb(children=True)
+    wall, cpu = time.perf_counter(), time.thread_time()
+    if profiler:
+        try:
+            profiler.enable()
+        except ValueError as e:
+            print(f"[PROFILE] {name}: running unprofiled ({e})")
+            profiler = None
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+            os.makedirs(profile_dir, exist_ok=True)
+            s.profile_path = os.path.join(profile_dir, f"{name.replace(' ', '_')}.prof")
+            profiler.dump_stats(s.profile_path)
+        s.wall_s = time.perf_counter() - wall
+        s.cpu_s = time.thread_time() - cpu
+        if rss is not None:
+            s.rss_growth_mb = round(peak_rss_mb() - rss, 1)
+        if child_rss is not None:
+            s.child_rss_growth_mb = round(peak_rss_mb(children=True) - child_rss, 1)
+        stack.pop()
+
+
+# Scripts call these unconditionally; outside a span they do nothing
+def add_rows(rows_in=0, rows_out=0):
+    s = current()
+    if s is not None:
+        s.add_rows(rows_in, rows_out)
+
+
+def read_file(path):
+    s = current()
+    if s is not None:
+        s.read_file(path)
+
+
+def wrote_file(path):
+    s = current()
+    if s is not None:
+        s.wrote_file(path)
+
+
+class RunReport:
+    """One JSON file per run plus a line per run in a rolling history."""
+
+    def __init__(self, name, report_dir=REPORT_DIR):
+        self.name = name
+        self.report_dir = report_dir
+        self.started = datetime.now()
+        self.run_id = self.started.strftime("%Y%m%d_%H%M%S")
+        self.stages = []
+
+    @property
+    def profile_dir(self):
+        return os.path.join(self.report_dir, "profiles", self.run_id)
+
+    def add(self, stage_span, status):
+        entry = stage_span.to_dict()
+        entry["status"] = status
+        self.stages.append(entry)
+
+    def write(self, success):
+        os.makedirs(self.report_dir, exist_ok=True)
+        report = {
+            "run_id": self.run_id,
+            "name": self.name,
+            "started": self.started.strftime("%Y-%m-%d %H:%M:%S"),
+            "wall_s": round((datetime.now() - self.started).total_seconds(), 3),
+            "success": success,
+            "peak_rss_mb": peak_rss_mb(),
+            "children_peak_rss_mb": peak_rss_mb(children=True),
+            "stages": self.stages,
+        }
+        path = os.path.join(self.report_dir, f"run_{self.run_id}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        summary = {k: report[k] for k in ["run_id", "name", "started", "wall_s", "success", "peak_rss_mb",
+                                            "children_peak_rss_mb"]}
+        summary["stages"] = {s["name"]: {"status": s["status"], "wall_s": s["wall_s"], "cpu_s": s["cpu_s"]}
+                             for s in self.stages}
+        with open(os.path.join(self.report_dir, "history.jsonl"), "a") as f:
+            f.write(json.dumps(summary) + "\n")
+        return path
+
+
+def print_report(report_stages):
+    print(f"{'stage':<12}{'status':<9}{'wall_s':>8}{'cpu_s':>8}{'rss+mb':>9}{'child+mb':>9}{'rows_in':>9}"
+          f"{'rows_out':>9}{'MB_read':>9}{'MB_wrote':>9}")
+    for s in report_stages:
+        rss, child_rss = (f"{s[k]:.0f}" if s.get(k) is not None else "-"
+                          for k in ("rss_growth_mb", "child_rss_growth_mb"))
+        print(f"{s['name']:<12}{s['status']:<9}{s['wall_s']:>8.1f}{s['cpu_s']:>8.1f}{rss:>9}{child_rss:>9}"
+              f"{s['rows_in']:>9}{s['rows_out']:>9}{s['bytes_read'] / 1e6:>9.1f}{s['bytes_written'] / 1e6:>9.1f}")
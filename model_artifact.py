@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+
+import numpy as np
+
+# === Flat forest artifact ===
+# One memory-mappable file: fixed preamble, JSON header (feature order, array
+# layout), then every tree's nodes concatenated into contiguous arrays.
+# Loading needs only numpy; sklearn is only imported when exporting.
+
+MAGIC = b"SOFOREST"
+FORMAT_VERSION = 1
+ALIGN = 64
+DEFAULT_ARTIFACT_PATH = "models/strikeout_model.forest"
+
+ARRAY_DTYPES = {
+    "tree_offsets": "<i8",
+    "feature": "<i4",
+    "threshold": "<f8",
+    "left": "<i4",
+    "right": "<i4",
+    "missing_left": "u1",
+    "value": "<f8",
+}
+
+
+def _pad(n):
+    return (-n) % ALIGN
+
+
+def _flatten_trees(model):
+    features, thresholds, lefts, rights, missing, values = [], [], [], [], [], []
+    offsets = [0]
+    max_depth = 0
+
+    for est in model.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        base = offsets[-1]
+        idx = np.arange(n)
+        is_leaf = tree.children_left == -1
+
+        # Leaves point at themselves so traversal can run a fixed number of steps
+        left = np.where(is_leaf, idx, tree.children_left) + base
+        right = np.where(is_leaf, idx, tree.children_right) + base
+        feat = np.where(is_leaf, 0, tree.feature)
+        miss = getattr(tree, "missing_go_to_left", None)
+        if miss is None:
+            miss = np.zeros(n, dtype=np.uint8)
+
+        features.append(feat)
+        thresholds.append(tree.threshold)
+        lefts.append(left)
+        rights.append(right)
+        missing.append(miss)
+        values.append(tree.value[:, 0, 0])
+        offsets.append(base + n)
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    arrays = {
+        "tree_offsets": np.asarray(offsets),
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts),
+        "right": np.concatenate(rights),
+        "missing_left": np.concatenate(missing),
+        "value": np.concatenate(values),
+    }
+    arrays = {k: np.ascontiguousarray(v, dtype=ARRAY_DTYPES[k]) for k, v in arrays.items()}
+    return arrays, max_depth
+
+
+def export_forest(model, feature_order, path=DEFAULT_ARTIFACT_PATH, X_check=None):
+    """Flatten a fitted RandomForestRegressor into a single .forest file."""
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output forests can be exported.")
+    if len(feature_order) != model.n_features_in_:
+        raise ValueError(
+            f"feature_order has {len(feature_order)} names, model expects {model.n_features_in_}"
+        )
+
+    arrays, max_depth = _flatten_trees(model)
+
+    digest = hashlib.sha1()
+    for name in ARRAY_DTYPES:
+        digest.update(arrays[name].tobytes())
+    digest.update(json.dumps(list(feature_order)).encode("utf-8"))
+
+    layout = {}
+    offset = 0
+    for name in ARRAY_DTYPES:
+        arr = arrays[name]
+        layout[name] = {"dtype": ARRAY_DTYPES[name], "shape": list(arr.shape), "offset": offset}
+        offset += arr.nbytes + _pad(arr.nbytes)
+
+    try:
+        import sklearn
+        sklearn_version = sklearn.__version__
+    except ImportError:
+        sklearn_version = None
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "model_id": digest.hexdigest()[:16],
+        "feature_order": list(feature_order),
+        "n_trees": len(model.estimators_),
+        "max_depth": max_depth,
+        "sklearn_version": sklearn_version,
+        "arrays": layout,
+    }).encode("utf-8")
+
+    preamble = MAGIC + struct.pack("<II", FORMAT_VERSION, len(header))
+    data_start = len(preamble) + len(header)
+    data_start += _pad(data_start)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(preamble)
+        f.write(header)
+        f.write(b"\0" * (data_start - len(preamble) - len(header)))
+        for name in ARRAY_DTYPES:
+            raw = arrays[name].tobytes()
+            f.write(raw)
+            f.write(b"\0" * _pad(len(raw)))
+    os.replace(tmp_path, path)
+
+    forest = load_forest(path)
+    if X_check is not None:
+        expected = model.predict(X_check)
+        actual = forest.predict(X_check)
+        if not np.array_equal(expected, actual):
+            raise ValueError("Exported forest does not reproduce sklearn predictions exactly.")
+    return forest
+
+
+class FlatForest:
+    """Numpy-only inference over an exported .forest file."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            preamble = f.read(len(MAGIC) + 8)
+            if preamble[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a forest artifact")
+            version, header_len = struct.unpack("<II", preamble[len(MAGIC):])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported forest format version {version}")
+            header = json.loads(f.read(header_len).decode("utf-8"))
+
+        data_start = len(preamble) + header_len
+        data_start += _pad(data_start)
+
+        self.path = path
+        self.header = header
+        self.model_id = header["model_id"]
+        self.feature_order = header["feature_order"]
+        self.n_trees = header["n_trees"]
+        self.max_depth = header["max_depth"]
+
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        for name, spec in header["arrays"].items():
+            start = data_start + spec["offset"]
+            count = int(np.prod(spec["shape"]))
+            arr = np.frombuffer(raw, dtype=spec["dtype"], count=count, offset=start)
+            setattr(self, name, arr.reshape(spec["shape"]))
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns"):
+            X = X[self.feature_order].to_numpy()
+        # sklearn casts inputs to float32 before walking the trees
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_order):
+            raise ValueError(f"Expected (n, {len(self.feature_order)}) input, got {X.shape}")
+        return X
+
+    def apply(self, X):
+        """Leaf node index (global) for every (tree, row)."""
+        X = self._as_matrix(X)
+        rows = np.arange(X.shape[0])
+        node = np.repeat(self.tree_offsets[:-1, None], X.shape[0], axis=1)
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = np.where(
+                np.isnan(x),
+                self.missing_left[node].astype(bool),
+                x <= self.threshold[node],
+            )
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_trees(self, X):
+        """Per-tree predictions, shape (n_trees, n_rows)."""
+        return self.value[self.apply(X)]
+
+    def predict(self, X):
+        per_tree = self.predict_trees(X)
+        # Accumulate tree by tree, in order, exactly as sklearn does
+        out = np.zeros(per_tree.shape[1], dtype=np.float64)
+        for row in per_tree:
+            out += row
+        out /= self.n_trees
+        return out
+
+
+def load_forest(path=DEFAULT_ARTIFACT_PATH):
+    return FlatForest(path)
+
+
+def per_tree_predictions(model, X):
+    """(n_trees, n_rows) matrix for either a FlatForest or a fitted sklearn forest."""
+    if isinstance(model, FlatForest):
+        return model.predict_trees(X)
+    X = np.asarray(X, dtype=np.float32)
+    return np.stack([est.predict(X) for est in model.estimators_])
+
+
+def model_version(model):
+    """Stable identifier used to key logged predictions."""
+    return getattr(model, "model_id", None) or "pickle"
+
+
+def pickle_model_id(path):
+    """Content hash of a pickled model, so each pickle keys its own predictions."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"pickle-{digest.hexdigest()[:16]}"
+
+
+def load_model(forest_path=DEFAULT_ARTIFACT_PATH, pickle_path="models/strikeout_model.pkl",
+               features_path="models/feature_order.json"):
+    """Prefer the flat artifact; fall back to the pickled sklearn model."""
+    if os.path.exists(forest_path):
+        forest = load_forest(forest_path)
+        return forest, forest.feature_order
+
+    import joblib
+    print(f"[WARN] {forest_path} not found, falling back to {pickle_path}")
+    model = joblib.load(pickle_path)
+    model.model_id = pickle_model_id(pickle_path)
+    with open(features_path, "r") as f:
+        feature_order = json.load(f)
+    return model, feature_order
+
+
+# === CLI: convert an existing pickle ===
+if __name__ == "__main__":
+    import joblib
+
+    pickle_path = sys.argv[1] if len(sys.argv) > 1 else "models/strikeout_model.pkl"
+    out_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_ARTIFACT_PATH
+
+    with open("models/feature_order.json", "r") as f:
+        feature_order = json.load(f)
+
+    model = joblib.load(pickle_path)
+    rng = np.random.default_rng(0)
+    X_check = rng.normal(size=(2000, len(feature_order))) * 5
+    forest = export_forest(model, feature_order, out_path, X_check=X_check)
+    print(f"[SAVE] {out_path} ({os.path.getsize(out_path) / 1024:.0f} KB, "
+          f"{forest.n_trees} trees, model_id={forest.model_id})")
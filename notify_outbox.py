@@ -0,0 +1,322 @@
+import argparse
+import json
+import os
+import smtplib
+import socketserver
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.message import EmailMessage
+
+OUTBOX_PATH = "data/notify_outbox.db"
+
+BATCH_SIZE = 20
+BASE_BACKOFF_SECONDS = 5
+MAX_BACKOFF_SECONDS = 15 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    recipients TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    sent_at TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox (sent_at, next_attempt);
+"""
+
+
+def connect(db_path=OUTBOX_PATH):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enqueue(subject, body, recipients, db_path=OUTBOX_PATH):
+    """Queue a message and return immediately; the worker delivers it."""
+    conn = connect(db_path)
+    try:
+        with conn:
+            cur = conn.execute(
+                "INSERT INTO outbox (created, subject, body, recipients, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), subject, body,
+                 json.dumps(list(recipients)), time.time()),
+            )
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def pending(db_path=OUTBOX_PATH, due_only=False, limit=None):
+    conn = connect(db_path)
+    try:
+        sql = "SELECT id, subject, body, recipients, attempts FROM outbox WHERE sent_at IS NULL"
+        params = []
+        if due_only:
+            sql += " AND next_attempt <= ?"
+            params.append(time.time())
+        sql += " ORDER BY id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def next_due(db_path=OUTBOX_PATH):
+    """When the earliest unsent message is due, or None when nothing is pending."""
+    conn = connect(db_path)
+    try:
+        return conn.execute("SELECT MIN(next_attempt) FROM outbox WHERE sent_at IS NULL").fetchone()[0]
+    finally:
+        conn.close()
+
+
+# === SMTP connections ===
+def smtp_factory(sender, password=None, host="smtp.gmail.com", port=587):
+    """Gmail by default; SMTP_HOST=host:port points at a plain server (e.g. the local stand-in)."""
+    override = os.getenv("SMTP_HOST")
+    if override:
+        host, _, port_text = override.partition(":")
+        port = int(port_text or 25)
+        return lambda: smtplib.SMTP(host, port, timeout=30)
+
+    def open_connection():
+        smtp = smtplib.SMTP(host, port, timeout=30)
+        smtp.starttls()
+        smtp.login(sender, password)
+        return smtp
+    return open_connection
+
+
+def backoff_seconds(attempts):
+    return min(BASE_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS)
+
+
+class OutboxWorker:
+    """Background delivery: one reused SMTP connection, batched sends, retry with backoff.
+
+    Nothing is deleted on failure. A message stays in the outbox until a send
+    succeeds, so anything undelivered when the process exits goes out on the
+    next run.
+    """
+
+    def __init__(self, connect_smtp, sender, db_path=OUTBOX_PATH, poll_seconds=1.0):
+        self.connect_smtp = connect_smtp
+        self.sender = sender
+        self.db_path = db_path
+        self.poll_seconds = poll_seconds
+        self.smtp = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _smtp(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.noop()
+                return self.smtp
+            except (smtplib.SMTPException, OSError):
+                self._close()
+        self.smtp = self.connect_smtp()
+        return self.smtp
+
+    def _close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except Exception:
+                pass
+        self.smtp = None
+
+    def deliver_due(self):
+        """Send one batch of due messages; returns (sent, failed)."""
+        batch = pending(self.db_path, due_only=True, limit=BATCH_SIZE)
+        if not batch:
+            return 0, 0
+        sent = failed = 0
+        conn = connect(self.db_path)
+        try:
+            for msg_id, subject, body, recipients, attempts in batch:
+                msg = EmailMessage()
+                msg.set_content(body)
+                msg["Subject"] = subject
+                msg["From"] = self.sender
+                msg["To"] = ", ".join(json.loads(recipients))
+                try:
+                    self._smtp().send_message(msg)
+                except Exception as e:
+                    self._close()
+                    attempts += 1
+                    with conn:
+                        conn.execute(
+                            "UPDATE outbox SET attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                            (attempts, time.time() + backoff_seconds(attempts), f"{type(e).__name__}: {e}", msg_id),
+                        )
+                    failed += 1
+                    continue
+                with conn:
+                    conn.execute(
+                        "UPDATE outbox SET sent_at = ?, attempts = ? WHERE id = ?",
+                        (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), attempts + 1, msg_id),
+                    )
+                sent += 1
+        finally:
+            conn.close()
+        return sent, failed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                sent, failed = self.deliver_due()
+            except Exception as e:
+                print(f"[OUTBOX] Delivery loop error: {e}")
+                sent = failed = 0
+            if failed:
+                print(f"[OUTBOX] {failed} message(s) failed; will retry with backoff")
+            if not sent:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+        self._close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+        self._thread.start()
+        return self
+
+    def notify(self):
+        self._wake.set()
+
+    def stop(self, timeout=10.0):
+        """Give queued mail up to `timeout` seconds to go out, then stop.
+
+        Messages backing off after a failed send are waited on too, as long as
+        their retry falls before the deadline.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            due = next_due(self.db_path)
+            if due is None or due > deadline:
+                break
+            self.notify()
+            time.sleep(0.2)
+        self._stop.set()
+        self.notify()
+        if self._thread is not None:
+            self._thread.join(max(deadline - time.time(), 0.5))
+        return len(pending(self.db_path))
+
+
+# === Local SMTP stand-in ===
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        self._reply("220 localhost stand-in SMTP")
+        mail_from, rcpts = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode(errors="replace").strip()
+            verb = command[:4].upper()
+            if verb in ("HELO", "EHLO"):
+                self._reply("250 localhost")
+            elif verb == "MAIL":
+                mail_from, rcpts = command[10:].strip(), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                rcpts.append(command[8:].strip())
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                with server.lock:
+                    if server.fail_next > 0:
+                        server.fail_next -= 1
+                        self._reply("451 Temporary failure, try again")
+                        continue
+                    server.messages.append({"from": mail_from, "to": rcpts, "data": b"".join(lines).decode()})
+                self._reply("250 Queued")
+            elif verb == "NOOP" or verb == "RSET":
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal in-process SMTP server that keeps messages in memory.
+
+    fail_next makes the next N messages fail with a 451 to exercise retries.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _SMTPHandler)
+        self.messages = []
+        self.fail_next = 0
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def address(self):
+        return f"{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or flush the notification outbox")
+    parser.add_argument("--local-smtp", metavar="PORT", type=int,
+                        help="run the stand-in SMTP server on this port and print what it receives")
+    parser.add_argument("--flush", action="store_true", help="deliver everything pending, then exit")
+    args = parser.parse_args()
+
+    if args.local_smtp is not None:
+        server = LocalSMTPServer(port=args.local_smtp).start()
+        print(f"[SMTP] Stand-in listening on {server.address}; set SMTP_HOST={server.address}")
+        seen = 0
+        try:
+            while True:
+                time.sleep(1)
+                for m in server.messages[seen:]:
+                    print(f"[SMTP] {m['from']} -> {', '.join(m['to'])}\n{m['data']}")
+                seen = len(server.messages)
+        except KeyboardInterrupt:
+            server.stop()
+    elif args.flush:
+        from dotenv import load_dotenv
+        load_dotenv()
+        sender = os.getenv("EMAIL_USER")
+        worker = OutboxWorker(smtp_factory(sender, os.getenv("EMAIL_PASS")), sender).start()
+        left = worker.stop(timeout=60)
+        print(f"[OUTBOX] {left} message(s) still pending")
+    else:
+        for msg_id, subject, _, recipients, attempts in pending():
+            print(f"{msg_id:>5}  attempts={attempts}  {subject}  -> {', '.join(json.loads(recipients))}")
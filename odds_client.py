@@ -0,0 +1,89 @@
+import os
+
+import requests
+
+API_KEY = os.getenv("ODDS_API_KEY", "3550559967b78da8856f5c4192697b32")
+SPORT = "baseball_mlb"
+ODDS_FORMAT = "american"
+DATE_FORMAT = "iso"
+REGION = "us"
+BASE_URL = "https://api.the-odds-api.com/v4/sports"
+
+# === Market groups ===
+PITCHER_MARKETS = ["pitcher_strikeouts"]
+BATTER_MARKETS = ["batter_hits", "batter_home_runs"]  # Add more if needed
+TEAM_MARKETS = ["totals", "spreads", "h2h"]  # h2h = moneyline
+
+ALL_MARKETS = PITCHER_MARKETS + BATTER_MARKETS + TEAM_MARKETS
+
+ALLOWED_BOOKS = {"BetOnline.ag", "DraftKings", "FanDuel", "PointsBet (US)"}
+
+
+class OddsClient:
+    """Odds API calls over one keep-alive session, tracking the remaining quota."""
+
+    def __init__(self, api_key=API_KEY, session=None, timeout=30):
+        self.api_key = api_key
+        replay = session is None and bool(os.getenv("ODDS_REPLAY_DIR"))
+        if replay:
+            # Offline runs against a synthetic_data.py tree
+            from synthetic_data import ReplaySession
+            session = ReplaySession(os.environ["ODDS_REPLAY_DIR"])
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.requests_remaining = None
+        # Pause between per-event calls to stay under the API's rate limit
+        self.throttle_seconds = 0.0 if replay else 1.0
+
+    def _get(self, path, **params):
+        resp = self.session.get(
+            f"{BASE_URL}/{SPORT}/{path}",
+            params={"apiKey": self.api_key, "dateFormat": DATE_FORMAT, **params},
+            timeout=self.timeout,
+        )
+        remaining = resp.headers.get("x-requests-remaining")
+        if remaining is not None:
+            self.requests_remaining = remaining
+        return resp
+
+    def events(self):
+        resp = self._get("events")
+        if resp.status_code != 200:
+            raise Exception(f"❌ Events error: {resp.status_code} - {resp.text}")
+        return resp.json()
+
+    def event_odds(self, event_id, markets=ALL_MARKETS):
+        """The event's odds payload, or None when the API refuses the request."""
+        resp = self._get(
+            f"events/{event_id}/odds",
+            markets=",".join(markets), regions=REGION, oddsFormat=ODDS_FORMAT,
+        )
+        if resp.status_code != 200:
+            print(f"❌ Odds error: {resp.status_code} - {resp.text}")
+            return None
+        return resp.json()
+
+
+def outcome_rows(event, event_odds, books=ALLOWED_BOOKS):
+    """One flat row per (book, market, outcome) for an event."""
+    rows = []
+    for bookmaker in event_odds.get("bookmakers", []):
+        if bookmaker.get("title") not in books:
+            continue
+        for market in bookmaker.get("markets", []):
+            for outcome in market.get("outcomes", []):
+                rows.append({
+                    "event_id": event.get("id"),
+                    "home_team": event.get("home_team"),
+                    "away_team": event.get("away_team"),
+                    "commence_time": event.get("commence_time"),
+                    "bookmaker": bookmaker.get("title"),
+                    "last_update": market.get("last_update"),
+                    "market": market.get("key"),
+                    "participant": outcome.get("participant"),
+                    "description": outcome.get("description"),
+                    "raw_name": outcome.get("name"),
+                    "line": outcome.get("point"),
+                    "odds": outcome.get("price")
+                })
+    return rows
@@ -0,0 +1,159 @@
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from atomic_io import write_csv
+from model_artifact import load_model
+from odds_client import OddsClient, outcome_rows, PITCHER_MARKETS
+from odds_snapshots import ARCHIVE_DIR, archive_snapshot
+from predict_props_with_model import refresh_predictions
+from strikeout_features import PROPS_PATH, load_strikeout_props, load_latest_stats, input_versions
+
+# (seconds before first pitch, seconds between polls): closer games poll faster
+POLL_SCHEDULE = [
+    (6 * 3600, 60 * 60),
+    (2 * 3600, 20 * 60),
+    (30 * 60, 5 * 60),
+    (0, 2 * 60),
+]
+EVENTS_REFRESH_SECONDS = 60 * 60
+MAX_SLEEP_SECONDS = 60
+
+
+def poll_interval(seconds_to_start):
+    for horizon, interval in POLL_SCHEDULE:
+        if seconds_to_start > horizon:
+            return interval
+    return POLL_SCHEDULE[-1][1]
+
+
+class OddsDaemon:
+    """Keeps the odds session, model and stats warm and re-prices on a schedule.
+
+    Each event is polled on its own clock from POLL_SCHEDULE; events drop off
+    once they start. After a poll brings new quotes, the board is archived as
+    a snapshot, the polled markets are replaced in the props file (other
+    markets stay as Step 1 wrote them) and only changed props go back
+    through the model.
+    """
+
+    def __init__(self, client=None, markets=PITCHER_MARKETS, props_path=PROPS_PATH, archive_dir=ARCHIVE_DIR):
+        self.client = client or OddsClient()
+        self.markets = markets
+        self.props_path = props_path
+        self.archive_dir = archive_dir
+        self.events = {}
+        self.quotes = {}
+        self.next_poll = {}
+        self.events_fetched_at = 0.0
+        self.versions = None
+        self.model = self.features = self.latest_stats = None
+
+    def ensure_warm(self):
+        # Reload only when the nightly pipeline retrains or re-scrapes
+        versions = input_versions()
+        if versions == self.versions:
+            return
+        start = time.perf_counter()
+        self.model, self.features = load_model()
+        self.latest_stats = load_latest_stats()
+        self.versions = versions
+        print(f"[WARM] Model and {len(self.latest_stats)} pitchers loaded in {time.perf_counter() - start:.1f}s")
+
+    def refresh_events(self, now):
+        events = self.client.events()
+        self.events = {e["id"]: e for e in events}
+        for event_id in self.events:
+            self.next_poll.setdefault(event_id, now)
+        self.events_fetched_at = now
+        print(f"[EVENTS] {len(self.events)} events on the board")
+
+    def seconds_to_start(self, event_id, now):
+        start = pd.Timestamp(self.events[event_id]["commence_time"])
+        return start.timestamp() - now
+
+    def drop_started(self, now):
+        started = [e for e in self.events if self.seconds_to_start(e, now) <= 0]
+        for event_id in started:
+            self.events.pop(event_id)
+            self.next_poll.pop(event_id, None)
+            self.quotes.pop(event_id, None)
+        return bool(started)
+
+    def poll_due(self, now):
+        due = [e for e, t in self.next_poll.items() if t <= now and e in self.events]
+        changed = False
+        for event_id in due:
+            event_odds = self.client.event_odds(event_id, self.markets)
+            self.next_poll[event_id] = now + poll_interval(self.seconds_to_start(event_id, now))
+            if event_odds is None:
+                continue
+            rows = [r for r in outcome_rows(self.events[event_id], event_odds) if r["market"] in self.markets]
+            if rows != self.quotes.get(event_id):
+                self.quotes[event_id] = rows
+                changed = True
+        if due:
+            print(f"[POLL] {len(due)} event(s) polled, quota left: {self.client.requests_remaining}")
+        return changed
+
+    def merged_props(self, rows):
+        """The props file with the polled markets replaced by `rows`."""
+        board = pd.DataFrame(rows)
+        if not os.path.exists(self.props_path):
+            return board
+        existing = pd.read_csv(self.props_path)
+        others = existing[~existing["market"].isin(self.markets)]
+        return pd.concat([others, board], ignore_index=True) if not others.empty else board
+
+    def publish(self, now=None):
+        rows = [row for event_rows in self.quotes.values() for row in event_rows]
+        if not rows:
+            print("[PUBLISH] No pitcher props on the board.")
+            return
+        when = datetime.fromtimestamp(time.time() if now is None else now, timezone.utc)
+        snapshot = archive_snapshot(rows, when=when, archive_dir=self.archive_dir)
+        # The dashboard may read at any moment; it must never see a half-written file
+        write_csv(self.merged_props(rows), self.props_path)
+        props = load_strikeout_props(self.props_path)
+        try:
+            refresh_predictions(props, self.model, self.features, self.latest_stats)
+        except ValueError as e:
+            print(f"[WARN] {e}")
+        print(f"[PUBLISH] {datetime.now():%H:%M:%S} {len(rows)} quotes, archived to {snapshot}")
+
+    def step(self, now=None):
+        now = time.time() if now is None else now
+        self.ensure_warm()
+        if now - self.events_fetched_at >= EVENTS_REFRESH_SECONDS:
+            self.refresh_events(now)
+        board_changed = self.drop_started(now)
+        if self.poll_due(now) or board_changed:
+            self.publish(now)
+        upcoming = [t for e, t in self.next_poll.items() if e in self.events]
+        return min(upcoming + [now + MAX_SLEEP_SECONDS]) - now
+
+    def run_forever(self):
+        while True:
+            try:
+                wait = self.step()
+            except Exception as e:
+                # A flaky API call or bad payload shouldn't kill the daemon
+                print(f"[ERROR] {type(e).__name__}: {e}")
+                wait = MAX_SLEEP_SECONDS
+            time.sleep(max(1.0, min(wait, MAX_SLEEP_SECONDS)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll pitcher props intraday and keep predictions fresh")
+    parser.add_argument("--once", action="store_true", help="poll every event once, publish, and exit")
+    args = parser.parse_args()
+
+    daemon = OddsDaemon()
+    if args.once:
+        daemon.step()
+    else:
+        print(f"[START] {datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC, polling {', '.join(daemon.markets)}")
+        daemon.run_forever()
@@ -0,0 +1,106 @@
+import glob
+import os
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import write_csv
+from strikeout_features import normalize_name
+
+ARCHIVE_DIR = "archive"
+ARCHIVE_GLOB = os.path.join(ARCHIVE_DIR, "*", "clean_all_props_flat_*.csv")
+SNAPSHOT_COLUMNS = ["event_id", "commence_time", "type", "player", "market", "line", "odds",
+                    "bookmaker", "side"]
+UNKNOWN_BOOK = "unknown"
+# Snapshot filenames carry the runner clock; the scheduled runner is on UTC
+SNAPSHOT_TZ = "UTC"
+# Stathead logs games on the local (Eastern) calendar day
+LOCAL_TZ = "America/New_York"
+
+
+def snapshot_time_from_filename(path):
+    match = re.search(r"(\d{8}_\d{6})", os.path.basename(path))
+    if not match:
+        return pd.NaT
+    return pd.to_datetime(match.group(1), format="%Y%m%d_%H%M%S").tz_localize(SNAPSHOT_TZ)
+
+
+def snapshot_files(pattern=ARCHIVE_GLOB):
+    # The same snapshot can be copied into more than one folder; keep one per name
+    by_name = {}
+    for path in sorted(glob.glob(pattern)):
+        by_name.setdefault(os.path.basename(path), path)
+    return sorted(by_name.values())
+
+
+def _player_name(row):
+    # Same pick as Step 3: the first name field that isn't just the side
+    for field in ["description", "participant", "raw_name"]:
+        name = row.get(field)
+        if isinstance(name, str) and name.strip().lower() not in ["over", "under"]:
+            return name.strip()
+    return None
+
+
+def archive_snapshot(rows, kind="pitcher", when=None, archive_dir=ARCHIVE_DIR):
+    """Archive Odds API outcome rows as one snapshot in the flat layout load_snapshots reads.
+
+    rows come from odds_client.outcome_rows; `when` is the capture time and
+    defaults to now on UTC, the clock snapshot filenames are read in. Returns
+    the snapshot's path.
+    """
+    when = when or datetime.now(timezone.utc)
+    df = pd.DataFrame(rows)
+    flat = pd.DataFrame({
+        "event_id": df["event_id"], "home_team": df["home_team"], "away_team": df["away_team"],
+        "commence_time": df["commence_time"], "type": kind, "player": [_player_name(r) for r in rows],
+        "market": df["market"], "line": df["line"], "odds": df["odds"], "bookmaker": df["bookmaker"],
+        "side": df["raw_name"],
+    })
+    path = os.path.join(archive_dir, f"{when:%Y-%m-%d}", f"clean_all_props_flat_{when:%Y%m%d_%H%M%S}.csv")
+    write_csv(flat[flat["player"].notna()], path)
+    return path
+
+
+def _infer_sides(df):
+    # Older snapshots dropped bookmaker and Over/Under. Each book wrote its
+    # Over row then its Under row, so parity within a prop recovers the side.
+    missing = df["side"].isna()
+    if missing.any():
+        order = df.loc[missing].groupby(
+            ["snapshot_time", "event_id", "player", "market", "line"], sort=False
+        ).cumcount()
+        df.loc[missing, "side"] = np.where(order % 2 == 0, "Over", "Under")
+    return df
+
+
+def load_snapshots(files=None, market="pitcher_strikeouts"):
+    """Long table of every archived price: one row per (snapshot, prop, book, side)."""
+    files = snapshot_files() if files is None else files
+    frames = []
+    for path in files:
+        df = pd.read_csv(path, usecols=lambda c: c in SNAPSHOT_COLUMNS)
+        df = df[(df["type"] == "pitcher") & (df["market"] == market)]
+        if df.empty:
+            continue
+        for col in ["bookmaker", "side"]:
+            if col not in df.columns:
+                df[col] = None
+        df["snapshot_time"] = snapshot_time_from_filename(path)
+        # Formats drift between pipeline versions, so parse per file
+        df["commence_time"] = pd.to_datetime(df["commence_time"], utc=True, errors="coerce")
+        frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS + ["snapshot_time", "game_date", "local_date"])
+
+    snaps = pd.concat(frames, ignore_index=True)
+    snaps = _infer_sides(snaps)
+    snaps["bookmaker"] = snaps["bookmaker"].fillna(UNKNOWN_BOOK)
+    snaps["player"] = snaps["player"].map(normalize_name)
+    snaps["game_date"] = snaps["commence_time"].dt.date
+    snaps["local_date"] = snaps["commence_time"].dt.tz_convert(LOCAL_TZ).dt.date
+    snaps = snaps.dropna(subset=["line", "odds", "commence_time"])
+    return snaps.drop(columns=["type"]).reset_index(drop=True)
@@ -1,12 +1,26 @@
-﻿import subprocess
+﻿import sqlite3
 import time
 import os
 import sys
 import builtins
-import smtplib
-from email.message import EmailMessage
 from dotenv import load_dotenv
-import shutil
+import argparse
+from dag_runner import Stage, run_stages
+from instrumentation import RunReport, Span, print_report, profiling_enabled
+from notify_outbox import OutboxWorker, enqueue, smtp_factory
+from artifact_publisher import ARTIFACT_TARGET, publish_artifacts
+
+parser = argparse.ArgumentParser(description="Daily scrape -> train -> predict -> grade pipeline")
+start_point = parser.add_mutually_exclusive_group()
+start_point.add_argument("--from", dest="from_stage",
+                         help="rerun this stage and everything downstream of it (e.g. predict)")
+start_point.add_argument("--resume", action="store_true",
+                         help="continue the last run from its first uncommitted stage")
+parser.add_argument("--force", action="store_true", help="run stages even if their inputs are unchanged")
+parser.add_argument("--profile", action="store_true",
+                    help="dump a cProfile per stage under data/run_reports/profiles/ (or set PIPELINE_PROFILE=1)")
+args = parser.parse_args()
+
 # === Load environment variables from .env ===
 print("Loading .env file...")
 load_dotenv()
@@ -28,22 +42,14 @@ TO_EMAILS = [EMAIL_USER]
 if SMS_ALERT:
     TO_EMAILS.append(SMS_ALERT)
 
+# Alerts are queued locally and delivered by a background worker, so the
+# pipeline never waits on SMTP and a flaky server can't lose a message
+outbox = OutboxWorker(smtp_factory(EMAIL_USER, EMAIL_PASS), EMAIL_USER).start()
+
 def send_email(subject, body):
-    print(f"Sending email to: {', '.join(TO_EMAILS)}")
-    try:
-        msg = EmailMessage()
-        msg.set_content(body)
-        msg["Subject"] = f"[Pipeline] {subject}"
-        msg["From"] = EMAIL_USER
-        msg["To"] = ", ".join(TO_EMAILS)
-
-        with smtplib.SMTP("smtp.gmail.com", 587) as smtp:
-            smtp.starttls()
-            smtp.login(EMAIL_USER, EMAIL_PASS)
-            smtp.send_message(msg)
-        print("Email/SMS sent successfully.")
-    except Exception as e:
-        print(f"[ERROR] Failed to send email/SMS: {e}")
+    enqueue(f"[Pipeline] {subject}", body, TO_EMAILS)
+    outbox.notify()
+    print(f"Queued email to: {', '.join(TO_EMAILS)}")
 
 # === Force UTF-8 output ===
 os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -61,96 +67,68 @@ builtins.print = safe_print
 if sys.stdout.encoding.lower() != "utf-8":
     print("[WARN] Terminal does not support UTF-8. Falling back.")
 
-# === Script steps ===
-steps = [
-    ("[STEP] Scraping Stathead stats", "scrape_stathead_stats.py"),
-    ("[STEP] Pulling sportsbook props", "run_odds_api.py"),
-    ("[STEP] Training strikeout model", "Full_Training_Script.py"),
-    ("[STEP] Generating predictions", "predict_props_with_model.py"),
-    ("[STEP] Compare strikeouts to actuals", "compare_strikeout_picks_to_actual.py")
+# === Pipeline stages ===
+STATHEAD_FILES = [
+    "new_data/stathead_player_pitching_game_data.csv",
+    "new_data/stathead_team_pitching_game_data.csv",
+    "new_data/stathead_batting_game_data.csv",
+]
+MODEL_FILES = ["models/strikeout_model.pkl", "models/feature_order.json", "models/strikeout_model.forest"]
+
+STAGES = [
+    Stage("stathead", "scrape_stathead_stats.py", outputs=STATHEAD_FILES),
+    Stage("odds", "run_odds_api.py",
+          outputs=["data/betonline_pitcher_props.csv", "data/clean_all_props_flat.csv"]),
+    Stage("train", "Full_Training_Script.py", inputs=STATHEAD_FILES, outputs=MODEL_FILES,
+          deps=["stathead"]),
+    Stage("predict", "predict_props_with_model.py",
+          inputs=[STATHEAD_FILES[0], "data/betonline_pitcher_props.csv"] + MODEL_FILES,
+          outputs=["data/predicted_pitcher_props_with_edges.csv"], deps=["train", "odds"]),
+    Stage("compare", "compare_strikeout_picks_to_actual.py",
+          inputs=[STATHEAD_FILES[0], "filtered_bets"],
+          outputs=["data/bets_vs_actuals_strikeouts.csv", "data/results_by_date.csv"], deps=["stathead"]),
 ]
 
-pipeline_success = True
-for label, script in steps:
-    print(f"\n{label}")
-    result = subprocess.run(
-        ["python", script],
-        capture_output=True,
-        text=True,
-        encoding="utf-8",
-        errors="replace"
-    )
-
-    if result.returncode != 0:
-        error_msg = f"[ERROR] Script failed: {script}\n{result.stderr}"
+def report_stage(result):
+    if result.status in ("skipped", "blocked"):
+        print(f"\n[STEP] {result.name}: {result.status}")
+        return
+    print(f"\n[STEP] {result.name}: {result.status} in {result.seconds:.1f}s")
+    print(result.output)
+    if result.status == "failed":
+        error_msg = f"[ERROR] Stage failed: {result.name}\n{result.error}"
         print(error_msg)
-        send_email(f"Pipeline Failed: {script}", error_msg)
-        pipeline_success = False
-        break
-    else:
-        print(f"[OUTPUT] {script} completed.")
-        print(result.stdout)
-
-# === Git push ===
-# === Git push ===
-# === Git push (force local state to GitHub) ===
+        send_email(f"Pipeline Failed: {result.name}", error_msg)
+
+start = time.perf_counter()
+run_report = RunReport("pipeline")
+profile_dir = run_report.profile_dir if args.profile or profiling_enabled() else None
+results = run_stages(STAGES, from_stage=args.from_stage, force=args.force, on_result=report_stage,
+                     profile_dir=profile_dir, resume=args.resume, run_id=run_report.run_id)
+pipeline_success = all(r.status in ("ok", "skipped") for r in results.values())
+print(f"\n[DONE] Pipeline {'succeeded' if pipeline_success else 'failed'} "
+      f"in {time.perf_counter() - start:.1f}s")
+
+for stage in STAGES:
+    result = results[stage.name]
+    run_report.add(result.span or Span(stage.name), result.status)
+print_report(run_report.stages)
+print(f"[REPORT] {run_report.write(pipeline_success)}")
+
+# === Publish artifacts: only chunks the target doesn't already have are uploaded ===
 if pipeline_success:
-    print("\n[STEP] Committing and force pushing to GitHub...")
-
+    print("\n[STEP] Publishing artifacts...")
     try:
-        import subprocess, time, os, shutil
-
-        def ensure_git_identity():
-            name = subprocess.run(["git", "config", "--global", "user.name"], capture_output=True, text=True).stdout.strip()
-            email = subprocess.run(["git", "config", "--global", "user.email"], capture_output=True, text=True).stdout.strip()
-            if not name:
-                subprocess.run(["git", "config", "--global", "user.name", "Gator"], check=True)
-            if not email:
-                subprocess.run(["git", "config", "--global", "user.email", "a1d3r13@gmail.com"], check=True)
-
-        ensure_git_identity()
-        subprocess.run(["git", "config", "--global", "core.longpaths", "true"], check=True)
-
-        # === Clean dangerous paths ===
-        paths_to_clean = ["clean-repo", "new_data/archive"]
-        for path in paths_to_clean:
-            if os.path.exists(path):
-                print(f"[CLEANUP] Removing tracked path: {path}")
-                subprocess.run(["git", "rm", "--cached", "-r", path], check=False)
-                if os.path.isdir(path):
-                    shutil.rmtree(path, ignore_errors=True)
-                elif os.path.isfile(path):
-                    os.remove(path)
-                with open(".gitignore", "a") as gi:
-                    gi.write(f"\n{path}/\n")
-
-        # Stage and commit
-        print("[STEP] Staging and committing changes...")
-        subprocess.run(["git", "add", "-u"], check=True)
-        status = subprocess.run(["git", "status", "--porcelain"], capture_output=True, text=True).stdout.strip()
-        if status:
-            msg = f"Auto push from pipeline at {time.strftime('%Y%m%d_%H%M%S')}"
-            subprocess.run(["git", "commit", "-m", msg], check=True)
-
-        # Final force push
-        print("[STEP] Force pushing local state to GitHub...")
-        subprocess.run(["git", "push", "--force", "origin", "main"], check=True)
-        print("✅ Force push successful.")
-
-        send_email("Pipeline Success", "Force push completed successfully.")
-
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Git command failed: {e}")
-        send_email("Git Push Failed", f"Git error:\n{e.stderr if hasattr(e, 'stderr') else str(e)}")
-
-
-
-
-
-
-
-
-
-
-
-
+        stats = publish_artifacts()
+        summary = (f"{stats['changed']} of {stats['files']} file(s) changed; uploaded "
+                   f"{stats['chunks_uploaded']} chunk(s), {stats['bytes_uploaded'] / 1e6:.1f} MB to {ARTIFACT_TARGET}")
+        print(f"✅ {summary}")
+        send_email("Pipeline Success", f"Artifacts published: {summary}")
+    except (OSError, sqlite3.Error) as e:
+        print(f"[ERROR] Artifact publish failed: {e}")
+        send_email("Artifact Publish Failed", f"Publish error:\n{e}")
+
+# === Flush alerts; anything still undelivered goes out on the next run ===
+left = outbox.stop(timeout=30)
+if left:
+    print(f"[OUTBOX] {left} alert(s) still queued for retry")
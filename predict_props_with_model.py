@@ -1,172 +1,35 @@
 ﻿import pandas as pd
 import numpy as np
-import joblib
-from difflib import get_close_matches
 from datetime import date, datetime, timedelta
 import sys
 import json
-import sqlite3
 import os
-
-if sys.stdout.encoding.lower() != "utf-8":
-    print("[WARN] Terminal does not support emojis. Using safe print style.")
-
-def normalize_name(name):
-    name = str(name).strip().lower()
-    if "," in name:
-        parts = name.split(",")
-        return f"{parts[1].strip()} {parts[0].strip()}"
-    return name
-
-def fuzzy_match(name, candidate_list):
-    match = get_close_matches(name, candidate_list, n=1, cutoff=0.85)
-    return match[0] if match else None
-
-print("[LOAD] Loading sportsbook props...")
-props = pd.read_csv("data/betonline_pitcher_props.csv")
-props.columns = [c.strip().lower() for c in props.columns]
-props = props[props["market"].str.lower().str.contains("pitcher_strikeout", na=False)]
-props = props[props["raw_name"].isin(["Over", "Under"])]
-props = props.dropna(subset=["description", "line", "odds", "commence_time"])
-props["description"] = props["description"].apply(normalize_name)
-props["game_date"] = pd.to_datetime(props["commence_time"]).dt.date
-
-pitcher_lines = props.groupby("description").agg({
-    "line": "first",
-    "odds": "first",
-    "raw_name": "first",
-    "commence_time": "first",
-    "game_date": "first"
-}).reset_index().rename(columns={"description": "player"})
-
-print("[LOAD] Loading Stathead pitcher logs...")
-stats = pd.read_csv("new_data/stathead_player_pitching_game_data.csv")
-stats["Date"] = pd.to_datetime(stats["Date"], errors="coerce")
-stats = stats.dropna(subset=["Date"])
-stats["game_date"] = stats["Date"].dt.date
-stats["Player_clean"] = stats["Player"].apply(normalize_name)
-
-for col in ["IP", "BB", "BF", "H", "ER", "HR", "SO"]:
-    stats[col] = pd.to_numeric(stats[col], errors="coerce")
-
-age_parts = stats["Age"].astype(str).str.extract(r"(\d+)-(\d+)")
-age_parts = age_parts.dropna().astype(int)
-stats["age_float"] = age_parts[0] + age_parts[1] / 365.0
-stats["K_per_IP"] = stats["SO"] / stats["IP"]
-stats["K_per_BF"] = stats["SO"] / stats["BF"]
-
-print("[ROLL] Computing rolling stats...")
-rolling_features = ["IP", "BB", "BF", "H", "ER", "HR", "K_per_IP", "K_per_BF", "age_float"]
-for feat in rolling_features:
-    stats[f"r3_{feat}"] = (
-        stats
-        .groupby("Player_clean", group_keys=False)
-        .apply(lambda g: g[feat].shift(1).rolling(3, min_periods=1).mean(), include_groups=False)
-    )
-
-latest_stats = stats.groupby("Player_clean").last().reset_index()
-
-print("[MATCH] Matching props to stat logs with fuzzy logic...")
-pitcher_lines["Player_clean"] = pitcher_lines["player"].apply(
-    lambda name: fuzzy_match(name, latest_stats["Player_clean"].tolist())
-)
-pitcher_lines = pitcher_lines.dropna(subset=["Player_clean"])
-
-print("[MERGE] Merging stats into props...")
-merged = pitcher_lines.merge(latest_stats, on="Player_clean", how="left")
-merged["game_date"] = pitcher_lines["game_date"]
-
-if merged.empty:
-    print("[FAIL] No matched pitchers. Check name formats or Stathead data freshness.")
-    sys.exit(1)
-
-print(f"[INFO] Merged rows: {len(merged)}")
-
-print("[PREP] Building model input...")
-defaults = {
-    "opp_K_rate": 0.215, "OBP": 0.312, "SLG": 0.410,
-    "OPS": 0.722, "BA": 0.248, "team_K_rate": 0.220
-}
-for col, val in defaults.items():
-    merged[col] = val
-merged["is_home"] = 1
-
-model_input = merged.rename(columns={
-    "r3_IP": "IP", "r3_BB": "BB", "r3_BF": "BF", "r3_H": "H",
-    "r3_ER": "ER", "r3_HR": "HR", "r3_K_per_IP": "K_per_IP",
-    "r3_K_per_BF": "K_per_BF", "r3_age_float": "age_float"
-})
-
-# === Enhanced fallback stats
-filler = {
-    "IP": 5.5, "BB": 1.8, "BF": 24, "H": 4.6, "ER": 2.4, "HR": 0.9,
-    "K_per_IP": 1.15, "K_per_BF": 0.25, "age_float": 28.0
-}
-for stat, val in filler.items():
-    model_input[stat] = model_input[stat].fillna(val)
-
-print("[MODEL] Loading model and predicting...")
-model = joblib.load("models/strikeout_model.pkl")
-with open("models/feature_order.json", "r") as f:
-    expected_features = json.load(f)
-
-for col in expected_features:
-    if col not in model_input.columns:
-        print(f"[FIX] Adding missing column: {col}")
-        model_input[col] = 0.0
-
-model_input = model_input.loc[:, ~model_input.columns.duplicated(keep="last")]
-X = model_input[expected_features].copy()
-
-if X.empty:
-    print("[FAIL] No data available to predict.")
-    sys.exit(1)
-
-# === Make predictions
-merged["predicted_SO"] = model.predict(X)
-merged["predicted_SO"] *= 1.10  # optional boost
-merged["edge"] = merged["predicted_SO"] - merged["line"]
-merged["bet_recommendation"] = np.where(
-    merged["edge"] > 0.75, "✅ Over",
-    np.where(merged["edge"] < -0.75, "✅ Under", "❌ No Bet")
+from model_artifact import load_model, model_version, per_tree_predictions
+from bet_store import DB_PATH as BET_DB_PATH, log_predictions
+from pricing import MAX_STRIKEOUTS, strikeout_pmf, price_props
+from consensus import best_side_price
+from instrumentation import span
+from atomic_io import write_csv, write_json, write_npz
+from dashboard_store import publish
+from schema import memory_mb
+from strikeout_features import (
+    PROPS_PATH, STATS_PATH, PREDICTION_BOOST, load_strikeout_props, pitcher_lines_from_props,
+    load_latest_stats, merge_lines_with_stats, build_model_input, bet_recommendation,
+    input_versions, feature_version, prop_fingerprints
 )
 
-# === Calibration Debug
-print(f"[DEBUG] Avg Market Line: {merged['line'].mean():.2f}")
-print(f"[DEBUG] Avg Predicted SO: {merged['predicted_SO'].mean():.2f}")
-print(f"[DEBUG] Avg Edge: {merged['edge'].mean():.2f}")
-
-result = merged[[
+OUTPUT_PATH = "data/predicted_pitcher_props_with_edges.csv"
+# Props with no matching stat log; remembered so they don't force a rerun every refresh
+UNMATCHED_PATH = "data/unmatched_prop_fingerprints.json"
+# Each prop's strikeout distribution, keyed by fingerprint, for re-pricing without the model
+PMF_PATH = "data/predicted_strikeout_pmf.npz"
+RESULT_COLUMNS = [
     "game_date", "player", "line", "odds",
-    "predicted_SO", "edge", "bet_recommendation"
-]]
-
-print("\n[DATES] Game Dates Predicted:")
-print(result["game_date"].value_counts().sort_index())
-result.to_csv("data/predicted_pitcher_props_with_edges.csv", index=False)
-print("[SAVED] data/predicted_pitcher_props_with_edges.csv")
-
-# === SQLite output
-print("[SQL] Saving predictions to SQLite...")
-db_path = "data/strikeout_model_bets.db"
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
-
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS bets (
-    game_date TEXT,
-    player TEXT,
-    line REAL,
-    odds TEXT,
-    predicted_SO REAL,
-    edge REAL,
-    bet_recommendation TEXT,
-    confidence TEXT,
-    actual_SO REAL,
-    result_hit TEXT,
-    timestamp TEXT
-)
-""")
+    "predicted_SO", "edge", "bet_recommendation",
+    "odds_side", "bookmaker", "n_books", "market_prob",
+    "prob_over", "prob_under", "fair_over_odds", "fair_under_odds", "ev",
+    "fingerprint"
+]
 
 def confidence_level(edge):
     abs_edge = abs(edge)
@@ -177,27 +40,162 @@ def confidence_level(edge):
     elif abs_edge >= 0.75: return "🔥"
     return ""
 
-now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-for _, row in result.iterrows():
-    cursor.execute("""
-    INSERT INTO bets (
-        game_date, player, line, odds,
-        predicted_SO, edge, bet_recommendation,
-        confidence, actual_SO, result_hit, timestamp
-    )
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, ?)
-    """, (
-        str(row["game_date"]),
-        row["player"],
-        float(row["line"]),
-        str(row["odds"]),
-        float(row["predicted_SO"]),
-        float(row["edge"]),
-        row["bet_recommendation"],
-        confidence_level(row["edge"]),
-        now
-    ))
-
-conn.commit()
-print("[OK] Saved to", db_path)
-conn.close()
+def load_cached_predictions(path=OUTPUT_PATH):
+    # Outputs written before fingerprinting can't be trusted as a cache
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    cached = pd.read_csv(path)
+    if "fingerprint" not in cached.columns:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+    return cached.drop_duplicates("fingerprint", keep="last")
+
+def load_unmatched(path=UNMATCHED_PATH):
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r") as f:
+        return set(json.load(f))
+
+def load_cached_pmf(fingerprints, predicted, path=PMF_PATH):
+    """Distribution rows for `fingerprints`, in order.
+
+    Rows scored before distributions were persisted fall back to a negative
+    binomial around the point prediction.
+    """
+    fingerprints = np.asarray(fingerprints, dtype=str)
+    pmf = strikeout_pmf(np.asarray(predicted, dtype=float), method="negbin")
+    if os.path.exists(path) and len(fingerprints):
+        with np.load(path) as cached:
+            index = {fp: i for i, fp in enumerate(cached["fingerprint"])}
+            stored = cached["pmf"]
+        hits = np.array([fp in index for fp in fingerprints])
+        if hits.any():
+            pmf[hits] = stored[[index[fp] for fp in fingerprints[hits]]]
+    return pmf
+
+def predict_props(lines, model, expected_features, latest_stats=None):
+    """Score props; returns (rows, pmf) with one distribution row per output row."""
+    if latest_stats is None:
+        print("[LOAD] Loading Stathead pitcher logs and rolling stats...")
+        with span("load stats") as s:
+            latest_stats = load_latest_stats()
+            s.read_file(STATS_PATH)
+            s.add_rows(rows_out=len(latest_stats))
+
+    print("[MATCH] Matching props to stat logs and merging...")
+    with span("match") as s:
+        merged = merge_lines_with_stats(lines, latest_stats)
+        s.add_rows(len(lines), len(merged))
+    if merged.empty:
+        print("[WARN] No matched pitchers. Check name formats or Stathead data freshness.")
+        return pd.DataFrame(columns=RESULT_COLUMNS), np.empty((0, MAX_STRIKEOUTS + 1))
+    print(f"[INFO] Merged rows: {len(merged)} ({memory_mb(merged):.2f} MB)")
+
+    print("[PREP] Building model input...")
+    X = build_model_input(merged, expected_features)
+
+    # === Make predictions
+    with span("model") as s:
+        merged["predicted_SO"] = model.predict(X)
+        tree_preds = per_tree_predictions(model, X) * PREDICTION_BOOST
+        s.add_rows(len(X), len(X))
+    merged["predicted_SO"] *= PREDICTION_BOOST  # optional boost
+    merged["edge"] = merged["predicted_SO"] - merged["line"]
+    merged["bet_recommendation"] = bet_recommendation(merged["edge"])
+
+    # === Bet the side the model likes at the best price any book is offering
+    for col, values in best_side_price(merged, merged["edge"] >= 0).items():
+        merged[col] = values
+
+    # === Price both sides from the per-tree spread
+    pmf = strikeout_pmf(merged["predicted_SO"], tree_preds)
+    for col, values in price_props(pmf, merged["line"], merged["odds"], merged["odds_side"]).items():
+        merged[col] = values
+
+    # === Calibration Debug
+    print(f"[DEBUG] Avg Market Line: {merged['line'].mean():.2f}")
+    print(f"[DEBUG] Avg Predicted SO: {merged['predicted_SO'].mean():.2f}")
+    print(f"[DEBUG] Avg Edge: {merged['edge'].mean():.2f}")
+    print(f"[DEBUG] Avg EV at best price: {merged['ev'].mean():+.3f}")
+
+    return merged[RESULT_COLUMNS].assign(game_date=merged["game_date"].astype(str)), pmf
+
+
+def refresh_predictions(props, model, expected_features, latest_stats=None, output_path=OUTPUT_PATH):
+    """Re-score only props whose fingerprint changed and rewrite the output.
+
+    Returns (result, fresh) where fresh holds the rows the model just scored,
+    or (None, None) when nothing on the board changed since the last run.
+    """
+    with span("lines") as s:
+        pitcher_lines = pitcher_lines_from_props(props)
+        s.add_rows(len(props), len(pitcher_lines))
+
+    # === Only props whose inputs changed since the last run go through the model
+    version = feature_version(model_version(model), input_versions())
+    pitcher_lines["fingerprint"] = prop_fingerprints(pitcher_lines, version)
+    cached = load_cached_predictions(output_path)
+    reused = cached[cached["fingerprint"].isin(pitcher_lines["fingerprint"])]
+    unmatched = load_unmatched() & set(pitcher_lines["fingerprint"])
+    known = set(reused["fingerprint"]) | unmatched
+    changed = pitcher_lines[~pitcher_lines["fingerprint"].isin(known)]
+    print(f"[CACHE] {len(reused)} unchanged prop(s) reused, {len(changed)} new or changed, "
+          f"{len(unmatched)} known unmatched")
+
+    if changed.empty and len(reused) == len(cached):
+        print(f"[OK] Nothing changed; {output_path} is current.")
+        return None, None
+
+    fresh, fresh_pmf = pd.DataFrame(columns=RESULT_COLUMNS), np.empty((0, MAX_STRIKEOUTS + 1))
+    if not changed.empty:
+        fresh, fresh_pmf = predict_props(changed, model, expected_features, latest_stats)
+        unmatched |= set(changed["fingerprint"]) - set(fresh["fingerprint"])
+        write_json(sorted(unmatched), UNMATCHED_PATH)
+    if fresh.empty and reused.empty:
+        raise ValueError("No data available to predict.")
+
+    # === Rewrite the output with cached and fresh rows; props that left the board drop out
+    result = pd.concat([f for f in (reused, fresh) if not f.empty], ignore_index=True)
+    pmf = np.vstack([load_cached_pmf(reused["fingerprint"], reused["predicted_SO"]), fresh_pmf])
+    order = result.sort_values(["game_date", "player"]).index.to_numpy()
+    result = result.loc[order, RESULT_COLUMNS].reset_index(drop=True)
+    pmf = pmf[order].astype(np.float32)
+
+    print("\n[DATES] Game Dates Predicted:")
+    print(result["game_date"].value_counts().sort_index())
+    with span("save") as s:
+        write_csv(result, output_path)
+        write_npz(PMF_PATH, fingerprint=result["fingerprint"].to_numpy(dtype=str), pmf=pmf)
+        s.add_rows(len(result), len(result))
+        s.wrote_file(output_path)
+    print(f"[SAVED] {output_path} ({len(fresh)} updated, {len(reused)} reused)")
+    changed_dates = publish("predictions", result.assign(pmf=[row.tobytes() for row in pmf]))
+    print(f"[STORE] {len(changed_dates)} dashboard date partition(s) updated")
+
+    # === SQLite output: only rows the model just scored
+    if not fresh.empty:
+        print("[SQL] Saving predictions to SQLite...")
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        logged = fresh.assign(confidence=fresh["edge"].apply(confidence_level))
+        written = log_predictions(logged, model_version(model), now)
+        print(f"[OK] Upserted {written} rows into {BET_DB_PATH}")
+    return result, fresh
+
+
+if __name__ == "__main__":
+    if sys.stdout.encoding.lower() != "utf-8":
+        print("[WARN] Terminal does not support emojis. Using safe print style.")
+
+    print("[LOAD] Loading sportsbook props...")
+    with span("load props") as s:
+        props = load_strikeout_props()
+        s.read_file(PROPS_PATH)
+        s.add_rows(rows_out=len(props))
+
+    print("[MODEL] Loading model...")
+    model, expected_features = load_model()
+
+    try:
+        refresh_predictions(props, model, expected_features)
+    except ValueError as e:
+        print(f"[FAIL] {e}")
+        sys.exit(1)
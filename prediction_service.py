@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+
+from model_artifact import load_model, model_version
+from strikeout_features import (
+    STATS_PATH, MODEL_DIR, PREDICTION_BOOST, normalize_name, load_latest_stats,
+    match_players, build_model_input, bet_recommendation, input_versions
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class ModelSnapshot:
+    """Everything needed to score props, built once per model/stats version."""
+
+    def __init__(self, stats_path, model_dir, versions):
+        self.versions = versions
+        self.loaded_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self.model, self.features = load_model(
+            forest_path=os.path.join(model_dir, "strikeout_model.forest"),
+            pickle_path=os.path.join(model_dir, "strikeout_model.pkl"),
+            features_path=os.path.join(model_dir, "feature_order.json"),
+        )
+        self.model_id = model_version(self.model)
+
+        latest_stats = load_latest_stats(stats_path)
+        self.candidates = latest_stats["Player_clean"].tolist()
+        self.match_cache = {}
+
+        # Features don't depend on the prop, so every pitcher is scored up front
+        X = build_model_input(latest_stats, self.features, verbose=False)
+        self.predictions = pd.Series(
+            np.asarray(self.model.predict(X)) * PREDICTION_BOOST,
+            index=latest_stats["Player_clean"].to_numpy()
+        )
+
+
+class PredictionState:
+    def __init__(self, stats_path=STATS_PATH, model_dir=MODEL_DIR):
+        self.stats_path = stats_path
+        self.model_dir = model_dir
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.reload()
+
+    def current_versions(self):
+        return input_versions(self.stats_path, self.model_dir)
+
+    def reload(self):
+        with self.lock:
+            versions = self.current_versions()
+            start = time.perf_counter()
+            snapshot = ModelSnapshot(self.stats_path, self.model_dir, versions)
+            # Swap in one assignment so in-flight requests keep a consistent view
+            self.snapshot = snapshot
+            print(f"[RELOAD] model_id={snapshot.model_id} pitchers={len(snapshot.predictions)} "
+                  f"in {time.perf_counter() - start:.2f}s")
+
+    def reload_if_changed(self):
+        if self.current_versions() == self.snapshot.versions:
+            return False
+        try:
+            self.reload()
+        except Exception as e:
+            print(f"[ERROR] Reload failed, keeping model_id={self.snapshot.model_id}: {e}")
+            return False
+        return True
+
+    def score(self, props):
+        snap = self.snapshot
+        df = pd.DataFrame(props)
+        if df.empty:
+            return []
+        if "player" not in df.columns or "line" not in df.columns:
+            raise ValueError("Each prop needs at least 'player' and 'line'.")
+
+        df["player"] = df["player"].map(normalize_name)
+        df["matched_player"] = match_players(df["player"], snap.candidates, snap.match_cache)
+        df["line"] = pd.to_numeric(df["line"], errors="coerce")
+        df["predicted_SO"] = snap.predictions.reindex(df["matched_player"]).to_numpy()
+        df["edge"] = df["predicted_SO"] - df["line"]
+        df["bet_recommendation"] = np.where(
+            df["edge"].notna(), bet_recommendation(df["edge"].fillna(0.0)), None
+        )
+        df["model_id"] = snap.model_id
+
+        df = df.astype(object).where(df.notna(), None)
+        return df.to_dict(orient="records")
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send_json({"error": "not found"}, 404)
+                return
+            snap = state.snapshot
+            self._send_json({
+                "model_id": snap.model_id,
+                "loaded_at": snap.loaded_at,
+                "pitchers": len(snap.predictions),
+            })
+
+        def do_POST(self):
+            if self.path == "/reload":
+                try:
+                    state.reload()
+                except Exception as e:
+                    print(f"[ERROR] Reload failed, keeping model_id={state.snapshot.model_id}: {e}")
+                    self._send_json({"error": f"reload failed: {e}", "model_id": state.snapshot.model_id}, 500)
+                    return
+                self._send_json({"model_id": state.snapshot.model_id})
+                return
+            if self.path != "/score":
+                self._send_json({"error": "not found"}, 404)
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"[]")
+                props = payload.get("props", []) if isinstance(payload, dict) else payload
+                results = state.score(props)
+            except (ValueError, TypeError) as e:
+                self._send_json({"error": str(e)}, 400)
+                return
+            self._send_json({"model_id": state.snapshot.model_id, "results": results})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def watch_for_changes(state, poll_seconds):
+    while True:
+        time.sleep(poll_seconds)
+        state.reload_if_changed()
+
+
+def score_props(props, url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=5):
+    """Client helper: score a batch of props against a running service."""
+    req = urllib.request.Request(
+        f"{url}/score",
+        data=json.dumps({"props": props}, default=str).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())["results"]
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, poll_seconds=5.0, state=None):
+    state = state or PredictionState()
+    threading.Thread(target=watch_for_changes, args=(state, poll_seconds), daemon=True).start()
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    print(f"[SERVE] Prediction service on http://{host}:{port} (watching {state.model_dir}/)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[STOP] Shutting down prediction service.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident strikeout prediction service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--poll-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.poll_seconds)
@@ -0,0 +1,198 @@
+import argparse
+import gzip
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from dashboard_store import DATASETS, STORE_PATH, connect
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+POOL_SIZE = 4
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+GZIP_MIN_BYTES = 1024
+
+# Player column and sort order per dataset; BLOBs never go over the wire
+PLAYER_COLUMN = {"predictions": "player", "results": "pitcher"}
+API_COLUMNS = {name: [c for c, kind in cols.items() if kind != "BLOB"] for name, cols in DATASETS.items()}
+
+
+class ConnectionPool:
+    """A fixed set of read-only SQLite connections shared by the request threads."""
+
+    def __init__(self, db_path=STORE_PATH, size=POOL_SIZE):
+        connect(db_path).close()  # make sure the schema exists before opening read-only
+        self._idle = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _param(params, name, cast=str, default=None):
+    values = params.get(name)
+    if not values or values[0] == "":
+        return default
+    try:
+        return cast(values[0])
+    except ValueError:
+        raise BadRequest(f"invalid {name}: {values[0]!r}")
+
+
+def partition_version(conn, dataset, game_date=None):
+    """(version, game_date) the response depends on; the ETag is built from it."""
+    if game_date is None:
+        row = conn.execute(
+            "SELECT game_date FROM partitions WHERE dataset = ? ORDER BY game_date DESC LIMIT 1", (dataset,)
+        ).fetchone()
+        if row is None:
+            return 0, None
+        game_date = row["game_date"]
+    row = conn.execute(
+        "SELECT version FROM partitions WHERE dataset = ? AND game_date = ?", (dataset, game_date)
+    ).fetchone()
+    return (row["version"] if row else 0), game_date
+
+
+def query_rows(conn, dataset, game_date, player=None, min_edge=None, limit=DEFAULT_LIMIT, offset=0):
+    clauses, params = ["game_date = ?"], [game_date]
+    if player:
+        clauses.append(f"{PLAYER_COLUMN[dataset]} LIKE ?")
+        params.append(f"%{player.lower()}%")
+    if min_edge is not None:
+        clauses.append("ABS(edge) >= ?")
+        params.append(min_edge)
+    where = " AND ".join(clauses)
+    total = conn.execute(f"SELECT COUNT(*) FROM {dataset} WHERE {where}", params).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT {', '.join(API_COLUMNS[dataset])} FROM {dataset} WHERE {where} "
+        f"ORDER BY ABS(edge) DESC, {PLAYER_COLUMN[dataset]} LIMIT ? OFFSET ?",
+        params + [limit, offset],
+    ).fetchall()
+    return total, [dict(r) for r in rows]
+
+
+def make_handler(pool):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload=None, etag=None):
+            body = b"" if payload is None else json.dumps(payload, default=str).encode("utf-8")
+            gzipped = len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", "")
+            if gzipped:
+                body = gzip.compress(body, compresslevel=5)
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            if payload is not None:
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Vary", "Accept-Encoding")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            try:
+                if url.path == "/health":
+                    self._send(200, {"status": "ok"})
+                elif url.path == "/dates":
+                    self._dates(_param(params, "dataset", default="predictions"))
+                elif url.path.strip("/") in DATASETS:
+                    self._rows(url.path.strip("/"), params)
+                else:
+                    self._send(404, {"error": "not found"})
+            except BadRequest as e:
+                self._send(400, {"error": str(e)})
+
+        def _dates(self, dataset):
+            if dataset not in DATASETS:
+                raise BadRequest(f"unknown dataset: {dataset}")
+            with pool.connection() as conn:
+                rows = conn.execute(
+                    "SELECT game_date, rows, version FROM partitions WHERE dataset = ? ORDER BY game_date",
+                    (dataset,),
+                ).fetchall()
+            latest = max((r["version"] for r in rows), default=0)
+            etag = f'W/"{dataset}-dates-{latest}"'
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, etag=etag)
+                return
+            self._send(200, {"dataset": dataset, "dates": [dict(r) for r in rows]}, etag)
+
+        def _rows(self, dataset, params):
+            game_date = _param(params, "date")
+            player = _param(params, "player")
+            min_edge = _param(params, "min_edge", float)
+            limit = min(max(_param(params, "limit", int, DEFAULT_LIMIT), 1), MAX_LIMIT)
+            offset = max(_param(params, "offset", int, 0), 0)
+
+            with pool.connection() as conn:
+                # The ETag needs one primary-key lookup, so an unchanged poll never reads rows
+                version, game_date = partition_version(conn, dataset, game_date)
+                query = hashlib.sha1(json.dumps([game_date, player, min_edge, limit, offset]).encode()).hexdigest()[:12]
+                etag = f'W/"{dataset}-{version}-{query}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, etag=etag)
+                    return
+                total, rows = (0, []) if game_date is None else query_rows(
+                    conn, dataset, game_date, player, min_edge, limit, offset)
+
+            next_offset = offset + len(rows) if offset + len(rows) < total else None
+            self._send(200, {
+                "dataset": dataset, "date": game_date, "version": version,
+                "total": total, "offset": offset, "limit": limit, "next_offset": next_offset,
+                "rows": rows,
+            }, etag)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, db_path=STORE_PATH, pool_size=POOL_SIZE):
+    pool = ConnectionPool(db_path, pool_size)
+    server = ThreadingHTTPServer((host, port), make_handler(pool))
+    print(f"[SERVE] Predictions API on http://{host}:{port} over {db_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[STOP] Shutting down predictions API.")
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only JSON API over the dashboard store")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=STORE_PATH)
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.db, args.pool_size)
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Strikeout counts above this are lumped into the "over" tail
+MAX_STRIKEOUTS = 25
+DEFAULT_DISPERSION = 12.0  # negative binomial size; larger -> closer to Poisson
+MIXTURE_CHUNK_ROWS = 4096
+
+_K = np.arange(MAX_STRIKEOUTS + 1)
+_LOG_FACT = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, MAX_STRIKEOUTS + 1)))])
+
+
+# === Odds conversions ===
+def american_to_decimal(odds):
+    odds = np.asarray(odds, dtype=np.float64)
+    return np.where(odds > 0, 1 + odds / 100.0, 1 + 100.0 / np.abs(odds))
+
+
+def implied_probability(odds):
+    return 1.0 / american_to_decimal(odds)
+
+
+def probability_to_american(p):
+    p = np.clip(np.asarray(p, dtype=np.float64), 1e-9, 1 - 1e-9)
+    return np.where(p >= 0.5, -100.0 * p / (1 - p), 100.0 * (1 - p) / p)
+
+
+# === Count distributions, one row per pitcher ===
+def poisson_pmf(mean):
+    lam = np.clip(np.asarray(mean, dtype=np.float64), 1e-9, None)[..., None]
+    return np.exp(-lam + _K * np.log(lam) - _LOG_FACT)
+
+
+def negbin_pmf(mean, dispersion=DEFAULT_DISPERSION):
+    mu = np.clip(np.asarray(mean, dtype=np.float64), 1e-9, None)[:, None]
+    r = np.broadcast_to(np.asarray(dispersion, dtype=np.float64), mu.shape[:1])[:, None]
+    # log Gamma(k + r) - log Gamma(r) == sum_{j<k} log(r + j)
+    rising = np.cumsum(np.log(r + _K[:-1]), axis=1)
+    log_rising = np.concatenate([np.zeros_like(r), rising], axis=1)
+    log_pmf = (log_rising - _LOG_FACT
+               + r * np.log(r / (r + mu)) + _K * np.log(mu / (r + mu)))
+    return np.exp(log_pmf)
+
+
+def tree_mixture_pmf(tree_preds):
+    """Equal-weight mixture of Poissons, one per tree; tree_preds is (n_trees, n_rows)."""
+    tree_preds = np.asarray(tree_preds, dtype=np.float64)
+    n_rows = tree_preds.shape[1]
+    out = np.empty((n_rows, MAX_STRIKEOUTS + 1))
+    for start in range(0, n_rows, MIXTURE_CHUNK_ROWS):
+        block = tree_preds[:, start:start + MIXTURE_CHUNK_ROWS]
+        out[start:start + block.shape[1]] = poisson_pmf(block).mean(axis=0)
+    return out
+
+
+def strikeout_pmf(predicted, tree_preds=None, method="trees", dispersion=DEFAULT_DISPERSION):
+    if method == "trees" and tree_preds is not None:
+        return tree_mixture_pmf(tree_preds)
+    if method == "poisson":
+        return poisson_pmf(predicted)
+    return negbin_pmf(predicted, dispersion)
+
+
+# === Line pricing ===
+def line_probabilities(pmf, lines, rows=None):
+    """P(over), P(under), P(push) for each line; rows maps lines to pmf rows."""
+    lines = np.asarray(lines, dtype=np.float64)
+    rows = np.arange(len(lines)) if rows is None else np.asarray(rows)
+    cdf = np.cumsum(pmf, axis=1)
+
+    lo = np.clip(np.floor(lines).astype(int), 0, MAX_STRIKEOUTS)
+    under_k = np.ceil(lines).astype(int) - 1
+    p_under = np.where(under_k >= 0, cdf[rows, np.clip(under_k, 0, MAX_STRIKEOUTS)], 0.0)
+    p_over = 1.0 - cdf[rows, lo]
+    is_whole = lines == np.floor(lines)
+    p_push = np.where(is_whole, pmf[rows, lo], 0.0)
+    return p_over, p_under, p_push
+
+
+def expected_value(p_win, p_push, odds):
+    """Expected profit per unit staked at American odds; pushes refund the stake."""
+    p_lose = 1.0 - p_win - p_push
+    return p_win * (american_to_decimal(odds) - 1.0) - p_lose
+
+
+def price_props(pmf, lines, odds, sides, rows=None):
+    """Fair odds for both sides and EV of the posted price on the quoted side."""
+    p_over, p_under, p_push = line_probabilities(pmf, lines, rows)
+    is_over = np.char.lower(np.asarray(sides, dtype=str)) == "over"
+    p_side = np.where(is_over, p_over, p_under)
+
+    # Fair prices ignore pushes: P(win | no push)
+    decided = np.clip(1.0 - p_push, 1e-9, None)
+    return {
+        "prob_over": p_over,
+        "prob_under": p_under,
+        "fair_over_odds": probability_to_american(p_over / decided),
+        "fair_under_odds": probability_to_american(p_under / decided),
+        "ev": expected_value(p_side, p_push, odds),
+    }
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import read_appended_csv, write_csv
+from dashboard_store import load_day, partition_versions, publish
+from pricing import american_to_decimal
+
+RESULTS_PATH = "data/bets_vs_actuals_strikeouts.csv"
+SUMMARY_PATH = "data/results_by_date.csv"
+
+OUTCOMES = ["Win", "Loss", "Push", "No Bet", "No Data"]
+COUNT_COLUMNS = ["picks", "graded", "wins", "losses", "pushes", "staked", "units"]
+
+
+def add_outcomes(results):
+    """Outcome of each bet from the bettor's side: Win, Loss, Push, No Bet or No Data.
+
+    A bet is graded on the actual against its line, not against the model's
+    prediction; only a whole-number line can push.
+    """
+    side = results["bet_recommendation"].astype(str).str.replace("✅ ", "", regex=False)
+    has_side = side.isin(["Over", "Under"])
+    actual = pd.to_numeric(results["Strikeouts"], errors="coerce")
+    line = pd.to_numeric(results["line"], errors="coerce") if "line" in results else pd.Series(np.nan, results.index)
+    results["Outcome"] = np.select(
+        [actual.isna() | line.isna(), ~has_side, actual == line, (actual > line) == (side == "Over")],
+        ["No Data", "No Bet", "Push", "Win"],
+        default="Loss",
+    )
+    # One unit staked per bet; a win pays at the quoted price
+    odds = pd.to_numeric(results["odds"], errors="coerce")
+    payout = np.where(odds.notna(), american_to_decimal(odds.fillna(-110)) - 1, np.nan)
+    results["Units"] = np.select(
+        [results["Outcome"] == "Win", results["Outcome"] == "Loss"],
+        [payout, -1.0],
+        default=0.0,
+    )
+    return results
+
+
+def _daily_counts(results):
+    outcome = results["Outcome"]
+    return pd.DataFrame({
+        "Game_Date": results["Game_Date"],
+        "picks": 1,
+        "graded": outcome != "No Data",
+        "wins": outcome == "Win",
+        "losses": outcome == "Loss",
+        "pushes": outcome == "Push",
+        "staked": outcome.isin(["Win", "Loss", "Push"]),
+        "units": results["Units"].fillna(0.0),
+    }).groupby("Game_Date", as_index=False).sum()
+
+
+def _with_totals(daily):
+    daily = daily.sort_values("Game_Date").reset_index(drop=True)
+    # Rounded before the running total so an incremental update sums exactly what a full one does
+    daily["units"] = daily["units"].round(4)
+    for col in COUNT_COLUMNS:
+        daily[f"cum_{col}"] = daily[col].cumsum()
+    for prefix in ["", "cum_"]:
+        # Win rate over every graded pick, matching the viewer's long-standing definition
+        daily[f"{prefix}win_rate"] = np.where(
+            daily[f"{prefix}graded"] > 0, daily[f"{prefix}wins"] / daily[f"{prefix}graded"].clip(lower=1), 0.0)
+        daily[f"{prefix}roi"] = np.where(
+            daily[f"{prefix}staked"] > 0, daily[f"{prefix}units"] / daily[f"{prefix}staked"].clip(lower=1), 0.0)
+    daily["cum_units"] = daily["cum_units"].round(4)
+    return daily
+
+
+def summarize_by_date(results):
+    """One row per game date with that day's counts, running totals, win rate and ROI."""
+    results = results.copy()
+    if "Outcome" not in results.columns or "Units" not in results.columns:
+        results = add_outcomes(results)
+    results["Game_Date"] = pd.to_datetime(results["Game_Date"]).dt.date
+    return _with_totals(_daily_counts(results))
+
+
+def refresh(results_path=RESULTS_PATH, summary_path=SUMMARY_PATH):
+    """Stamp outcomes onto the whole results store, republish it and rewrite the per-date summary."""
+    results = add_outcomes(read_appended_csv(results_path))
+    write_csv(results, results_path)
+    publish("results", results)
+    summary = summarize_by_date(results)
+    write_csv(summary, summary_path)
+    return summary
+
+
+def update(graded, results_path=RESULTS_PATH, summary_path=SUMMARY_PATH):
+    """Fold rows just appended to the results store into the dashboard store and summary.
+
+    `graded` already carries Outcome and Units. Only its dates are republished
+    and re-summarized; every other date's totals come from the existing
+    summary, so a grading run costs what it graded rather than the season.
+    Stores that predate outcomes, or have no summary yet, get one full refresh.
+    """
+    stamped = "Outcome" in pd.read_csv(results_path, nrows=0).columns
+    if not stamped or not os.path.exists(summary_path) or not partition_versions("results"):
+        return refresh(results_path, summary_path)
+
+    # Each touched date's partition is what the store already holds plus the new rows
+    dates = sorted(set(pd.to_datetime(graded["Game_Date"]).dt.strftime("%Y-%m-%d")))
+    day_rows = pd.concat([load_day("results", d) for d in dates] + [graded.rename(columns=str.lower)],
+                         ignore_index=True)
+    publish("results", day_rows)
+
+    day_rows = day_rows.rename(columns={"game_date": "Game_Date", "outcome": "Outcome", "units": "Units"})
+    day_rows["Game_Date"] = pd.to_datetime(day_rows["Game_Date"]).dt.date
+    daily = _daily_counts(day_rows)
+    summary = pd.read_csv(summary_path)
+    summary["Game_Date"] = pd.to_datetime(summary["Game_Date"]).dt.date
+    summary = summary.loc[~summary["Game_Date"].isin(daily["Game_Date"]), ["Game_Date"] + COUNT_COLUMNS]
+    summary = _with_totals(pd.concat([summary, daily], ignore_index=True))
+    write_csv(summary, summary_path)
+    return summary
+
+
+if __name__ == "__main__":
+    summary = refresh()
+    last = summary.iloc[-1]
+    print(f"✅ {len(summary)} dates summarized to {SUMMARY_PATH}: "
+          f"{int(last['cum_wins'])}/{int(last['cum_graded'])} correct, ROI {last['cum_roi']:+.1%}")
@@ -17,6 +17,14 @@ def safe_print(*args, **kwargs):
 
 builtins.print = safe_print
 
+# The step scripts import shared modules from the repo root
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+child_env = {
+    **os.environ,
+    "PYTHONIOENCODING": "utf-8",
+    "PYTHONPATH": os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")])),
+}
+
 # === Ordered scripts to run ===
 scripts = [
     "bet_logic/Step_1_get_BETONLINE_odds.py",
@@ -41,7 +49,7 @@ for script in scripts:
             stderr=subprocess.PIPE,
             encoding="utf-8",
             errors="replace",
-            env={**os.environ, "PYTHONIOENCODING": "utf-8"}
+            env=child_env
         )
         print(f"[OK] Finished: {script}")
         output = result.stdout if result.stdout else "[WARN] No stdout captured."
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Repeated labels: stored once per distinct value with a small integer code per row
+CATEGORY_COLUMNS = {
+    "Player", "Player_clean", "Team", "Team_pitch", "Opp", "Unnamed: 7",
+    "player", "description", "participant", "bookmaker", "market", "raw_name", "side",
+    "home_team", "away_team",
+}
+# Calendar days as an ordered categorical: sorts and min/max like dates, one code per row
+DATE_COLUMNS = {"game_date"}
+# Per-game counts; int16 leaves room for arithmetic like ER * 9 without overflow
+COUNT_COLUMNS = {
+    "Rk", "H", "R", "ER", "UER", "HR", "BB", "IBB", "SO", "SO.1", "HBP", "BK", "WP", "BF", "BR", "PA",
+}
+FLAG_COLUMNS = {"is_home"}
+# American odds fit comfortably in int16 (+/- 32767)
+ODDS_COLUMNS = {"odds"}
+RATE_COLUMNS = {
+    "IP", "line", "age_float", "K_per_IP", "K_per_BF", "WHIP", "KBB", "ERA_est",
+    "opp_K_rate", "team_K_rate", "OBP", "SLG", "OPS", "BA",
+}
+ROLLING_PREFIX = "r3_"
+
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def _integer(series, dtype):
+    """`series` as `dtype` only when every value is a whole number in range.
+
+    Fractional or out-of-range values keep the parsed dtype rather than being
+    truncated or wrapped; missing values can't live in a plain int column, so
+    those columns become float32 when that holds them exactly.
+    """
+    values = pd.to_numeric(series, errors="coerce")
+    present = values.dropna()
+    info = np.iinfo(dtype)
+    whole = bool((present == np.floor(present)).all())
+    in_range = present.empty or (present.min() >= info.min and present.max() <= info.max)
+    if not (whole and in_range):
+        return values
+    if len(present) < len(values):
+        return values.astype(np.float32)
+    return values.astype(dtype)
+
+
+def compact_column(name, series):
+    """`series` in its compact dtype, or unchanged when `name` isn't in the schema."""
+    if name in CATEGORY_COLUMNS:
+        return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    if name in DATE_COLUMNS:
+        if isinstance(series.dtype, pd.CategoricalDtype) and series.cat.ordered:
+            return series
+        return series.astype(pd.CategoricalDtype(sorted(series.dropna().unique()), ordered=True))
+    if name in COUNT_COLUMNS or name in ODDS_COLUMNS:
+        return _integer(series, np.int16)
+    if name in FLAG_COLUMNS:
+        return _integer(series, np.int8)
+    if name in RATE_COLUMNS or name.startswith(ROLLING_PREFIX):
+        return pd.to_numeric(series, errors="coerce").astype(np.float32)
+    return series
+
+
+def compact(df, label=None):
+    """Apply the schema to every column it knows; prints memory before and after when labelled."""
+    before = memory_mb(df) if label else None
+    df = df.copy(deep=False)
+    # By position, so frames that still carry duplicate column names convert cleanly
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        converted = compact_column(name, series)
+        if converted is not series:
+            df.isetitem(i, converted)
+    if label:
+        after = memory_mb(df)
+        print(f"[MEM] {label}: {before:.2f} MB -> {after:.2f} MB ({after / max(before, 1e-9) - 1:+.0%})")
+    return df
+
+
+def align_categories(left, right, left_on, right_on=None):
+    """Give a merge key the same categories on both sides so the merge result stays categorical."""
+    right_on = right_on or left_on
+    categories = (
+        left[left_on].astype("category").cat.categories
+        .union(right[right_on].astype("category").cat.categories)
+    )
+    dtype = pd.CategoricalDtype(categories)
+    return (left.assign(**{left_on: left[left_on].astype(dtype)}),
+            right.assign(**{right_on: right[right_on].astype(dtype)}))
@@ -16,6 +16,9 @@ builtins.print = safe_print
 
 # === Ensure subprocess output handles UTF-8 ===
 os.environ["PYTHONIOENCODING"] = "utf-8"
+# The scrape scripts import shared modules from the repo root
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_DIR, os.environ.get("PYTHONPATH")]))
 
 # === SCRIPT ORDER ===
 steps = [
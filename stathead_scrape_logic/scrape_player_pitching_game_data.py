@@ -5,6 +5,8 @@ import pandas as pd
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+from atomic_io import write_csv
+
 load_dotenv()
 USERNAME = os.getenv("STATHEAD_USERNAME")
 PASSWORD = os.getenv("STATHEAD_PASSWORD")
@@ -67,7 +69,7 @@ with requests.Session() as session:
         print("🆕 No existing file. Created new dataset.")
 
     # Save to main file
-    combined_df.to_csv(CSV_PATH, index=False)
+    write_csv(combined_df, CSV_PATH)
     print(f"💾 Updated main file: {CSV_PATH}")
 
     # Archive copy
@@ -6,6 +6,8 @@ import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+from atomic_io import write_csv
+
 # === Load credentials ===
 load_dotenv()
 USERNAME = os.getenv("STATHEAD_USERNAME")
@@ -65,7 +67,7 @@ else:
     combined_df = df
     print("🆕 No existing file found — creating new CSV.")
 
-combined_df.to_csv(CSV_PATH, index=False)
+write_csv(combined_df, CSV_PATH)
 print(f"💾 Saved updated CSV: {CSV_PATH}")
 
 # === Archive copy ===
@@ -5,6 +5,8 @@ import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+from atomic_io import write_csv
+
 # === Load login credentials ===
 load_dotenv()
 USERNAME = os.getenv("STATHEAD_USERNAME")
@@ -94,7 +96,7 @@ with requests.Session() as session:
         print("🆕 Created new CSV.")
 
     # Step 4: Save main file
-    combined_df.to_csv(CSV_PATH, index=False)
+    write_csv(combined_df, CSV_PATH)
     print(f"💾 Saved updated CSV: {CSV_PATH}")
 
     # Step 5: Archive with timestamp
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+import numpy as np
+from difflib import get_close_matches
+
+from consensus import book_pairs, consensus_lines, main_lines
+from schema import compact
+
+PROPS_PATH = "data/betonline_pitcher_props.csv"
+STATS_PATH = "new_data/stathead_player_pitching_game_data.csv"
+MODEL_DIR = "models"
+
+PREDICTION_BOOST = 1.10
+EDGE_THRESHOLD = 0.75
+
+# === League-average opponent context (no per-game opponent data at prediction time)
+OPPONENT_DEFAULTS = {
+    "opp_K_rate": 0.215, "OBP": 0.312, "SLG": 0.410,
+    "OPS": 0.722, "BA": 0.248, "team_K_rate": 0.220
+}
+
+ROLLING_RENAMES = {
+    "r3_IP": "IP", "r3_BB": "BB", "r3_BF": "BF", "r3_H": "H",
+    "r3_ER": "ER", "r3_HR": "HR", "r3_K_per_IP": "K_per_IP",
+    "r3_K_per_BF": "K_per_BF", "r3_age_float": "age_float"
+}
+
+# === Enhanced fallback stats
+FILLER = {
+    "IP": 5.5, "BB": 1.8, "BF": 24, "H": 4.6, "ER": 2.4, "HR": 0.9,
+    "K_per_IP": 1.15, "K_per_BF": 0.25, "age_float": 28.0
+}
+
+ROLLING_FEATURES = ["IP", "BB", "BF", "H", "ER", "HR", "K_per_IP", "K_per_BF", "age_float"]
+
+
+def normalize_name(name):
+    name = str(name).strip().lower()
+    if "," in name:
+        parts = name.split(",")
+        return f"{parts[1].strip()} {parts[0].strip()}"
+    return name
+
+
+def fuzzy_match(name, candidate_list):
+    match = get_close_matches(name, candidate_list, n=1, cutoff=0.85)
+    return match[0] if match else None
+
+
+def load_strikeout_props(path=PROPS_PATH):
+    props = pd.read_csv(path)
+    props.columns = [c.strip().lower() for c in props.columns]
+    props = compact(props, "sportsbook props")
+    props = props[props["market"].str.lower().str.contains("pitcher_strikeout", na=False)]
+    props = props[props["raw_name"].isin(["Over", "Under"])]
+    props = props.dropna(subset=["description", "line", "odds", "commence_time"])
+    props["description"] = props["description"].apply(normalize_name)
+    props["game_date"] = pd.to_datetime(props["commence_time"]).dt.date
+    return compact(props)
+
+
+def pitcher_lines_from_props(props):
+    # Main line per pitcher with every book's price folded into consensus and best odds
+    lines = main_lines(consensus_lines(book_pairs(props)))
+    commence = props.groupby(["game_date", "description"], as_index=False, observed=True)["commence_time"].first()
+    commence = commence.rename(columns={"description": "player"})
+    return lines.merge(commence, on=["game_date", "player"], how="left").reset_index(drop=True)
+
+
+def load_latest_stats(path=STATS_PATH):
+    stats = compact(pd.read_csv(path), "pitcher logs")
+    stats["Date"] = pd.to_datetime(stats["Date"], errors="coerce")
+    stats = stats.dropna(subset=["Date"])
+    stats["game_date"] = stats["Date"].dt.date
+    stats["Player_clean"] = stats["Player"].apply(normalize_name)
+
+    for col in ["IP", "BB", "BF", "H", "ER", "HR", "SO"]:
+        stats[col] = pd.to_numeric(stats[col], errors="coerce")
+
+    age_parts = stats["Age"].astype(str).str.extract(r"(\d+)-(\d+)")
+    age_parts = age_parts.dropna().astype(int)
+    stats["age_float"] = age_parts[0] + age_parts[1] / 365.0
+    stats["K_per_IP"] = stats["SO"] / stats["IP"]
+    stats["K_per_BF"] = stats["SO"] / stats["BF"]
+
+    for feat in ROLLING_FEATURES:
+        stats[f"r3_{feat}"] = (
+            stats
+            .groupby("Player_clean", group_keys=False, observed=True)
+            .apply(lambda g: g[feat].shift(1).rolling(3, min_periods=1).mean(), include_groups=False)
+        )
+
+    stats = compact(stats)
+    return stats.groupby("Player_clean", observed=True).last().reset_index()
+
+
+def match_players(players, candidates, cache=None):
+    """Fuzzy-match prop names to stat-log names, memoising repeat lookups."""
+    cache = {} if cache is None else cache
+    out = []
+    for name in players:
+        if name not in cache:
+            cache[name] = fuzzy_match(name, candidates)
+        out.append(cache[name])
+    return out
+
+
+def merge_lines_with_stats(pitcher_lines, latest_stats):
+    pitcher_lines = pitcher_lines.copy()
+    matches = match_players(pitcher_lines["player"], latest_stats["Player_clean"].tolist())
+    # Matches are drawn from the stats' names, so the key can share their dtype
+    pitcher_lines["Player_clean"] = pd.Series(matches, index=pitcher_lines.index).astype(
+        latest_stats["Player_clean"].dtype
+    )
+    pitcher_lines = pitcher_lines.dropna(subset=["Player_clean"])
+    # The prop's game date wins over the pitcher's last logged game date
+    return pitcher_lines.merge(
+        latest_stats.drop(columns=["game_date"]), on="Player_clean", how="left"
+    )
+
+
+def build_model_input(merged, expected_features, verbose=True):
+    merged = merged.copy()
+    for col, val in OPPONENT_DEFAULTS.items():
+        merged[col] = val
+    merged["is_home"] = 1
+
+    model_input = merged.rename(columns=ROLLING_RENAMES)
+    for stat, val in FILLER.items():
+        model_input[stat] = model_input[stat].fillna(val)
+
+    for col in expected_features:
+        if col not in model_input.columns:
+            if verbose:
+                print(f"[FIX] Adding missing column: {col}")
+            model_input[col] = 0.0
+
+    model_input = model_input.loc[:, ~model_input.columns.duplicated(keep="last")]
+    return model_input[expected_features].copy()
+
+
+def file_version(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def input_versions(stats_path=STATS_PATH, model_dir=MODEL_DIR):
+    """(mtime, size) of every file a prediction depends on besides the prop itself."""
+    versions = {stats_path: file_version(stats_path)}
+    if os.path.isdir(model_dir):
+        for name in sorted(os.listdir(model_dir)):
+            if name.endswith((".forest", ".pkl", ".json")):
+                path = os.path.join(model_dir, name)
+                versions[path] = file_version(path)
+    return versions
+
+
+def feature_version(model_id, versions):
+    payload = json.dumps({"model_id": model_id, "inputs": versions}, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+# Everything the prediction row is built from; odds and consensus are rounded so
+# float noise in the CSV round trip doesn't look like a line move
+FINGERPRINT_COLUMNS = ["game_date", "player", "line", "best_over_odds", "best_under_odds", "consensus_over",
+                       "best_over_book", "best_under_book", "n_books"]
+TEXT_FINGERPRINT_COLUMNS = {"game_date", "player", "best_over_book", "best_under_book"}
+
+
+def prop_fingerprints(lines, version):
+    parts = [lines[c].astype(str) if c in TEXT_FINGERPRINT_COLUMNS
+             else pd.to_numeric(lines[c], errors="coerce").round(4).astype(str).fillna("nan")
+             for c in FINGERPRINT_COLUMNS]
+    keys = parts[0].str.cat(parts[1:], sep="|") + "|" + version
+    return keys.map(lambda k: hashlib.sha1(k.encode()).hexdigest()[:16])
+
+
+def bet_recommendation(edge):
+    edge = np.asarray(edge)
+    return np.where(
+        edge > EDGE_THRESHOLD, "✅ Over",
+        np.where(edge < -EDGE_THRESHOLD, "✅ Under", "❌ No Bet")
+    )
@@ -0,0 +1,152 @@
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from predict_props_with_model import OUTPUT_PATH as PREDICTIONS_PATH, PMF_PATH, load_cached_pmf
+from pricing import MAX_STRIKEOUTS, probability_to_american
+
+OUTPUT_PATH = "data/simulated_alt_lines.csv"
+
+DEFAULT_SAMPLES = 200_000
+DEFAULT_CHUNK = 25_000
+DEFAULT_SEED = 42
+ALT_LINES = np.arange(2.5, 10.0, 1.0)
+
+
+class StrikeoutSimulator:
+    """Seeded (pitchers x samples) strikeout draws, generated chunk by chunk.
+
+    Every query walks the same deterministic chunks, so line prices and
+    cross-pitcher combos all come from one sample block while memory stays
+    bounded by chunk_size. Pitchers are drawn independently.
+    """
+
+    def __init__(self, pmf, players, n_samples=DEFAULT_SAMPLES, seed=DEFAULT_SEED,
+                 chunk_size=DEFAULT_CHUNK):
+        cdf = np.cumsum(np.asarray(pmf, dtype=np.float64), axis=1)
+        cdf[:, -1] = 1.0  # tail mass lands on MAX_STRIKEOUTS
+        self.cdf = cdf
+        self.players = list(players)
+        self.index = {p: i for i, p in enumerate(self.players)}
+        self.n_samples = int(n_samples)
+        self.seed = seed
+        self.chunk_size = int(chunk_size)
+
+    def _draw(self, u):
+        # Offset each pitcher's CDF by its row number so one searchsorted
+        # inverts every row at once.
+        n, width = self.cdf.shape
+        offsets = np.arange(n)[:, None]
+        flat = (self.cdf + offsets).ravel()
+        idx = np.searchsorted(flat, (u + offsets).ravel(), side="right").reshape(u.shape)
+        return np.minimum(idx - offsets * width, MAX_STRIKEOUTS).astype(np.uint8)
+
+    def chunks(self):
+        n_chunks = -(-self.n_samples // self.chunk_size)
+        streams = np.random.SeedSequence(self.seed).spawn(n_chunks)
+        for i, stream in enumerate(streams):
+            size = min(self.chunk_size, self.n_samples - i * self.chunk_size)
+            u = np.random.default_rng(stream).random((len(self.players), size))
+            yield self._draw(u)
+
+    def line_probabilities(self, lines):
+        """lines is (pitchers, n_lines); returns P(over), P(under) of the same shape."""
+        lines = np.asarray(lines, dtype=np.float64)
+        if lines.ndim == 1:
+            lines = np.broadcast_to(lines, (len(self.players), len(lines)))
+        over = np.zeros(lines.shape)
+        under = np.zeros(lines.shape)
+        for block in self.chunks():
+            sample = block[:, None, :]
+            over += (sample > lines[..., None]).sum(axis=2)
+            under += (sample < lines[..., None]).sum(axis=2)
+        return over / self.n_samples, under / self.n_samples
+
+    def combo_probabilities(self, combos):
+        """combos: list of [(player, side, line), ...]; P(every leg hits) for each."""
+        unknown = sorted({player for legs in combos for player, _, _ in legs if player not in self.index})
+        if unknown:
+            raise ValueError(f"No prediction for {', '.join(unknown)}")
+        hits = np.zeros(len(combos))
+        for block in self.chunks():
+            for c, legs in enumerate(combos):
+                ok = np.ones(block.shape[1], dtype=bool)
+                for player, side, line in legs:
+                    draws = block[self.index[player]]
+                    ok &= draws > line if side.lower() == "over" else draws < line
+                hits[c] += ok.sum()
+        return hits / self.n_samples
+
+
+def simulator_from_predictions(predictions, pmf_path=PMF_PATH, **kwargs):
+    """Simulate each pitcher's latest prediction from the per-tree mixture the model
+    saved for it; rows without a saved distribution fall back to a negative binomial.
+    """
+    latest = predictions.drop_duplicates("player", keep="last")
+    fingerprints = latest["fingerprint"].fillna("") if "fingerprint" in latest else [""] * len(latest)
+    pmf = load_cached_pmf(fingerprints, latest["predicted_SO"].to_numpy(), pmf_path)
+    return StrikeoutSimulator(pmf, latest["player"].tolist(), **kwargs)
+
+
+def alt_line_table(sim, lines=ALT_LINES):
+    p_over, p_under = sim.line_probabilities(lines)
+    table = pd.DataFrame({
+        "player": np.repeat(sim.players, len(lines)),
+        "line": np.tile(lines, len(sim.players)),
+        "prob_over": p_over.ravel(),
+        "prob_under": p_under.ravel(),
+    })
+    table["fair_over_odds"] = probability_to_american(table["prob_over"])
+    table["fair_under_odds"] = probability_to_american(table["prob_under"])
+    return table
+
+
+def parse_combo(text):
+    legs = []
+    for leg in text.split(","):
+        parts = leg.rsplit(":", 2)
+        if len(parts) != 3 or parts[1].strip().lower() not in ("over", "under"):
+            raise ValueError(f"Bad combo leg '{leg.strip()}'; expected player:over|under:line")
+        player, side, line = parts
+        try:
+            line = float(line)
+        except ValueError:
+            raise ValueError(f"Bad line in combo leg '{leg.strip()}'") from None
+        legs.append((player.strip().lower(), side.strip(), line))
+    return legs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo alt-line and combo pricing")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--combo", action="append", default=[],
+                        help='e.g. "logan webb:over:5.5,carlos rodon:under:6.5"')
+    args = parser.parse_args()
+
+    predictions = pd.read_csv(PREDICTIONS_PATH)
+    if predictions.empty:
+        print("[FAIL] No predictions to simulate.")
+        sys.exit(1)
+
+    sim = simulator_from_predictions(
+        predictions, n_samples=args.samples, seed=args.seed, chunk_size=args.chunk_size
+    )
+    print(f"[SIM] {len(sim.players)} pitchers x {sim.n_samples:,} samples (seed={sim.seed})")
+
+    table = alt_line_table(sim)
+    table.to_csv(OUTPUT_PATH, index=False)
+    print(f"[SAVED] {OUTPUT_PATH} ({len(table)} alt lines)")
+
+    if args.combo:
+        try:
+            combos = [parse_combo(c) for c in args.combo]
+            probabilities = sim.combo_probabilities(combos)
+        except ValueError as e:
+            print(f"[FAIL] --combo: {e}")
+            sys.exit(1)
+        for text, p in zip(args.combo, probabilities):
+            print(f"[COMBO] {text}: p={p:.4f} fair={probability_to_american(p):+.0f}")
@@ -0,0 +1,482 @@
+import argparse
+import datetime as dt
+import json
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from atomic_io import write_csv, write_json
+from pricing import line_probabilities, poisson_pmf, probability_to_american
+
+# Named sizes shared with the benchmark suite
+SCALES = {
+    "small": {"seasons": 1, "days": 21, "snapshots_per_day": 2, "board_snapshots": 2},
+    "medium": {"seasons": 1, "days": None, "snapshots_per_day": 4, "board_snapshots": 6},
+    "large": {"seasons": 3, "days": None, "snapshots_per_day": 12, "board_snapshots": 12},
+}
+SEASON_DAYS = 186
+SEASON_START = (3, 27)
+BOOKS = ["BetOnline.ag", "DraftKings", "FanDuel", "PointsBet (US)"]
+STARTERS_PER_TEAM = 5
+BATTERS_PER_TEAM = 9
+
+# Column layouts exactly as Stathead exports them
+PITCHER_LOG_COLUMNS = [
+    "Rk", "Player", "AppDec", "IP", "Date", "Age", "Team", "Unnamed: 7", "Opp", "Result", "AppDec.1", "IP.1",
+    "H", "R", "ER", "UER", "HR", "BB", "IBB", "SO", "HBP", "BK", "WP", "BF", "BR", "Pos", "Player-additional",
+    "App,Dec", "Unnamed: 8", "App,Dec.1", "SO.1", "Unnamed: 6",
+]
+BATTING_LOG_COLUMNS = [
+    "Rk", "Team", "Date", "HR", "Unnamed: 4", "Opp", "Result", "PA", "AB", "R", "H", "1B", "2B", "3B", "HR.1",
+    "RBI", "SB", "CS", "BB", "SO", "BA", "OBP", "SLG", "OPS", "TB", "GIDP", "HBP", "SH", "SF", "IBB", "Unnamed: 3",
+]
+TEAM_PITCHING_COLUMNS = [
+    "Rk", "Team", "Date", "SO", "Unnamed: 4", "Opp", "Result", "IP", "H", "R", "ER", "UER", "HR", "BB", "IBB",
+    "SO.1", "HBP", "BK", "WP", "BF", "BR", "Wind Speed", "Temp", "Unnamed: 6",
+]
+BOXSCORE_COLUMNS = [
+    "Game Date", "Away Team", "Home Team", "Away Record", "Home Record", "Away Score", "Home Score",
+    "Winning Pitcher", "Winning IP", "Winning H", "Winning ER", "Winning K", "Winning BB",
+    "Losing Pitcher", "Losing IP", "Losing H", "Losing ER", "Losing K", "Losing BB",
+]
+SNAPSHOT_COLUMNS = ["event_id", "home_team", "away_team", "commence_time", "type", "player", "market",
+                    "line", "odds", "bookmaker", "side"]
+
+TEAMS = [
+    ("ARI", "Arizona Diamondbacks"), ("ATL", "Atlanta Braves"), ("BAL", "Baltimore Orioles"),
+    ("BOS", "Boston Red Sox"), ("CHC", "Chicago Cubs"), ("CHW", "Chicago White Sox"),
+    ("CIN", "Cincinnati Reds"), ("CLE", "Cleveland Guardians"), ("COL", "Colorado Rockies"),
+    ("DET", "Detroit Tigers"), ("HOU", "Houston Astros"), ("KCR", "Kansas City Royals"),
+    ("LAA", "Los Angeles Angels"), ("LAD", "Los Angeles Dodgers"), ("MIA", "Miami Marlins"),
+    ("MIL", "Milwaukee Brewers"), ("MIN", "Minnesota Twins"), ("NYM", "New York Mets"),
+    ("NYY", "New York Yankees"), ("ATH", "Oakland Athletics"), ("PHI", "Philadelphia Phillies"),
+    ("PIT", "Pittsburgh Pirates"), ("SDP", "San Diego Padres"), ("SFG", "San Francisco Giants"),
+    ("SEA", "Seattle Mariners"), ("STL", "St. Louis Cardinals"), ("TBR", "Tampa Bay Rays"),
+    ("TEX", "Texas Rangers"), ("TOR", "Toronto Blue Jays"), ("WSN", "Washington Nationals"),
+]
+# Accented names on purpose: name matching has to survive them
+FIRST_NAMES = ["Aaron", "Bryce", "Carlos", "Dylan", "Eury", "Freddy", "Gerrit", "Hunter", "Iván", "José",
+               "Kevin", "Logan", "Max", "Nestor", "Óscar", "Pablo", "Ranger", "Sandy", "Tyler", "Yu"]
+LAST_NAMES = ["Alcántara", "Bello", "Castillo", "Darvish", "Eflin", "Fried", "Gallen", "Greene", "Hader",
+              "Irvin", "Javier", "Kirby", "López", "Manaea", "Nola", "Ober", "Peña", "Quintana", "Rodón",
+              "Skubal", "Toussaint", "Urías", "Valdez", "Webb", "Yamamoto"]
+
+
+def season_dates(seasons, days=None, today=None):
+    """Game days for the last `seasons` complete seasons before today."""
+    today = today or date.today()
+    last = today.year - 1 if (today.month, today.day) < SEASON_START else today.year
+    out = []
+    for year in range(last - seasons + 1, last + 1):
+        start = date(year, *SEASON_START)
+        span = min(days or SEASON_DAYS, SEASON_DAYS)
+        out.extend(d for d in (start + timedelta(i) for i in range(span)) if d < today)
+    return out
+
+
+def make_league(rng):
+    names = [f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES]
+    order = rng.permutation(len(names))
+    n_pitchers, n_batters = len(TEAMS) * STARTERS_PER_TEAM, len(TEAMS) * BATTERS_PER_TEAM
+    pitchers = pd.DataFrame({
+        "name": [names[i] for i in order[:n_pitchers]],
+        "team": np.repeat([t for t, _ in TEAMS], STARTERS_PER_TEAM),
+        "slot": np.tile(np.arange(STARTERS_PER_TEAM), len(TEAMS)),
+        "k_rate": rng.uniform(0.16, 0.33, n_pitchers),
+        "birth_age": rng.integers(22, 37, n_pitchers),
+    })
+    pitchers["player_id"] = [f"syn{i:05d}" for i in range(n_pitchers)]
+    batters = pd.DataFrame({
+        "name": [names[i] for i in order[n_pitchers:n_pitchers + n_batters]],
+        "team": np.repeat([t for t, _ in TEAMS], BATTERS_PER_TEAM),
+    })
+    return pitchers, batters
+
+
+def make_schedule(days, rng, start_index=0):
+    """Every team plays once a day; starters go in rotation order."""
+    abbrevs = np.array([t for t, _ in TEAMS])
+    rows = []
+    for offset, day in enumerate(days):
+        teams = rng.permutation(abbrevs)
+        first_pitch = rng.choice([17, 18, 20, 22, 23, 23, 23, 24, 25, 26], len(teams) // 2)
+        for g, (away, home) in enumerate(teams.reshape(-1, 2)):
+            commence = datetime(day.year, day.month, day.day) + timedelta(hours=int(first_pitch[g]), minutes=5)
+            rows.append({
+                "game_id": f"{day:%Y%m%d}{g:02d}", "date": day, "away": away, "home": home,
+                "commence_time": commence.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "slot": (start_index + offset) % STARTERS_PER_TEAM,
+            })
+    return pd.DataFrame(rows)
+
+
+def _ip_notation(outs):
+    return outs // 3 + (outs % 3) / 10.0
+
+
+def pitcher_game_logs(games, pitchers, rng):
+    """One starter line per team per game, in Stathead's pitcher game log layout."""
+    starters = pitchers.set_index(["team", "slot"])
+    sides = pd.concat([
+        games.assign(Team=games["home"], Opp=games["away"], at=""),
+        games.assign(Team=games["away"], Opp=games["home"], at="@"),
+    ], ignore_index=True)
+    sp = starters.loc[list(zip(sides["Team"], sides["slot"]))].reset_index(drop=True)
+    n = len(sides)
+
+    bf = np.clip(rng.normal(23, 3.5, n).round(), 9, 32).astype(int)
+    so = rng.binomial(bf, sp["k_rate"].to_numpy())
+    bb = rng.binomial(bf, 0.08)
+    h = rng.binomial(bf - bb, 0.22)
+    outs = np.clip(bf - h - bb + rng.integers(-1, 2, n), 3, 27)
+    er = rng.poisson(0.45 * (h + bb) / 2)
+    hr = rng.binomial(h, 0.12)
+    win = rng.random(n) < 0.5
+    age_days = rng.integers(0, 365, n)
+
+    logs = pd.DataFrame({
+        "Player": sp["name"], "AppDec": np.where(win, "GS-6 W", "GS-6 L"), "IP": _ip_notation(outs),
+        "Date": pd.to_datetime(sides["date"]).dt.strftime("%Y-%m-%d"),
+        "Age": [f"{a}-{d:03d}" for a, d in zip(sp["birth_age"], age_days)],
+        "Team": sides["Team"], "Unnamed: 7": sides["at"], "Opp": sides["Opp"],
+        "Result": np.where(win, "W 4-2", "L 2-4"), "H": h, "R": er, "ER": er, "UER": 0, "HR": hr, "BB": bb,
+        "IBB": 0, "SO": so, "HBP": rng.binomial(bf, 0.01), "BK": 0, "WP": rng.binomial(1, 0.1, n), "BF": bf,
+        "BR": h + bb, "Pos": "P", "Player-additional": sp["player_id"],
+    })
+    logs["AppDec.1"], logs["IP.1"], logs["SO.1"] = logs["AppDec"], logs["IP"], logs["SO"]
+    logs = logs.sort_values(["Date", "Player"], kind="stable").reset_index(drop=True)
+    logs["Rk"] = np.arange(1, len(logs) + 1)
+    return logs.reindex(columns=PITCHER_LOG_COLUMNS).astype({c: float for c in ["IP", "H", "ER", "HR", "BB", "SO", "BF"]})
+
+
+def team_game_logs(pitcher_logs, rng):
+    """Opponent batting and team pitching game logs consistent with the starters' lines."""
+    n = len(pitcher_logs)
+    starter = {c: pitcher_logs[c].to_numpy(dtype=int) for c in ["BF", "SO", "BB", "H"]}
+    bullpen_bf = rng.integers(8, 16, n)
+    bf = starter["BF"] + bullpen_bf
+    so = starter["SO"] + rng.binomial(bullpen_bf, 0.24)
+    bb = starter["BB"] + rng.binomial(bullpen_bf, 0.08)
+    h = starter["H"] + rng.binomial(bullpen_bf, 0.22)
+    ab = bf - bb
+    tb = h + rng.binomial(h, 0.45)
+
+    common = {"Date": pitcher_logs["Date"], "Result": pitcher_logs["Result"]}
+    team_pitching = pd.DataFrame({
+        **common, "Team": pitcher_logs["Team"], "Opp": pitcher_logs["Opp"],
+        "Unnamed: 4": pitcher_logs["Unnamed: 7"], "SO": so, "IP": 9.0, "H": h, "R": pitcher_logs["ER"],
+        "ER": pitcher_logs["ER"], "UER": 0, "HR": pitcher_logs["HR"], "BB": bb, "IBB": 0, "SO.1": so,
+        "HBP": 0, "BK": 0, "WP": 0, "BF": bf, "BR": h + bb,
+    })
+    # The opponent's batting line mirrors this team's pitching line
+    batting = pd.DataFrame({
+        **common, "Team": pitcher_logs["Opp"], "Opp": pitcher_logs["Team"],
+        "Unnamed: 4": np.where(pitcher_logs["Unnamed: 7"] == "@", "", "@"),
+        "HR": pitcher_logs["HR"], "PA": bf, "AB": ab, "R": pitcher_logs["ER"], "H": h, "1B": h - pitcher_logs["HR"],
+        "2B": 0, "3B": 0, "HR.1": pitcher_logs["HR"], "RBI": pitcher_logs["ER"], "SB": 0, "CS": 0, "BB": bb,
+        "SO": so, "BA": (h / ab).round(3), "OBP": ((h + bb) / bf).round(3), "SLG": (tb / ab).round(3),
+        "TB": tb, "GIDP": 0, "HBP": 0, "SH": 0, "SF": 0, "IBB": 0,
+    })
+    batting["OPS"] = batting["OBP"] + batting["SLG"]
+    for df in (team_pitching, batting):
+        df["Rk"] = np.arange(1, len(df) + 1)
+    return batting.reindex(columns=BATTING_LOG_COLUMNS), team_pitching.reindex(columns=TEAM_PITCHING_COLUMNS)
+
+
+def box_scores(games, pitcher_logs):
+    full = dict(TEAMS)
+    logs = pitcher_logs.set_index(["Date", "Team"])
+    rows = []
+    for g in games.itertuples(index=False):
+        day = f"{g.date:%Y-%m-%d}"
+        home, away = logs.loc[(day, g.home)], logs.loc[(day, g.away)]
+        home_won = str(home["Result"]).startswith("W")
+        winner, loser = (home, away) if home_won else (away, home)
+        short = lambda p: f"{p['Player'].split()[0][0]}. {p['Player'].split()[-1]}"
+        rows.append([
+            day, full[g.away], full[g.home], "0-0", "0-0", 2 if home_won else 4, 4 if home_won else 2,
+            short(winner), winner["IP"], winner["H"], winner["ER"], winner["SO"], winner["BB"],
+            short(loser), loser["IP"], loser["H"], loser["ER"], loser["SO"], loser["BB"],
+        ])
+    return pd.DataFrame(rows, columns=BOXSCORE_COLUMNS)
+
+
+# === Odds ===
+def _american(p, rng, vig=0.045):
+    return np.round(probability_to_american(np.clip(p * (1 + vig) + rng.normal(0, 0.015, np.shape(p)), 0.05, 0.95)))
+
+
+def strikeout_quotes(games, pitchers, rng, books=BOOKS, drift=0.0):
+    """Over/Under strikeout quotes per (game, starter, book)."""
+    starters = pitchers.set_index(["team", "slot"])
+    rows = []
+    for side in ("home", "away"):
+        sp = starters.loc[list(zip(games[side], games["slot"]))].reset_index(drop=True)
+        expected = sp["k_rate"].to_numpy() * 23
+        rows.append(pd.DataFrame({"game_id": games["game_id"].to_numpy(), "player": sp["name"],
+                                  "expected": expected}))
+    quotes = pd.concat(rows, ignore_index=True)
+    quotes = quotes.loc[quotes.index.repeat(len(books))].reset_index(drop=True)
+    quotes["bookmaker"] = np.tile(books, len(quotes) // len(books))
+    quotes["line"] = np.floor(quotes["expected"] + rng.normal(drift, 0.35, len(quotes))) + 0.5
+    p_over, p_under, _ = line_probabilities(poisson_pmf(quotes["expected"].to_numpy()), quotes["line"].to_numpy())
+    quotes["over"] = _american(p_over, rng)
+    quotes["under"] = _american(p_under, rng)
+    return quotes
+
+
+def team_and_batter_quotes(games, batters, rng, books=BOOKS):
+    full = dict(TEAMS)
+    team_rows, batter_rows = [], []
+    roster = batters.groupby("team")["name"].apply(list).to_dict()
+    for g in games.itertuples(index=False):
+        for book in books:
+            p_home = float(np.clip(rng.normal(0.54, 0.06), 0.3, 0.75))
+            team_rows.append((g.game_id, book, "h2h", full[g.home], None, *_american(np.array([p_home]), rng)))
+            team_rows.append((g.game_id, book, "h2h", full[g.away], None, *_american(np.array([1 - p_home]), rng)))
+            team_rows.append((g.game_id, book, "spreads", full[g.home], -1.5, *_american(np.array([0.42]), rng)))
+            team_rows.append((g.game_id, book, "spreads", full[g.away], 1.5, *_american(np.array([0.58]), rng)))
+            total = float(rng.choice([7.5, 8.0, 8.5, 9.0, 9.5]))
+            team_rows.append((g.game_id, book, "totals", "Over", total, *_american(np.array([0.5]), rng)))
+            team_rows.append((g.game_id, book, "totals", "Under", total, *_american(np.array([0.5]), rng)))
+            for team in (g.home, g.away):
+                for name in roster[team]:
+                    for market, line, p in (("batter_hits", 0.5, 0.62), ("batter_home_runs", 0.5, 0.12)):
+                        over, under = _american(np.array([p, 1 - p]), rng)
+                        batter_rows.append((g.game_id, book, market, name, "Over", line, over))
+                        batter_rows.append((g.game_id, book, market, name, "Under", line, under))
+    team = pd.DataFrame(team_rows, columns=["game_id", "bookmaker", "market", "name", "line", "odds"])
+    batter = pd.DataFrame(batter_rows, columns=["game_id", "bookmaker", "market", "player", "side", "line", "odds"])
+    return team, batter
+
+
+def odds_api_payloads(games, k_quotes, team_quotes, batter_quotes, last_update):
+    """Events list and per-event odds exactly as the Odds API v4 returns them."""
+    full = dict(TEAMS)
+    events, payloads = [], {}
+    for g in games.itertuples(index=False):
+        event = {"id": g.game_id, "sport_key": "baseball_mlb", "sport_title": "MLB",
+                 "commence_time": g.commence_time, "home_team": full[g.home], "away_team": full[g.away]}
+        events.append(event)
+        bookmakers = {}
+        def market(book, key):
+            entry = bookmakers.setdefault(book, {"key": book.lower().replace(" ", ""), "title": book,
+                                                 "last_update": last_update, "markets": {}})
+            return entry["markets"].setdefault(key, {"key": key, "last_update": last_update, "outcomes": []})
+        for q in k_quotes[k_quotes["game_id"] == g.game_id].itertuples(index=False):
+            outcomes = market(q.bookmaker, "pitcher_strikeouts")["outcomes"]
+            outcomes.append({"name": "Over", "description": q.player, "price": int(q.over), "point": q.line})
+            outcomes.append({"name": "Under", "description": q.player, "price": int(q.under), "point": q.line})
+        for q in team_quotes[team_quotes["game_id"] == g.game_id].itertuples(index=False):
+            outcome = {"name": q.name, "price": int(q.odds)}
+            if not pd.isna(q.line):
+                outcome["point"] = q.line
+            market(q.bookmaker, q.market)["outcomes"].append(outcome)
+        for q in batter_quotes[batter_quotes["game_id"] == g.game_id].itertuples(index=False):
+            market(q.bookmaker, q.market)["outcomes"].append(
+                {"name": q.side, "description": q.player, "price": int(q.odds), "point": q.line})
+        payloads[g.game_id] = {**event, "bookmakers": [
+            {**b, "markets": list(b["markets"].values())} for b in bookmakers.values()]}
+    return events, payloads
+
+
+def snapshot_frame(games, k_quotes, batter_quotes):
+    """One archived clean_all_props_flat snapshot (pitcher and batter rows)."""
+    full = dict(TEAMS)
+    meta = games.assign(home_team=games["home"].map(full), away_team=games["away"].map(full))
+    meta = meta[["game_id", "home_team", "away_team", "commence_time"]]
+    k = k_quotes.melt(id_vars=["game_id", "player", "bookmaker", "line"], value_vars=["over", "under"],
+                      var_name="side", value_name="odds")
+    k = k.assign(type="pitcher", market="pitcher_strikeouts", side=k["side"].str.title())
+    b = batter_quotes.assign(type="batter")
+    flat = pd.concat([k, b], ignore_index=True).merge(meta, on="game_id")
+    return flat.rename(columns={"game_id": "event_id"})[SNAPSHOT_COLUMNS]
+
+
+def filtered_bets(games, pitchers, k_quotes, rng):
+    """A day's saved dashboard picks: noisy model output against the first book's line."""
+    first_book = k_quotes.drop_duplicates(["game_id", "player"])
+    predicted = first_book["expected"].to_numpy() + rng.normal(0, 1.2, len(first_book))
+    edge = predicted - first_book["line"].to_numpy()
+    bets = pd.DataFrame({
+        "game_date": games.set_index("game_id").loc[first_book["game_id"], "date"].astype(str).to_numpy(),
+        "player": first_book["player"].str.lower().to_numpy(),
+        "line": first_book["line"].to_numpy(),
+        "odds": np.where(edge > 0, first_book["over"], first_book["under"]).astype(int),
+        "predicted_so": predicted, "edge": edge,
+    })
+    bets = bets[bets["edge"].abs() >= 0.75]
+    bets["bet_recommendation"] = np.where(bets["edge"] > 0, "✅ Over", "✅ Under")
+    fire = np.select([bets["edge"].abs() >= e for e in [2.5, 2.0, 1.5, 1.0]],
+                     ["🔥🔥🔥🔥🔥", "🔥🔥🔥🔥", "🔥🔥🔥", "🔥🔥"], default="🔥")
+    return bets.assign(confidence=fire)
+
+
+def generate(root, seasons=1, days=None, snapshots_per_day=4, board_snapshots=6, books=BOOKS, seed=0,
+             today=None):
+    """Write a full synthetic tree under `root` with the repo's relative layout.
+
+    History (Stathead logs, box scores, archived odds snapshots, saved picks)
+    covers `seasons` seasons before today; today's board is written as Odds
+    API JSON (one directory per intraday snapshot) plus the Step 1 CSVs.
+    Stages run unchanged with `root` as the working directory.
+    """
+    rng = np.random.default_rng(seed)
+    today = today or date.today()
+    pitchers, batters = make_league(rng)
+    history_days = season_dates(seasons, days, today)
+    games = make_schedule(history_days, rng)
+    counts = {"days": len(history_days), "games": len(games)}
+
+    def path(*parts):
+        return os.path.join(root, *parts)
+
+    # === Stathead-shaped history
+    logs = pitcher_game_logs(games, pitchers, rng)
+    batting, team_pitching = team_game_logs(logs, rng)
+    write_csv(logs, path("new_data", "stathead_player_pitching_game_data.csv"))
+    write_csv(batting, path("new_data", "stathead_batting_game_data.csv"))
+    write_csv(team_pitching, path("new_data", "stathead_team_pitching_game_data.csv"))
+    write_csv(box_scores(games, logs), path("data", "boxscores_pitcher_full-MASTER.csv"))
+    counts["pitcher_logs"] = len(logs)
+
+    # === Archived intraday snapshots and saved picks per history day
+    snapshot_rows = bet_rows = 0
+    for day, day_games in games.groupby("date", sort=True):
+        day_games = day_games.reset_index(drop=True)
+        _, batter_q = team_and_batter_quotes(day_games, batters, rng, books) if snapshots_per_day else (None, None)
+        for s in range(snapshots_per_day):
+            k_q = strikeout_quotes(day_games, pitchers, rng, books, drift=0.1 * s)
+            stamp = datetime(day.year, day.month, day.day, 13) + timedelta(minutes=40 * s)
+            snap = snapshot_frame(day_games, k_q, batter_q)
+            write_csv(snap, path("archive", f"{day:%Y-%m-%d}", f"clean_all_props_flat_{stamp:%Y%m%d_%H%M%S}.csv"))
+            snapshot_rows += len(snap)
+        bets = filtered_bets(day_games, pitchers, strikeout_quotes(day_games, pitchers, rng, books), rng)
+        write_csv(bets, path("filtered_bets", f"filtered_bets_{day:%Y-%m-%d}_1300.csv"))
+        bet_rows += len(bets)
+    counts.update(snapshot_rows=snapshot_rows, bet_rows=bet_rows)
+
+    # === Today's board: Odds API payloads per snapshot, latest one also as Step 1 output
+    board = make_schedule([today], rng, start_index=len(history_days))
+    board["commence_time"] = [f"{today:%Y-%m-%d}T23:{m:02d}:00Z" for m in range(len(board))]
+    team_q, batter_q = team_and_batter_quotes(board, batters, rng, books)
+    for s in range(max(board_snapshots, 1)):
+        stamp = datetime(today.year, today.month, today.day, 13) + timedelta(minutes=30 * s)
+        k_q = strikeout_quotes(board, pitchers, rng, books, drift=0.05 * s)
+        events, payloads = odds_api_payloads(board, k_q, team_q, batter_q, stamp.strftime("%Y-%m-%dT%H:%M:%SZ"))
+        for event_id, payload in payloads.items():
+            write_json(payload, path("odds_api", "snapshots", f"{stamp:%H%M%S}", f"{event_id}.json"))
+    write_json(events, path("odds_api", "events.json"))
+    for event_id, payload in payloads.items():
+        write_json(payload, path("odds_api", "events", f"{event_id}.json"))
+    write_board_csvs(root, events, payloads)
+    counts["board_events"] = len(events)
+
+    write_json({"generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "today": f"{today:%Y-%m-%d}",
+                "seed": seed, "seasons": seasons, "books": list(books), **counts}, path("synthetic_manifest.json"), indent=2)
+    return counts
+
+
+def write_board_csvs(root, events, payloads):
+    # Same flattening Step 1 applies to live responses
+    from odds_client import outcome_rows, PITCHER_MARKETS, BATTER_MARKETS, TEAM_MARKETS
+    rows = [r for e in events for r in outcome_rows(e, payloads[e["id"]])]
+    df = pd.DataFrame(rows)
+    for markets, name in ((PITCHER_MARKETS, "pitcher_props"), (BATTER_MARKETS, "batter_props"),
+                          (TEAM_MARKETS, "team_lines")):
+        write_csv(df[df["market"].isin(markets)], os.path.join(root, "data", f"betonline_{name}.csv"))
+
+
+class ReplaySession:
+    """Serves a generated odds_api/ directory in place of requests.Session for offline runs."""
+
+    class Response:
+        def __init__(self, payload):
+            self.status_code = 200 if payload is not None else 404
+            self.headers = {"x-requests-remaining": "replay"}
+            self._payload = payload
+            self.text = json.dumps(payload) if payload is not None else "not found"
+
+        def json(self):
+            return self._payload
+
+    def __init__(self, root):
+        self.root = root
+
+    def get(self, url, params=None, timeout=None):
+        tail = url.rstrip("/").split("/")
+        if tail[-1] == "events":
+            path = os.path.join(self.root, "odds_api", "events.json")
+        else:
+            path = os.path.join(self.root, "odds_api", "events", f"{tail[-2]}.json")
+        if not os.path.exists(path):
+            return self.Response(None)
+        with open(path) as f:
+            return self.Response(json.load(f))
+
+
+# Day that frozen_today() pins the clock to; None when it isn't open
+_frozen_day = None
+
+
+class _FrozenDate(date):
+    @classmethod
+    def today(cls):
+        return date.today() if _frozen_day is None else date(_frozen_day.year, _frozen_day.month, _frozen_day.day)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        now = datetime.now(tz)
+        if _frozen_day is None:
+            return now
+        return now.replace(year=_frozen_day.year, month=_frozen_day.month, day=_frozen_day.day)
+
+    @classmethod
+    def today(cls):
+        return cls.now()
+
+
+@contextmanager
+def frozen_today(day):
+    """Make date.today() and datetime.now()/today() report `day` while open.
+
+    Stages are scripts run fresh, so their `from datetime import ...` picks up
+    the frozen classes; what those return are plain date and datetime objects.
+    Use it to run stages against a fixture generated with the same `today`.
+    """
+    global _frozen_day
+    real = dt.date, dt.datetime
+    _frozen_day = day
+    dt.date, dt.datetime = _FrozenDate, _FrozenDatetime
+    try:
+        yield
+    finally:
+        dt.date, dt.datetime = real
+        _frozen_day = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic season-scale inputs for load testing")
+    parser.add_argument("root", help="output directory (run stages with this as the working directory)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seasons", type=int, help="override the scale's number of seasons")
+    parser.add_argument("--snapshots-per-day", type=int, help="override archived snapshots per history day")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--today", type=date.fromisoformat, help="day the fixture treats as today (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    config = dict(SCALES[args.scale])
+    if args.seasons is not None:
+        config["seasons"] = args.seasons
+    if args.snapshots_per_day is not None:
+        config["snapshots_per_day"] = args.snapshots_per_day
+    start = datetime.now()
+    counts = generate(args.root, seed=args.seed, today=args.today, **config)
+    print(f"✅ {args.scale}: {counts['days']} days, {counts['games']} games, {counts['pitcher_logs']} pitcher logs, "
+          f"{counts['snapshot_rows']} snapshot rows, {counts['bet_rows']} saved picks "
+          f"in {(datetime.now() - start).total_seconds():.1f}s -> {args.root}")
@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import notify_outbox
+from notify_outbox import LocalSMTPServer, OutboxWorker, enqueue, pending, smtp_factory
+
+
+class OutboxWorkerStopTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, "outbox.db")
+        self.server = LocalSMTPServer().start()
+        self.addCleanup(self.server.stop)
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+    def test_stop_retries_a_transient_failure_before_returning(self):
+        self.server.fail_next = 1
+        enqueue("first", "body", ["to@example.com"], db_path=self.db_path)
+        enqueue("second", "body", ["to@example.com"], db_path=self.db_path)
+
+        # Short backoff so the retry lands well inside stop()'s deadline
+        with mock.patch.object(notify_outbox, "BASE_BACKOFF_SECONDS", 0.3), \
+                mock.patch.dict(os.environ, {"SMTP_HOST": self.server.address}):
+            worker = OutboxWorker(smtp_factory("from@example.com"), "from@example.com",
+                                  db_path=self.db_path, poll_seconds=0.1).start()
+            left = worker.stop(timeout=10)
+
+        self.assertEqual(left, 0)
+        self.assertEqual(pending(self.db_path), [])
+        subjects = sorted(m["data"].split("Subject: ")[1].splitlines()[0] for m in self.server.messages)
+        self.assertEqual(subjects, ["first", "second"])
+
+    def test_stop_does_not_wait_past_a_retry_beyond_the_deadline(self):
+        self.server.fail_next = 1
+        enqueue("only", "body", ["to@example.com"], db_path=self.db_path)
+
+        with mock.patch.dict(os.environ, {"SMTP_HOST": self.server.address}):
+            worker = OutboxWorker(smtp_factory("from@example.com"), "from@example.com",
+                                  db_path=self.db_path, poll_seconds=0.1).start()
+            left = worker.stop(timeout=1)
+
+        # The default backoff puts the retry after the deadline; it stays queued for the next run
+        self.assertEqual(left, 1)
+        self.assertEqual(self.server.messages, [])
+
+
+if __name__ == "__main__":
+    unittest.main()